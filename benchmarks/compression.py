@@ -0,0 +1,153 @@
+"""
+Size and latency of bulk and search calls with compressed bodies.
+
+Sends bulk enrichments of 100 people or companies and a search with a
+large Elasticsearch query through PDLPY, with and without compression of
+the request bodies, against a local mock of the API answering as is,
+gzipped or with zstd, over a simulated link of limited bandwidth.
+Reports the bytes sent and received per call, as on the wire, the p50
+latency and the CPU time the client spends per call.
+
+Run with:
+    python benchmarks/compression.py [--calls N] [--bandwidth-mbps MBPS]
+        [--payload BYTES] [--json]
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import mock_server
+
+from peopledatalabs import PDLPY
+
+
+PERSON_BULK = [
+    {
+        "params": {
+            "email": f"person{i}@example.com",
+            "name": f"Person Number{i}",
+            "company": f"company{i % 37}.com",
+            "location": "San Francisco, California",
+            "profile": [f"linkedin.com/in/person-{i}"],
+        },
+        "metadata": {"row": i},
+    }
+    for i in range(100)
+]
+
+COMPANY_BULK = [
+    {
+        "params": {
+            "name": f"company {i}",
+            "website": f"company{i}.com",
+            "profile": f"linkedin.com/company/company-{i}",
+            "locality": "san francisco",
+        },
+        "metadata": {"row": i},
+    }
+    for i in range(100)
+]
+
+QUERY = {
+    "bool": {
+        "must": [{"term": {"location_country": "united states"}}],
+        "should": [
+            {"term": {"job_company_website": f"company{i}.com"}}
+            for i in range(200)
+        ],
+    }
+}
+
+SCENARIOS = {
+    "person_bulk": lambda client: client.person.bulk(requests=PERSON_BULK),
+    "company_bulk": lambda client: client.company.bulk(requests=COMPANY_BULK),
+    "search": lambda client: client.person.search(query=QUERY, size=10),
+}
+
+ENCODINGS = {
+    "identity": {"gzip": False, "zstd": False},
+    "gzip": {"gzip": True, "zstd": False},
+    "zstd": {"gzip": False, "zstd": True},
+}
+
+
+def run(base_path: str, name: str, compress: bool, calls: int) -> dict:
+    """
+    Sends calls of a scenario sequentially and measures them.
+    """
+    scenario = SCENARIOS[name]
+    events = []
+    with PDLPY(
+        api_key="key",
+        base_path=base_path,
+        transport="urllib3",
+        trusted=True,
+        rate_limit=False,
+        coalesce=False,
+        compress=compress,
+    ) as client:
+        scenario(client)
+        client.on("request_end", events.append)
+        latencies = []
+        cpu = time.process_time()
+        for _ in range(calls):
+            start = time.perf_counter()
+            scenario(client)
+            latencies.append(time.perf_counter() - start)
+        cpu = time.process_time() - cpu
+    latencies.sort()
+    return {
+        "scenario": name,
+        "compress": compress,
+        "request_bytes": sum(e.request_bytes for e in events) // calls,
+        "response_bytes": sum(e.response_bytes for e in events) // calls,
+        "p50_ms": latencies[len(latencies) // 2] * 1e3,
+        "cpu_ms_per_call": cpu / calls * 1e3,
+    }
+
+
+def main():
+    """
+    Runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--encodings", default=",".join(ENCODINGS))
+    parser.add_argument("--json", action="store_true")
+    mock_server.arguments(parser)
+    parser.set_defaults(bandwidth_mbps=50.0, latency_ms=10.0, payload=1024)
+    args = parser.parse_args()
+    logging.getLogger("PeopleDataLabs").setLevel(logging.ERROR)
+    if not args.json:
+        print(
+            f"{'response':<9} {'scenario':<13} {'compress':<8}"
+            f" {'sent B':>7} {'received B':>10} {'p50 ms':>7} {'CPU ms':>7}"
+        )
+    for encoding in args.encodings.split(","):
+        vars(args).update(ENCODINGS[encoding])
+        process, base_path = mock_server.spawn(args)
+        try:
+            for name in args.scenarios.split(","):
+                for compress in (False, True):
+                    row = run(base_path, name, compress, args.calls)
+                    row["response_encoding"] = encoding
+                    if args.json:
+                        print(json.dumps(row))
+                        continue
+                    print(
+                        f"{encoding:<9} {name:<13} {str(compress):<8}"
+                        f" {row['request_bytes']:>7}"
+                        f" {row['response_bytes']:>10}"
+                        f" {row['p50_ms']:>7.1f}"
+                        f" {row['cpu_ms_per_call']:>7.2f}"
+                    )
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+"""
+Local stand-in for the PeopleDataLabs API, for benchmarks.
+
+Mimics the enrichment, bulk, search (with scroll tokens), cleaner,
+autocomplete, job_title and ip endpoints with synthetic records of a
+configurable size, after a configurable latency. A fraction of the calls
+can be answered 429, with Retry-After, or 5xx. Responses carry the rate
+limit and credit headers of the API. Gzipped request bodies are
+accepted, responses can be gzipped or compressed with zstd, and a
+limited bandwidth can be simulated, so that the size of bodies shows in
+latency.
+
+Run on its own with: python benchmarks/mock_server.py [--port 8000] ...
+or start it from another benchmark with MockServer(...).start(), or in a
+separate process, away from the client's GIL, with spawn().
+"""
+
+import argparse
+import functools
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+
+# pylint: disable-next=too-few-public-methods,too-many-instance-attributes
+class MockConfig:
+    """
+    Behavior of the mock API.
+
+    Args:
+        latency (float): The delay before answering, in seconds.
+        jitter (float): A random extra delay of up to jitter seconds.
+        payload (int): The approximate size of a person record, in bytes.
+        rate_limited (float): The fraction of calls answered 429.
+        errors (float): The fraction of calls answered 502, 503 or 504.
+        total (int): The number of records matched by searches.
+        gzip (bool): Whether bodies are gzipped for clients accepting it.
+        zstd (bool): Whether bodies are compressed with zstd for clients
+            accepting it, rather than gzipped. Needs backports.zstd or
+            zstandard.
+        bandwidth (float): The bytes per second of the simulated link,
+            unlimited if 0. Calls take the time their request and response
+            bodies would take to cross it.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        payload: int = 2048,
+        *,
+        rate_limited: float = 0.0,
+        errors: float = 0.0,
+        total: int = 1000,
+        gzip: bool = False,  # pylint: disable=redefined-outer-name
+        zstd: bool = False,
+        bandwidth: float = 0.0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.payload = payload
+        self.rate_limited = rate_limited
+        self.errors = errors
+        self.total = total
+        self.gzip = gzip
+        self.zstd = zstd
+        self.bandwidth = bandwidth
+
+
+def zstd_compressor():
+    """
+    Returns a function compressing bytes with zstd, or None if no zstd module
+    is installed.
+    """
+    # pylint: disable=import-outside-toplevel
+    try:
+        from backports import zstd
+
+        return zstd.compress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _experience(payload: int) -> list:
+    """
+    Returns an experience section making a person record about payload bytes
+    long, computed once per size.
+    """
+    experience = []
+    size = 200
+    while size < payload:
+        item = {
+            "company": {
+                "name": f"company {len(experience)}",
+                "size": "51-200",
+            },
+            "title": {"name": "engineer", "levels": ["senior"]},
+            "start_date": "2015-01",
+            "end_date": None,
+        }
+        experience.append(item)
+        size += len(json.dumps(item)) + 2
+    return experience
+
+
+def person(row: int, payload: int) -> dict:
+    """
+    Returns a synthetic person record of about payload bytes.
+    """
+    return {
+        "id": f"person-{row:010d}",
+        "full_name": f"person {row}",
+        "job_company_id": f"company-{row % 1000}",
+        "job_title": "software engineer",
+        "experience": _experience(payload),
+    }
+
+
+def company(row: int, payload: int) -> dict:
+    """
+    Returns a synthetic company record of about payload bytes.
+    """
+    return {
+        "status": 200,
+        "likelihood": 8,
+        "id": f"company-{row:010d}",
+        "name": f"company {row}",
+        "website": f"company{row}.com",
+        "tags": ["x" * 16] * max(payload // 20, 1),
+    }
+
+
+def _person_result(row: int, config: MockConfig) -> dict:
+    return {
+        "status": 200,
+        "likelihood": 9,
+        "data": person(row, config.payload),
+    }
+
+
+def enrich_person(config, query, body):  # pylint: disable=unused-argument
+    """
+    Answers person/enrich, person/identify and person/retrieve.
+    """
+    return _person_result(random.randrange(1 << 30), config)
+
+
+def enrich_company(config, query, body):  # pylint: disable=unused-argument
+    """
+    company/enrich.
+    """
+    return company(random.randrange(1 << 30), config.payload)
+
+
+def bulk_person(config, query, body):  # pylint: disable=unused-argument
+    """
+    Answers person/bulk: one result per request, with its metadata.
+    """
+    return [
+        {**_person_result(row, config), "metadata": request.get("metadata")}
+        for row, request in enumerate(body.get("requests", []))
+    ]
+
+
+def bulk_company(config, query, body):  # pylint: disable=unused-argument
+    """
+    Answers company/enrich/bulk: one result per request, with its metadata.
+    """
+    return [
+        {**company(row, config.payload), "metadata": request.get("metadata")}
+        for row, request in enumerate(body.get("requests", []))
+    ]
+
+
+def search(config, query, body):
+    """
+    Answers person/search and company/search, paginated with scroll tokens or
+    from offsets.
+    """
+    params = {**query, **(body or {})}
+    size = int(params.get("size") or 1)
+    if "from_" in params:
+        return {"status": 400, "error": "unknown parameter from_"}
+    start = int(params.get("scroll_token") or params.get("from") or 0)
+    end = min(start + size, config.total)
+    result = {
+        "status": 200,
+        "data": [person(row, config.payload) for row in range(start, end)],
+        "total": config.total,
+    }
+    if end < config.total:
+        result["scroll_token"] = str(end)
+    return result
+
+
+def clean(config, query, body):  # pylint: disable=unused-argument
+    """
+    Answers company/clean, location/clean and school/clean.
+    """
+    return {"status": 200, "name": query.get("name", "clean")}
+
+
+def autocomplete(config, query, body):  # pylint: disable=unused-argument
+    """
+    autocomplete.
+    """
+    return {
+        "status": 200,
+        "data": [{"name": f"{query.get('text', '')} {i}"} for i in range(10)],
+    }
+
+
+def enrich_ip(config, query, body):  # pylint: disable=unused-argument
+    """
+    Answers ip/enrich and job_title/enrich.
+    """
+    return {"status": 200, "data": {"ip": {"address": query.get("ip")}}}
+
+
+ROUTES = {
+    "/v5/person/enrich": enrich_person,
+    "/v5/person/identify": enrich_person,
+    "/v5/person/bulk": bulk_person,
+    "/v5/person/search": search,
+    "/v5/company/enrich": enrich_company,
+    "/v5/company/enrich/bulk": bulk_company,
+    "/v5/company/search": search,
+    "/v5/company/clean": clean,
+    "/v5/location/clean": clean,
+    "/v5/school/clean": clean,
+    "/v5/autocomplete": autocomplete,
+    "/v5/ip/enrich": enrich_ip,
+    "/v5/job_title/enrich": enrich_ip,
+}
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "x-ratelimit-limit": "{'minute': 1000000}",
+    "x-ratelimit-remaining": "{'minute': 999999}",
+    "x-call-credits-spent": "1",
+    "x-call-credits-type": "enrich",
+    "x-totallimit-remaining": "1000000",
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Answers calls according to the config of the server.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    # Headers and body are written separately: without TCP_NODELAY, the
+    # body waits for the client's delayed ACK of the headers.
+    disable_nagle_algorithm = True
+
+    def _answer(self):
+        config = self.server.config
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        delay = config.latency + random.uniform(0, config.jitter)
+        if delay:
+            time.sleep(delay)
+        headers = dict(HEADERS)
+        draw = random.random()
+        if draw < config.rate_limited:
+            status, body = 429, {"status": 429, "error": "rate limited"}
+            headers["Retry-After"] = "0"
+        elif draw < config.rate_limited + config.errors:
+            status = random.choice((502, 503, 504))
+            body = {"status": status, "error": "unavailable"}
+        else:
+            path = url.path.rstrip("/")
+            if path.startswith("/v5/person/retrieve/"):
+                path = "/v5/person/enrich"
+            route = ROUTES.get(path)
+            if route is None:
+                status, body = 404, {"status": 404, "error": "not found"}
+            else:
+                body = route(
+                    config,
+                    dict(parse_qsl(url.query)),
+                    json.loads(raw) if raw else {},
+                )
+                status = body["status"] if isinstance(body, dict) else 200
+        content = self._encode(json.dumps(body).encode(), headers)
+        if config.bandwidth:
+            time.sleep((length + len(content)) / config.bandwidth)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _encode(self, content: bytes, headers: dict) -> bytes:
+        """
+        Compresses a response body in the encoding negotiated with the client,
+        if any.
+        """
+        config = self.server.config
+        accepted = self.headers.get("Accept-Encoding", "")
+        if config.zstd and "zstd" in accepted and self.server.zstd:
+            headers["Content-Encoding"] = "zstd"
+            return self.server.zstd(content)
+        if (config.gzip or config.zstd) and "gzip" in accepted:
+            headers["Content-Encoding"] = "gzip"
+            return gzip.compress(content, compresslevel=1)
+        return content
+
+    do_GET = _answer
+    do_POST = _answer
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class MockServer:
+    """
+    The mock API, served from a background thread.
+
+    Args:
+        config (MockConfig): The behavior of the API.
+        port (:obj:`int`, optional): The port to listen on, any free port
+            if 0.
+    """
+
+    def __init__(self, config: MockConfig, port: int = 0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.server.daemon_threads = True
+        self.server.request_queue_size = 1024
+        self.server.config = config
+        self.server.zstd = zstd_compressor()
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+
+    @property
+    def base_path(self) -> str:
+        """
+        The base path of the API, to give to PDLPY.
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v5"
+
+    def start(self):
+        """
+        Starts serving calls.
+        """
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops serving calls.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the options of the mock API to a parser.
+    """
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--payload", type=int, default=2048)
+    parser.add_argument("--rate-limited", type=float, default=0.0)
+    parser.add_argument("--errors", type=float, default=0.0)
+    parser.add_argument("--total", type=int, default=1000)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--zstd", action="store_true")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0)
+
+
+def options(args) -> list:
+    """
+    Returns the command line options reproducing parsed mock API options.
+    """
+    flags = [
+        f"--latency-ms={args.latency_ms}",
+        f"--jitter-ms={args.jitter_ms}",
+        f"--payload={args.payload}",
+        f"--rate-limited={args.rate_limited}",
+        f"--errors={args.errors}",
+        f"--total={args.total}",
+        f"--bandwidth-mbps={args.bandwidth_mbps}",
+    ]
+    return (
+        flags
+        + (["--gzip"] if args.gzip else [])
+        + (["--zstd"] if args.zstd else [])
+    )
+
+
+def config_from(args) -> MockConfig:
+    """
+    Builds the config of the mock API from parsed options.
+    """
+    return MockConfig(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        payload=args.payload,
+        rate_limited=args.rate_limited,
+        errors=args.errors,
+        total=args.total,
+        gzip=args.gzip,
+        zstd=args.zstd,
+        bandwidth=args.bandwidth_mbps * 125000,
+    )
+
+
+def spawn(args):
+    """
+    Runs the mock API in a new process, so that it does not compete with the
+    benchmarked client for the GIL.
+
+    Args:
+        args: The parsed mock API options.
+
+    Returns:
+        A (process, base_path) tuple; terminate the process when done.
+    """
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-u", __file__, *options(args)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    return process, process.stdout.readline().strip()
+
+
+def main():
+    """
+    Serves the mock API until interrupted, printing its base path.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=0)
+    arguments(parser)
+    args = parser.parse_args()
+    server = MockServer(config_from(args), args.port)
+    print(server.base_path, flush=True)
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
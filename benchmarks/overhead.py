@@ -0,0 +1,112 @@
+"""
+Per-call overhead of the client, without network.
+
+Calls are answered by an in-process transport returning a canned
+response, so that the time measured is only the client's own work:
+looking the section and the route up, validating the parameters,
+building the request and going through the session. Reports the
+microseconds per call of each API, with validated and trusted
+parameters.
+
+Run with: python benchmarks/overhead.py [--calls N] [--json]
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import requests
+
+from peopledatalabs import PDLPY
+from peopledatalabs.transport import Transport
+
+
+BODY = json.dumps({"status": 200, "likelihood": 9, "data": {}}).encode()
+
+SCENARIOS = {
+    "section": lambda client: client.person,
+    "enrich": lambda client: client.person.enrichment(
+        email="sean@peopledatalabs.com"
+    ),
+    "company_enrich": lambda client: client.company.enrichment(
+        website="peopledatalabs.com"
+    ),
+    "search": lambda client: client.person.search(
+        sql="SELECT * FROM person;", size=10
+    ),
+    "autocomplete": lambda client: client.autocomplete(
+        field="title", text="engineer"
+    ),
+    "retrieve": lambda client: client.person.retrieve("qEnOZ5Oh0poWnQ"),
+}
+
+
+class NullTransport(Transport):
+    """
+    Transport answering every call with the same response, at once.
+    """
+
+    def prepare(self, method, url, **kwargs):
+        return requests.Request(method, url, **kwargs)
+
+    def send(self, prepared, *, timeout=None, stream=False):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = BODY  # pylint: disable=protected-access
+        return response
+
+
+def measure(name: str, trusted: bool, calls: int) -> dict:
+    """
+    Times calls of a scenario.
+    """
+    scenario = SCENARIOS[name]
+    with PDLPY(
+        api_key="key",
+        transport=NullTransport(),
+        trusted=trusted,
+        rate_limit=False,
+        coalesce=False,
+    ) as client:
+        for _ in range(100):
+            scenario(client)
+        start = time.perf_counter()
+        for _ in range(calls):
+            scenario(client)
+        elapsed = time.perf_counter() - start
+    return {
+        "scenario": name,
+        "trusted": trusted,
+        "us_per_call": elapsed / calls * 1e6,
+    }
+
+
+def main():
+    """
+    Runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    logging.getLogger("PeopleDataLabs").setLevel(logging.ERROR)
+    if not args.json:
+        print(f"{'scenario':<16} {'validated us':>13} {'trusted us':>11}")
+    for name in args.scenarios.split(","):
+        rows = [
+            measure(name, trusted, args.calls) for trusted in (False, True)
+        ]
+        if args.json:
+            for row in rows:
+                print(json.dumps(row))
+            continue
+        print(
+            f"{name:<16} {rows[0]['us_per_call']:>13.1f}"
+            f" {rows[1]['us_per_call']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
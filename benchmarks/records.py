@@ -0,0 +1,85 @@
+"""
+Benchmark of the memory held by person search results.
+
+Compares a page of results decoded into dicts, as returned by
+response.json(), with the same results held as PersonRecord instances,
+before and after reading one nested section of each.
+
+Run with: python benchmarks/records.py [--records N]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from peopledatalabs.models.person import PersonRecord
+
+
+def person(row: int) -> dict:
+    """
+    Returns a synthetic person profile of a realistic shape.
+    """
+    return {
+        "id": f"person-{row:08d}",
+        "full_name": f"person {row}",
+        "job_company_id": f"company-{row % 1000}",
+        "job_title": "software engineer",
+        "location_name": "san francisco, california, united states",
+        "skills": [f"skill {index}" for index in range(20)],
+        "experience": [
+            {
+                "company": {"name": f"company {index}", "size": "51-200"},
+                "title": {"name": "engineer", "levels": ["senior"]},
+                "start_date": "2015-01",
+                "end_date": None,
+            }
+            for index in range(5)
+        ],
+        "education": [
+            {"school": {"name": "university"}, "degrees": ["bachelors"]}
+        ],
+        "profiles": [
+            {"network": "linkedin", "url": f"linkedin.com/in/p{row}"},
+            {"network": "github", "url": f"github.com/p{row}"},
+        ],
+    }
+
+
+def measure(name: str, build):
+    """
+    Prints the time taken and the memory held by the result of build.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<36} {elapsed * 1e3:>8.1f} ms {held / 2**20:>8.1f} MiB")
+    return result
+
+
+def main():
+    """
+    Runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=10000)
+    args = parser.parse_args()
+    page = [json.dumps(person(row)).encode() for row in range(args.records)]
+    measure("dicts", lambda: [json.loads(raw) for raw in page])
+    records = measure(
+        "PersonRecord", lambda: [PersonRecord.from_json(raw) for raw in page]
+    )
+
+    def read_profiles():
+        for record in records:
+            _ = record.profiles
+        return records
+
+    measure("PersonRecord, profiles read", read_profiles)
+
+
+if __name__ == "__main__":
+    main()
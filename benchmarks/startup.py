@@ -0,0 +1,105 @@
+"""
+Benchmark of the startup cost of the client: import time, client construction
+and the latency of the first call, each measured in a fresh interpreter against
+a local stub of the API.
+
+Run with: python benchmarks/startup.py [--runs N] [--max-import-ms MS]
+
+With --max-import-ms, exits with status 1 if the median time to import
+the client exceeds the given budget, so that it can guard CI against
+regressions.
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import statistics
+import subprocess
+import sys
+import threading
+
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+from peopledatalabs import PDLPY
+imported = time.perf_counter()
+client = PDLPY(api_key="key", base_path="{base_path}", max_retries=0)
+built = time.perf_counter()
+client.person.enrichment(email="sean@peopledatalabs.com")
+called = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "construction": built - imported,
+    "first call": called - built,
+}}))
+"""
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    Answers every call with an empty successful response.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Answers a GET call.
+        """
+        body = b'{"status": 200, "data": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+def measure(base_path: str) -> dict:
+    """
+    Runs the probe in a new interpreter and returns its timings.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(base_path=base_path)],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    """
+    Runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_path = f"http://127.0.0.1:{server.server_port}/v5"
+    try:
+        runs = [measure(base_path) for _ in range(args.runs)]
+    finally:
+        server.shutdown()
+
+    medians = {
+        step: statistics.median(run[step] for run in runs) * 1000
+        for step in runs[0]
+    }
+    for step, median in medians.items():
+        print(f"{step:<14} {median:>8.1f} ms (median of {args.runs})")
+    if args.max_import_ms is not None and (
+        medians["import"] > args.max_import_ms
+    ):
+        print(f"Import exceeds the budget of {args.max_import_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+End-to-end throughput benchmark against a local mock of the API.
+
+Drives PDLPY, from a pool of threads, and optionally AsyncPDLPY, from
+concurrent tasks, through several scenarios (one call of an API each)
+and concurrency levels. For each run, reports the calls per second, the
+p50/p90/p99 latency of a call, the calls which finally failed, and the
+resident memory of the process.
+
+The mock API runs in its own process, see benchmarks/mock_server.py for
+its options (latency, payload size, 429 and 5xx injection).
+
+Run with:
+    python benchmarks/throughput.py [--calls N] [--concurrency 1,8,32]
+        [--scenarios enrich,bulk,...] [--async] [--latency-ms MS] [--json]
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import os
+import resource
+import time
+
+import mock_server
+
+from peopledatalabs import AsyncPDLPY, PDLPY
+
+
+BULK_REQUESTS = [
+    {"metadata": {"row": row}, "params": {"email": f"p{row}@example.com"}}
+    for row in range(100)
+]
+
+SCENARIOS = {
+    "enrich": lambda client, i: client.person.enrichment(
+        email=f"p{i}@example.com"
+    ),
+    "company_enrich": lambda client, i: client.company.enrichment(
+        website=f"company{i}.com"
+    ),
+    "bulk": lambda client, i: client.person.bulk(requests=BULK_REQUESTS),
+    "search": lambda client, i: client.person.search(
+        sql="SELECT * FROM person;", size=100
+    ),
+    "clean": lambda client, i: client.company.cleaner(name=f"company {i}"),
+    "autocomplete": lambda client, i: client.autocomplete(
+        field="title", text=f"eng{i % 100}"
+    ),
+    "ip": lambda client, i: client.ip(ip=f"10.0.{i // 256 % 256}.{i % 256}"),
+}
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of sorted values.
+    """
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def rss_mib() -> float:
+    """
+    Returns the current resident memory of the process, in MiB.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # ru_maxrss is the peak, in KiB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (2**20 if peak > 2**32 else 2**10)
+
+
+def report(name: str, concurrency: int, elapsed: float, results: list):
+    """
+    Summarizes a run from its (latency, status) results.
+    """
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "calls": len(results),
+        "calls_per_second": len(results) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "failed": sum(status != 200 for _, status in results),
+        "rss_mib": rss_mib(),
+    }
+
+
+def run_sync(base_path: str, name: str, concurrency: int, calls: int):
+    """
+    Sends calls from concurrency threads sharing one client.
+    """
+    scenario = SCENARIOS[name]
+    with PDLPY(
+        api_key="key",
+        base_path=base_path,
+        pool_size=concurrency,
+        retry_backoff=0.01,
+    ) as client:
+
+        def call(i):
+            start = time.perf_counter()
+            status = scenario(client, i).status_code
+            return time.perf_counter() - start, status
+
+        call(-1)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(call, range(calls)))
+        return report(name, concurrency, time.perf_counter() - start, results)
+
+
+def run_async(base_path: str, name: str, concurrency: int, calls: int):
+    """
+    Sends calls from concurrency tasks sharing one asyncio client.
+    """
+    scenario = SCENARIOS[name]
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key="key",
+            base_path=base_path,
+            pool_size=concurrency,
+            retry_backoff=0.01,
+        ) as client:
+            counter = iter(range(calls))
+            results = []
+
+            async def worker():
+                for i in counter:
+                    start = time.perf_counter()
+                    response = await scenario(client, i)
+                    results.append(
+                        (time.perf_counter() - start, response.status_code)
+                    )
+
+            await scenario(client, -1)
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return report(
+                f"{name} (async)",
+                concurrency,
+                time.perf_counter() - start,
+                results,
+            )
+
+    return asyncio.run(run())
+
+
+def main():
+    """
+    Runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--async", dest="use_async", action="store_true")
+    parser.add_argument("--json", action="store_true")
+    mock_server.arguments(parser)
+    args = parser.parse_args()
+    # Injected 429s would otherwise log a warning each.
+    logging.getLogger("PeopleDataLabs").setLevel(logging.ERROR)
+    process, base_path = mock_server.spawn(args)
+    runners = [run_sync] + ([run_async] if args.use_async else [])
+    if not args.json:
+        print(
+            f"{'scenario':<24} {'conc':>5} {'calls/s':>9} {'p50 ms':>8}"
+            f" {'p90 ms':>8} {'p99 ms':>8} {'failed':>7} {'RSS MiB':>8}"
+        )
+    try:
+        for name in args.scenarios.split(","):
+            for concurrency in map(int, args.concurrency.split(",")):
+                for runner in runners:
+                    row = runner(base_path, name, concurrency, args.calls)
+                    if args.json:
+                        print(json.dumps(row))
+                        continue
+                    print(
+                        f"{row['scenario']:<24} {concurrency:>5}"
+                        f" {row['calls_per_second']:>9.0f}"
+                        f" {row['p50_ms']:>8.2f} {row['p90_ms']:>8.2f}"
+                        f" {row['p99_ms']:>8.2f} {row['failed']:>7}"
+                        f" {row['rss_mib']:>8.1f}"
+                    )
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Per-request cost of each transport.
+
+Sends the same calls through PDLPY with each shipped transport, from one
+thread, against a local mock of the API running in its own process, and
+reports the CPU time the client spends per call and the latency of a
+call. The mock API answers immediately by default, so that the latency
+is dominated by the client.
+
+Run with:
+    python benchmarks/transport.py [--calls N] [--payload BYTES]
+        [--scenarios enrich,search] [--transports requests,urllib3] [--json]
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import mock_server
+
+from peopledatalabs import PDLPY
+from peopledatalabs.transport import TRANSPORTS
+
+
+SCENARIOS = {
+    "enrich": lambda client, i: client.person.enrichment(
+        email=f"p{i}@example.com"
+    ),
+    "search": lambda client, i: client.person.search(
+        sql="SELECT * FROM person;", size=10
+    ),
+}
+
+
+def run(base_path: str, transport: str, name: str, calls: int) -> dict:
+    """
+    Sends calls sequentially through a transport.
+    """
+    scenario = SCENARIOS[name]
+    latencies = []
+    with PDLPY(
+        api_key="key",
+        base_path=base_path,
+        transport=transport,
+        trusted=True,
+        rate_limit=False,
+        coalesce=False,
+    ) as client:
+        for i in range(-10, 0):
+            scenario(client, i)
+        cpu = time.process_time()
+        start = time.perf_counter()
+        for i in range(calls):
+            call_start = time.perf_counter()
+            scenario(client, i)
+            latencies.append(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+    latencies.sort()
+    return {
+        "transport": transport,
+        "scenario": name,
+        "calls": calls,
+        "cpu_us_per_call": cpu / calls * 1e6,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[min(int(calls * 0.99), calls - 1)] * 1e6,
+        "calls_per_second": calls / elapsed,
+    }
+
+
+def main():
+    """
+    Runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--transports", default=",".join(TRANSPORTS))
+    parser.add_argument("--json", action="store_true")
+    mock_server.arguments(parser)
+    args = parser.parse_args()
+    logging.getLogger("PeopleDataLabs").setLevel(logging.ERROR)
+    process, base_path = mock_server.spawn(args)
+    if not args.json:
+        print(
+            f"{'transport':<10} {'scenario':<8} {'CPU us/call':>12}"
+            f" {'p50 us':>8} {'p99 us':>8} {'calls/s':>8}"
+        )
+    try:
+        for name in args.scenarios.split(","):
+            for transport in args.transports.split(","):
+                row = run(base_path, transport, name, args.calls)
+                if args.json:
+                    print(json.dumps(row))
+                    continue
+                print(
+                    f"{transport:<10} {name:<8}"
+                    f" {row['cpu_us_per_call']:>12.0f}"
+                    f" {row['p50_us']:>8.0f} {row['p99_us']:>8.0f}"
+                    f" {row['calls_per_second']:>8.0f}"
+                )
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
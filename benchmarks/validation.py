@@ -0,0 +1,100 @@
+"""
+Benchmark of the client-side validation of API parameters.
+
+Compares, per call, the previous validation (BaseModel.dict), the fast
+path, already validated model instances and trusted parameters. Email
+addresses differ on every call of the "distinct emails" rows, so that
+they are not served from the memoized validations.
+
+Run with: python benchmarks/validation.py
+"""
+
+from itertools import count
+import timeit
+
+from peopledatalabs.models import person as person_models
+from peopledatalabs.validation import validate_params
+
+
+ENRICHMENT = {
+    "email": "sean@peopledatalabs.com",
+    "name": "Sean Thorne",
+    "company": "People Data Labs",
+    "pretty": True,
+}
+
+BULK = {
+    "required": "emails",
+    "requests": [
+        {"metadata": {"row": row}, "params": ENRICHMENT} for row in range(100)
+    ],
+}
+
+
+def distinct(params: dict, counter=count()) -> dict:
+    """
+    Returns a copy of enrichment or bulk params with new email addresses.
+    """
+    if "requests" in params:
+        return {
+            **params,
+            "requests": [
+                {**request, "params": distinct(request["params"])}
+                for request in params["requests"]
+            ],
+        }
+    return {**params, "email": f"sean{next(counter)}@peopledatalabs.com"}
+
+
+def bench(name: str, func, number: int):
+    """
+    Prints the mean duration of a call to func, in microseconds.
+    """
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"{name:<40} {best / number * 1e6:>10.1f} us")
+
+
+def main():
+    """
+    Runs the benchmarks.
+    """
+    for model, params, number in (
+        (person_models.EnrichmentModel, ENRICHMENT, 2000),
+        (person_models.BulkModel, BULK, 50),
+    ):
+        print(f"{model.__name__}:")
+        instance = model(**params)
+        bench(
+            "  pydantic dict(exclude_none=True)",
+            lambda m=model, p=params: m(**p).dict(exclude_none=True),
+            number,
+        )
+        bench(
+            "  validate_params",
+            lambda m=model, p=params: validate_params(m, p),
+            number,
+        )
+        bench(
+            "  pydantic dict(), distinct emails",
+            lambda m=model, p=params: m(**distinct(p)).dict(exclude_none=True),
+            number,
+        )
+        bench(
+            "  validate_params, distinct emails",
+            lambda m=model, p=params: validate_params(m, distinct(p)),
+            number,
+        )
+        bench(
+            "  validate_params, model instance",
+            lambda m=model, i=instance: validate_params(m, i),
+            number,
+        )
+        bench(
+            "  validate_params, trusted",
+            lambda m=model, p=params: validate_params(m, p, trusted=True),
+            number,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,38 @@
 """
 PeopleDataLabs Python Client.
+
+The client classes are imported on first access, so that importing the
+package is cheap.
 """
 
-from .main import PDLPY
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache import MemoryCache, SQLiteCache
+    from .main import AsyncPDLPY, PDLPY
+    from .metrics import Metrics
 
 
 __version__ = "6.4.13"
 
-__all__ = ["PDLPY"]
+__all__ = ["AsyncPDLPY", "MemoryCache", "Metrics", "PDLPY", "SQLiteCache"]
+
+_MODULES = {
+    "AsyncPDLPY": "main",
+    "MemoryCache": "cache",
+    "Metrics": "metrics",
+    "PDLPY": "main",
+    "SQLiteCache": "cache",
+}
+
+
+def __getattr__(name: str):
+    if name in _MODULES:
+        module = importlib.import_module(f".{_MODULES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,251 @@
+"""
+Drivers for bulk enrichment of arbitrarily large inputs.
+
+Inputs are split in batches of at most the API's per-call limit, the
+batches are sent concurrently and the results are yielded one by one, in
+input order. Requests which failed transiently within a successful call
+are retried on their own, without resending the whole batch.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import time
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from .logger import get_logger
+from .retry import Retry
+
+
+logger = get_logger("bulk")
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """
+    Splits an iterable in lists of at most `size` items, lazily.
+
+    Args:
+        iterable: The items to split.
+        size (int): The maximum size of a chunk.
+
+    Returns:
+        An iterator over the chunks.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def batch_results(batch: List[dict], response) -> List[dict]:
+    """
+    Matches the response of a bulk call to the requests of its batch.
+
+    When the whole call failed, every item of the batch gets the call's
+    status and error, and when the API returned fewer results than
+    requests, each request left without one gets a 500 error result. Each
+    result carries the metadata of its request.
+
+    Args:
+        batch (list of dict): The requests sent in the call.
+        response: The response of the call.
+
+    Returns:
+        A list with one result per request, in the same order.
+    """
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if response.status_code == 200 and isinstance(body, list):
+        results = body
+        if len(results) != len(batch):
+            logger.warning(
+                "Bulk call for %s requests returned %s results",
+                len(batch),
+                len(results),
+            )
+            results = results[: len(batch)] + [
+                {
+                    "status": 500,
+                    "error": {
+                        "type": "missing_result",
+                        "message": "No result returned for this request",
+                    },
+                }
+                for _ in range(len(batch) - len(results))
+            ]
+    else:
+        error = body.get("error") if isinstance(body, dict) else None
+        logger.warning(
+            "Bulk call for %s requests failed with status %s: %s",
+            len(batch),
+            response.status_code,
+            error,
+        )
+        results = [
+            {"status": response.status_code, "error": error} for _ in batch
+        ]
+    for request, result in zip(batch, results):
+        if "metadata" in request and "metadata" not in result:
+            result["metadata"] = request["metadata"]
+    return results
+
+
+def _failed(results: List[dict], retry: Retry) -> List[int]:
+    """
+    Returns the indexes of the results which failed transiently.
+    """
+    return [
+        index
+        for index, result in enumerate(results)
+        if result.get("status") in retry.statuses
+    ]
+
+
+def send_batch(
+    bulk: Callable, batch: List[dict], retry: Optional[Retry], **kwargs
+) -> List[dict]:
+    """
+    Sends a batch through a bulk API, then retries the requests of the batch
+    which failed transiently.
+
+    Args:
+        bulk: The bulk API method.
+        batch (list of dict): The requests to send.
+        retry (Retry): The retry policy of the client, if any.
+        **kwargs: Additional parameters for every call.
+
+    Returns:
+        A list with one result per request, in the same order.
+    """
+    response = bulk(requests=batch, **kwargs)
+    results = batch_results(batch, response)
+    if retry is None or response.status_code != 200:
+        return results
+    attempt = 0
+    failed = _failed(results, retry)
+    while failed:
+        delay = retry.get_delay(attempt)
+        if delay is None:
+            break
+        time.sleep(delay)
+        retried = [batch[index] for index in failed]
+        response = bulk(requests=retried, **kwargs)
+        for index, result in zip(failed, batch_results(retried, response)):
+            results[index] = result
+        attempt += 1
+        failed = _failed(results, retry)
+    return results
+
+
+async def asend_batch(
+    bulk: Callable, batch: List[dict], retry: Optional[Retry], **kwargs
+) -> List[dict]:
+    """
+    Asyncio version of send_batch.
+    """
+    response = await bulk(requests=batch, **kwargs)
+    results = batch_results(batch, response)
+    if retry is None or response.status_code != 200:
+        return results
+    attempt = 0
+    failed = _failed(results, retry)
+    while failed:
+        delay = retry.get_delay(attempt)
+        if delay is None:
+            break
+        await asyncio.sleep(delay)
+        retried = [batch[index] for index in failed]
+        response = await bulk(requests=retried, **kwargs)
+        for index, result in zip(failed, batch_results(retried, response)):
+            results[index] = result
+        attempt += 1
+        failed = _failed(results, retry)
+    return results
+
+
+def iter_bulk(
+    bulk: Callable,
+    requests: Iterable[dict],
+    batch_size: int,
+    max_workers: int,
+    retry: Optional[Retry] = None,
+    **kwargs,
+) -> Iterator[dict]:
+    """
+    Sends requests through a bulk API from a pool of threads.
+
+    At most 2 * max_workers batches are held in memory at any time.
+
+    Args:
+        bulk: The bulk API method, e.g. Person.bulk.
+        requests (iterable of dict): The requests to send, as accepted in
+            the 'requests' parameter of the bulk API.
+        batch_size (int): The number of requests sent per call.
+        max_workers (int): The maximum number of concurrent calls.
+        retry (:obj:`Retry`, optional): The retry policy of the client.
+        **kwargs: Additional parameters for every call.
+
+    Returns:
+        An iterator over the result of each request, in input order.
+    """
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for batch in chunked(requests, batch_size):
+                pending.append(
+                    executor.submit(send_batch, bulk, batch, retry, **kwargs)
+                )
+                if len(pending) >= 2 * max_workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+async def aiter_bulk(
+    bulk: Callable,
+    requests: Iterable[dict],
+    batch_size: int,
+    max_workers: int,
+    retry: Optional[Retry] = None,
+    **kwargs,
+):
+    """
+    Sends requests through an asyncio bulk API from concurrent tasks.
+
+    Args:
+        bulk: The bulk API method of an asyncio client.
+        requests (iterable of dict): The requests to send, as accepted in
+            the 'requests' parameter of the bulk API.
+        batch_size (int): The number of requests sent per call.
+        max_workers (int): The maximum number of concurrent calls.
+        retry (:obj:`Retry`, optional): The retry policy of the client.
+        **kwargs: Additional parameters for every call.
+
+    Returns:
+        An async iterator over the result of each request, in input order.
+    """
+    pending = deque()
+    try:
+        for batch in chunked(requests, batch_size):
+            pending.append(
+                asyncio.ensure_future(
+                    asend_batch(bulk, batch, retry, **kwargs)
+                )
+            )
+            if len(pending) >= max_workers:
+                for result in await pending.popleft():
+                    yield result
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
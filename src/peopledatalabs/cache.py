@@ -0,0 +1,422 @@
+"""
+Response caches.
+
+Successful responses of the APIs whose results are stable (enrichment,
+cleaners, autocomplete, job_title, ip) can be served from a cache
+instead of being requested again. Keys are built from the URL and the
+validated parameters, regardless of the API key and of parameter
+ordering.
+"""
+
+import abc
+from collections import OrderedDict
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+import zlib
+
+from .logger import get_logger
+from .settings import settings
+
+
+logger = get_logger("cache")
+
+CACHEABLE_ROUTES = (
+    "person/enrich",
+    "company/enrich",
+    "company/clean",
+    "location/clean",
+    "school/clean",
+    "autocomplete",
+    "job_title/enrich",
+    "ip/enrich",
+)
+
+DISK_CACHEABLE_ROUTES = (
+    "person/enrich",
+    "person/identify",
+    "person/retrieve",
+    "company/enrich",
+    "company/clean",
+    "location/clean",
+    "school/clean",
+)
+
+
+class CachedResponse(NamedTuple):
+    """
+    Serializable copy of a response, as stored by persistent caches.
+    """
+
+    status_code: int
+    headers: dict
+    content: bytes
+    url: str
+
+
+def cache_key(url: str, params: Optional[dict]) -> str:
+    """
+    Builds the canonical cache key of a call.
+
+    Args:
+        url (str): The URL of the call.
+        params (dict): The validated parameters of the call.
+
+    Returns:
+        The URL followed by the parameters as sorted JSON, without the
+        API key.
+    """
+    params = {k: v for k, v in (params or {}).items() if k != "api_key"}
+    return f"{url}?" + json.dumps(
+        params, sort_keys=True, separators=(",", ":"), default=str
+    )
+
+
+class BaseCache(abc.ABC):
+    """
+    Base class for response caches.
+
+    Args:
+        ttls (:obj:`dict` of str: float, optional): Time to live in
+            seconds for each route. Routes of self.routes default to
+            settings.cache_ttl; a TTL of 0 disables caching for a route.
+    """
+
+    routes = CACHEABLE_ROUTES
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None):
+        self.ttls = dict.fromkeys(self.routes, settings.cache_ttl)
+        self.ttls.update(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def __get_validators__(cls):
+        """
+        Allows caches to be used as fields of pydantic dataclasses.
+        """
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value):
+        """
+        Checks the value is an instance of this class.
+        """
+        if not isinstance(value, cls):
+            raise TypeError(f"Expected {cls.__name__}, got {type(value)}.")
+        return value
+
+    def ttl(self, route: Optional[str]) -> Optional[float]:
+        """
+        Returns the time to live of the responses of a route, or None if they
+        are not cached.
+        """
+        return self.ttls.get(route) or None
+
+    def _record(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the hit and miss counts of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self),
+        }
+
+    @abc.abstractmethod
+    def get(self, key: str):
+        """
+        Returns the cached response of a key, or None.
+
+        Persistent caches return a CachedResponse.
+        """
+
+    @abc.abstractmethod
+    def set(self, key: str, response, ttl: float):
+        """
+        Caches the response of a key for ttl seconds.
+        """
+
+    @abc.abstractmethod
+    def __len__(self):
+        """
+        Returns the number of cached responses.
+        """
+
+
+class MemoryCache(BaseCache):
+    """
+    Thread-safe in-memory cache with LRU eviction and per-route TTLs.
+
+    Args:
+        maxsize (:obj:`int`, optional): The maximum number of responses
+            held; the least recently used are evicted first.
+        ttls (:obj:`dict` of str: float, optional): Time to live in
+            seconds for each route. Routes of CACHEABLE_ROUTES default to
+            settings.cache_ttl; a TTL of 0 disables caching for a route.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.cache_size,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        super().__init__(ttls=ttls)
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        response = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, response = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+                    response = None
+        self._record(response is not None)
+        return response
+
+    def set(self, key: str, response, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drops all cached responses.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """
+    Persistent SQLite cache, with per-route TTLs and size-based eviction.
+
+    The database can be shared by many threads and processes on the same
+    host: it runs in WAL mode, so that readers never block, and every
+    thread uses its own connection, opened anew in forked processes.
+    Bodies are stored zlib-compressed. When the stored bodies exceed
+    max_bytes, the entries closest to expiry are evicted first.
+
+    Args:
+        path (str): The path of the database file.
+        max_bytes (:obj:`int`, optional): The maximum size of the stored
+            (compressed) bodies.
+        ttls (:obj:`dict` of str: float, optional): Time to live in
+            seconds for each route. Routes of DISK_CACHEABLE_ROUTES default
+            to settings.cache_ttl; a TTL of 0 disables caching for a route.
+    """
+
+    routes = DISK_CACHEABLE_ROUTES
+
+    evict_every = 100
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = settings.disk_cache_max_bytes,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        super().__init__(ttls=ttls)
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = itertools.count(1)
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " expires REAL NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " status INTEGER NOT NULL,"
+                " headers TEXT NOT NULL,"
+                " url TEXT NOT NULL,"
+                " body BLOB NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_expires"
+                " ON responses (expires)"
+            )
+        connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a new connection to the database.
+        """
+        connection = sqlite3.connect(
+            self.path, timeout=settings.disk_cache_timeout
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the current thread, opening it on first use
+        and again in processes forked since, which must not use the connections
+        of their parent.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = self._connect()
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT status, headers, url, body FROM responses"
+                " WHERE key = ? AND expires > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        self._record(row is not None)
+        if row is None:
+            return None
+        status, headers, url, body = row
+        return CachedResponse(
+            status, json.loads(headers), zlib.decompress(body), url
+        )
+
+    def set(self, key: str, response, ttl: float):
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in ("content-encoding", "content-length")
+        }
+        body = zlib.compress(response.content)
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    time.time() + ttl,
+                    len(body),
+                    response.status_code,
+                    json.dumps(headers),
+                    str(response.url),
+                    body,
+                ),
+            )
+        if next(self._writes) % self.evict_every == 0:
+            self.evict()
+
+    def evict(self):
+        """
+        Deletes expired entries, then the entries closest to expiry until the
+        stored bodies fit in max_bytes.
+        """
+        with self._connection() as connection:
+            connection.execute(
+                "DELETE FROM responses WHERE expires <= ?", (time.time(),)
+            )
+            (total,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            excess = total - self.max_bytes
+            if excess <= 0:
+                return
+            rows = connection.execute(
+                "SELECT key, size FROM responses ORDER BY expires"
+            )
+            evicted = []
+            for key, size in rows:
+                if excess <= 0:
+                    break
+                evicted.append((key,))
+                excess -= size
+            connection.executemany(
+                "DELETE FROM responses WHERE key = ?", evicted
+            )
+        logger.debug("Evicted %s cached responses", len(evicted))
+
+    def warm(self, path: str) -> int:
+        """
+        Copies the unexpired entries of another cache database, e.g. a snapshot
+        of a hot cache, into this one.
+
+        Args:
+            path (str): The path of the source database.
+
+        Returns:
+            The number of entries copied.
+        """
+        connection = self._connection()
+        connection.execute("ATTACH DATABASE ? AS source", (os.fspath(path),))
+        try:
+            with connection:
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO responses"
+                    " SELECT * FROM source.responses WHERE expires > ?",
+                    (time.time(),),
+                )
+        finally:
+            connection.execute("DETACH DATABASE source")
+        logger.info("Warmed cache with %s responses", cursor.rowcount)
+        return cursor.rowcount
+
+    def snapshot(self, path: str):
+        """
+        Writes a compact copy of the cache to a new database file, which can be
+        shipped to other hosts and loaded with warm().
+
+        Args:
+            path (str): The path of the file to create.
+        """
+        self._connection().execute("VACUUM INTO ?", (os.fspath(path),))
+
+    def clear(self):
+        """
+        Drops all cached responses.
+        """
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def close(self):
+        """
+        Closes the connection of the current thread.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+            self._local.connection = None
+
+    def __len__(self):
+        (count,) = (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM responses WHERE expires > ?",
+                (time.time(),),
+            )
+            .fetchone()
+        )
+        return count
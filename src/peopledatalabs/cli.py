@@ -0,0 +1,420 @@
+"""
+The `pdl` command line tool.
+
+Enriches CSV or JSONL files of any size through the bulk enrichment APIs:
+
+    pdl bulk person people.csv enriched.jsonl --map "Email Address=email"
+
+Rows are read lazily and validated one by one, so that an invalid row
+gets an error result instead of failing its whole batch. Batches are sent
+concurrently and their results are appended to the output as JSON lines,
+in input order. After each batch the output is flushed and the number of
+rows done is saved to a checkpoint file, so that a run interrupted for any
+reason resumes where it stopped, without paying again for rows already
+enriched.
+"""
+
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from pydantic.v1 import BaseModel, ValidationError
+
+from .bulk import chunked, send_batch
+from .logger import get_logger
+from .settings import settings
+from .validation import validate_params
+
+
+logger = get_logger("cli")
+
+STATS = ("rows", "sent", "matched", "not_found", "failed", "invalid")
+
+
+def _models(section: str) -> Type[BaseModel]:
+    """
+    Returns the model of the parameters of one bulk request of a section.
+    """
+    # pylint: disable=import-outside-toplevel
+    if section == "person":
+        from .models.person import PersonBaseModel
+
+        return PersonBaseModel
+    from .models.company import CompanyBaseModel
+
+    return CompanyBaseModel
+
+
+def read_rows(path: str, input_format: Optional[str] = None) -> Iterator:
+    """
+    Reads the rows of a CSV or JSONL file lazily.
+
+    Args:
+        path (str): The path of the file, or "-" for stdin.
+        input_format (:obj:`str`, optional): "csv" or "jsonl". Guessed from
+            the extension of path if None.
+
+    Returns:
+        An iterator over the rows, as dicts.
+    """
+    if input_format is None:
+        input_format = "csv" if path.lower().endswith(".csv") else "jsonl"
+    stream = (
+        sys.stdin
+        if path == "-"
+        # pylint: disable-next=consider-using-with
+        else open(path, newline="", encoding="utf-8")
+    )
+    try:
+        if input_format == "csv":
+            yield from csv.DictReader(stream)
+        else:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+class RowMapper:  # pylint: disable=too-few-public-methods
+    """
+    Turns input rows into bulk requests.
+
+    Args:
+        model: The model of the parameters of a request.
+        mapping (dict of str: str): Field of the model for each input
+            column. Columns named after a field are mapped implicitly.
+        metadata (list of str): The columns copied into the metadata of
+            each request, along with the number of its row.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        mapping: Dict[str, str],
+        metadata: List[str],
+    ):
+        self.model = model
+        self.mapping = mapping
+        self.metadata = metadata
+        self.fields = frozenset(model.__fields__)
+
+    def __call__(self, index: int, row: dict) -> dict:
+        """
+        Maps and validates a row.
+
+        Args:
+            index (int): The number of the row, from 0.
+            row (dict): The row.
+
+        Returns:
+            The bulk request of the row, or, if it is invalid, an error
+            result with a 400 status.
+        """
+        metadata = {"row": index}
+        metadata.update((column, row.get(column)) for column in self.metadata)
+        params = {}
+        for column, value in row.items():
+            field = self.mapping.get(column, column)
+            if field in self.fields and value not in (None, ""):
+                params[field] = value
+        try:
+            params = validate_params(self.model, params)
+        except ValidationError as ex:
+            return {
+                "status": 400,
+                "error": {"type": "invalid_request", "message": str(ex)},
+                "metadata": metadata,
+            }
+        return {"metadata": metadata, "params": params}
+
+
+def new_checkpoint() -> dict:
+    """
+    Returns the checkpoint of a run which has not started: the number of rows
+    done, the size of their results in the output and the statistics.
+    """
+    return {"rows": 0, "offset": 0, "stats": dict.fromkeys(STATS, 0)}
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Reads a checkpoint, or returns a new one if the file is missing.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return new_checkpoint()
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    """
+    Replaces a checkpoint atomically, so that a crash never leaves it half
+    written.
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def enrich_batch(bulk, batch: List[dict], retry, **kwargs) -> List[dict]:
+    """
+    Sends the valid requests of a batch through a bulk API.
+
+    Args:
+        bulk: The bulk API method.
+        batch (list of dict): The requests and the error results of the
+            invalid rows, as returned by RowMapper.
+        retry (Retry): The retry policy of the client, if any.
+        **kwargs: Additional parameters for every call.
+
+    Returns:
+        The results of the batch, in input order.
+    """
+    valid = [request for request in batch if "params" in request]
+    results = iter(send_batch(bulk, valid, retry, **kwargs) if valid else ())
+    return [
+        next(results) if "params" in request else request for request in batch
+    ]
+
+
+def _count(stats: dict, batch: List[dict], results: List[dict]):
+    """
+    Adds the outcome of a batch to the statistics of a run.
+    """
+    stats["rows"] += len(batch)
+    for request, result in zip(batch, results):
+        if "params" not in request:
+            stats["invalid"] += 1
+            continue
+        stats["sent"] += 1
+        status = result.get("status")
+        if status == 200:
+            stats["matched"] += 1
+        elif status == 404:
+            stats["not_found"] += 1
+        else:
+            stats["failed"] += 1
+
+
+def bulk_requests(args, skip: int) -> Iterator[dict]:
+    """
+    Reads the input of a run and turns its rows into bulk requests.
+
+    Args:
+        args: The parsed command line arguments.
+        skip (int): The number of rows already done, which are skipped.
+    """
+    mapper = RowMapper(
+        _models(args.section), dict(args.map), list(args.metadata)
+    )
+    for index, row in enumerate(read_rows(args.input, args.input_format)):
+        if index >= skip:
+            yield mapper(index, row)
+
+
+def run_bulk(client, args) -> Tuple[dict, int]:
+    """
+    Runs a bulk enrichment, resuming from its checkpoint if any.
+
+    Args:
+        client (PDLPY): The client sending the calls.
+        args: The parsed command line arguments.
+
+    Returns:
+        The statistics of the whole run, including previous attempts, and
+        the number of rows done by previous attempts.
+    """
+    checkpoint_path = args.checkpoint or args.output + ".checkpoint"
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint["rows"] and not os.path.exists(args.output):
+        logger.warning("Output %s is missing, starting over", args.output)
+        checkpoint = new_checkpoint()
+    stats = checkpoint["stats"]
+    resumed = checkpoint["rows"]
+    if resumed:
+        logger.info("Resuming after %s rows", resumed)
+    params = {
+        name: value
+        for name, value in (
+            ("required", args.required),
+            ("min_likelihood", args.min_likelihood),
+        )
+        if value is not None
+    }
+    bulk = getattr(client, args.section).bulk
+    pending = deque()
+    mode = "r+b" if resumed else "wb"
+    with open(args.output, mode) as output, ThreadPoolExecutor(
+        args.workers
+    ) as executor:
+        # Drops the results written after the last checkpoint, which will
+        # be sent again.
+        output.truncate(checkpoint["offset"])
+        output.seek(checkpoint["offset"])
+
+        def write(batch, future):
+            results = future.result()
+            for result in results:
+                output.write(json.dumps(result).encode() + b"\n")
+            output.flush()
+            os.fsync(output.fileno())
+            _count(stats, batch, results)
+            checkpoint["rows"] += len(batch)
+            checkpoint["offset"] = output.tell()
+            save_checkpoint(checkpoint_path, checkpoint)
+
+        try:
+            for batch in chunked(
+                bulk_requests(args, resumed), args.batch_size
+            ):
+                pending.append(
+                    (
+                        batch,
+                        executor.submit(
+                            enrich_batch, bulk, batch, client.retry, **params
+                        ),
+                    )
+                )
+                if len(pending) >= 2 * args.workers:
+                    write(*pending.popleft())
+            while pending:
+                write(*pending.popleft())
+        finally:
+            for _, future in pending:
+                future.cancel()
+    return stats, resumed
+
+
+def _mapping(value: str):
+    column, separator, field = value.rpartition("=")
+    if not separator or not column or not field:
+        raise argparse.ArgumentTypeError(
+            f"Expected COLUMN=FIELD, got {value!r}."
+        )
+    return column, field
+
+
+def parser() -> argparse.ArgumentParser:
+    """
+    Builds the parser of the command line arguments.
+    """
+    main_parser = argparse.ArgumentParser(
+        prog="pdl", description="People Data Labs command line tool."
+    )
+    commands = main_parser.add_subparsers(dest="command", required=True)
+    bulk = commands.add_parser(
+        "bulk",
+        help="Enrich a CSV or JSONL file through a bulk enrichment API.",
+        description=(
+            "Enrich a CSV or JSONL file through a bulk enrichment API,"
+            " writing one JSON result per row. Interrupted runs resume from"
+            " their checkpoint when run again with the same arguments."
+        ),
+    )
+    bulk.add_argument("section", choices=("person", "company"))
+    bulk.add_argument("input", help='The input file, or "-" for stdin.')
+    bulk.add_argument("output", help="The JSONL file of the results.")
+    bulk.add_argument(
+        "--input-format",
+        choices=("csv", "jsonl"),
+        help="The format of the input, guessed from its extension if absent.",
+    )
+    bulk.add_argument(
+        "--map",
+        type=_mapping,
+        action="append",
+        default=[],
+        metavar="COLUMN=FIELD",
+        help="Maps an input column to a parameter of the API.",
+    )
+    bulk.add_argument(
+        "--metadata",
+        action="append",
+        default=[],
+        metavar="COLUMN",
+        help="Copies an input column into the metadata of each result.",
+    )
+    bulk.add_argument("--required", help="The 'required' parameter.")
+    bulk.add_argument(
+        "--min-likelihood", type=int, help="The 'min_likelihood' parameter."
+    )
+    bulk.add_argument(
+        "--batch-size", type=int, default=settings.bulk_batch_size
+    )
+    bulk.add_argument("--workers", type=int, default=settings.bulk_max_workers)
+    bulk.add_argument(
+        "--checkpoint",
+        help="The checkpoint file, OUTPUT.checkpoint by default.",
+    )
+    bulk.add_argument(
+        "--api-key",
+        default=os.environ.get("PDL_API_KEY"),
+        help="The API key, $PDL_API_KEY by default.",
+    )
+    bulk.add_argument("--base-path", help="The base URL of the API.")
+    bulk.add_argument("--sandbox", action="store_true")
+    return main_parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the `pdl` command.
+
+    Args:
+        argv (list of str): The arguments, sys.argv[1:] if None.
+
+    Returns:
+        The exit status.
+    """
+    arguments = parser()
+    args = arguments.parse_args(argv)
+    if not 1 <= args.batch_size <= settings.bulk_batch_size:
+        arguments.error(
+            f"--batch-size must be between 1 and {settings.bulk_batch_size}"
+        )
+    if args.workers < 1:
+        arguments.error("--workers must be at least 1")
+    if args.api_key is None:
+        arguments.error("--api-key or $PDL_API_KEY is required")
+    # pylint: disable=import-outside-toplevel
+    from .main import PDLPY
+
+    options = {"sandbox": args.sandbox}
+    if args.base_path is not None:
+        options["base_path"] = args.base_path
+    start = time.perf_counter()
+    with PDLPY(
+        api_key=args.api_key,
+        pool_size=max(args.workers, settings.pool_size),
+        trusted=True,
+        **options,
+    ) as client:
+        try:
+            stats, resumed = run_bulk(client, args)
+        except KeyboardInterrupt:
+            print("pdl: interrupted, run again to resume", file=sys.stderr)
+            return 130
+    elapsed = time.perf_counter() - start
+    report = " ".join(f"{name}={stats[name]}" for name in STATS)
+    rate = (stats["rows"] - resumed) / elapsed if elapsed else 0.0
+    print(
+        f"{report} elapsed={elapsed:.1f}s rows_per_second={rate:.1f}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
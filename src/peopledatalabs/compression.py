@@ -0,0 +1,103 @@
+"""
+Compression of request bodies and negotiation of response encodings.
+
+JSON bodies of POST calls, e.g. the requests of a bulk call or a large
+Elasticsearch query, can be gzipped, when at least
+settings.compress_min_bytes long. Responses are negotiated in the
+strongest encoding the installed decoders support: zstd (with
+backports.zstd or zstandard), then br (with brotli or brotlicffi), then
+gzip.
+"""
+
+import gzip
+from json import dumps
+from typing import Any, Dict, Iterable, Optional
+
+from .logger import get_logger
+from .settings import settings
+
+
+logger = get_logger("compression")
+
+# Response encodings, strongest first.
+ENCODINGS = ("zstd", "br", "gzip")
+
+
+def accept_encoding(supported: Iterable[str]) -> str:
+    """
+    Returns the Accept-Encoding header for the supported encodings.
+
+    Args:
+        supported: The encodings the HTTP client can decode.
+
+    Returns:
+        The encodings of ENCODINGS among supported, strongest first, e.g.
+        "zstd, gzip". Always holds gzip.
+    """
+    supported = set(supported) | {"gzip"}
+    return ", ".join(name for name in ENCODINGS if name in supported)
+
+
+def urllib3_encodings() -> str:
+    """
+    Returns the Accept-Encoding header of the transports built on urllib3.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    return accept_encoding(ACCEPT_ENCODING.split(","))
+
+
+def httpx_encodings(httpx) -> str:
+    """
+    Returns the Accept-Encoding header of the asyncio client.
+
+    Args:
+        httpx: The httpx module.
+    """
+    # pylint: disable-next=protected-access
+    decoders = getattr(httpx._decoders, "SUPPORTED_DECODERS", {})
+    return accept_encoding(decoders)
+
+
+def encode_body(
+    kwargs: Dict[str, Any],
+    *,
+    field: str = "data",
+    min_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Serializes the JSON body of a call, gzipped if long enough.
+
+    Args:
+        kwargs (dict): The arguments of the call, with its body as "json"
+            and its "headers".
+        field (:obj:`str`, optional): The argument receiving the encoded
+            body, "data" for transports, "content" for httpx.
+        min_bytes (:obj:`int`, optional): The size from which bodies are
+            gzipped. Defaults to settings.compress_min_bytes.
+
+    Returns:
+        The arguments with the body encoded, with a Content-Encoding
+        header if gzipped. kwargs itself if the call has no JSON body.
+    """
+    body = kwargs.get("json")
+    if body is None:
+        return kwargs
+    if min_bytes is None:
+        min_bytes = settings.compress_min_bytes
+    kwargs = dict(kwargs)
+    del kwargs["json"]
+    data = dumps(body, allow_nan=False).encode()
+    if len(data) >= min_bytes:
+        size = len(data)
+        data = gzip.compress(
+            data, compresslevel=settings.compress_level, mtime=0
+        )
+        kwargs["headers"] = {
+            **(kwargs.get("headers") or {}),
+            "Content-Encoding": "gzip",
+        }
+        logger.debug("Gzipped a body of %s bytes to %s", size, len(data))
+    kwargs[field] = data
+    return kwargs
@@ -2,7 +2,7 @@
 Package to resolve endpoints from the People Data Labs' API.
 """
 
-from typing import Type
+from typing import Callable, Iterable, Optional, Type
 
 from pydantic.v1 import (
     BaseModel,
@@ -11,17 +11,21 @@ from pydantic.v1 import (
 )
 from pydantic.v1.dataclasses import dataclass
 
+from ..bulk import aiter_bulk, iter_bulk
 from ..errors import InvalidEndpointError
+from ..pages import aiter_pages, iter_pages
 from ..requests import Request
+from ..routes import HEADERS, Route, RouteTable
+from ..scroll import AsyncScrollIterator, ScrollIterator
+from ..session import AsyncSession, BaseSession
+from ..stream import AsyncRecordStream, RecordStream
 from ..settings import settings
 from ..utils import check_empty_parameters
+from ..validation import merge_params
 
-headers = {
-    "Accept-Encoding": "gzip",
-    "Content-Type": "application/json",
-    "User-Agent": "PDL-PYTHON-SDK",
-    "SDK-Version": settings.sdk_version,
-}
+# The default headers of every call, kept for backward compatibility: clients
+# built after they are changed send the changed headers.
+headers = HEADERS
 
 
 @dataclass
@@ -34,11 +38,38 @@ class Endpoint:
         base_path (str): PeopleDataLabs' API base URL.
         section: (:obj:`str`, optional): The section to prepend to the
             API endpoint.
+        session (:obj:`BaseSession`, optional): The connection pool shared
+            by the client's requests.
+        trusted (:obj:`bool`, optional): Whether parameters are sent
+            without being validated.
+        routes (:obj:`RouteTable`, optional): The compiled routes shared by
+            the client's sections. If None, the endpoint compiles its own.
     """
 
     api_key: str
     base_path: HttpUrl
     section: str = None
+    session: BaseSession = None
+    trusted: bool = False
+    routes: RouteTable = None
+
+    def __post_init__(self):
+        """
+        Creates the route table of the endpoint if none was given.
+        """
+        if self.routes is None:
+            self.routes = RouteTable(self.api_key, self.base_path)
+
+    def get_route(self, endpoint: str):
+        """
+        Forms the route of the API, i.e. its path relative to base_path.
+
+        Args:
+            endpoint (str): The endpoint of the API to call.
+        """
+        if self.section:
+            return self.section + "/" + endpoint
+        return endpoint
 
     def get_url(self, endpoint: str):
         """
@@ -47,12 +78,49 @@ class Endpoint:
         Args:
             endpoint (str): The endpoint of the API to call.
         """
-        url = self.base_path
-        if self.section:
-            url += "/" + self.section
-        url += "/" + endpoint
+        return self.base_path + "/" + self.get_route(endpoint)
 
-        return url
+    def _route(
+        self, endpoint: str, method: str, model: Type[BaseModel]
+    ) -> Route:
+        """
+        Returns the compiled route of an API of the section.
+
+        Args:
+            endpoint (str): The endpoint of the API, e.g. "enrich".
+            method (str): The HTTP method of the API.
+            model: The model used for parameters validation.
+        """
+        return self.routes.get(self.get_route(endpoint), method, model)
+
+    def _call(self, route: Route, params, stream: bool = False):
+        """
+        Calls an API through its compiled route.
+
+        Args:
+            route (Route): The route of the API.
+            params: The parameters of the call, as a dict or as an instance
+                of the route's validator.
+            stream (:obj:`bool`, optional): Whether the body of the
+                response is read on demand.
+
+        Returns:
+            A requests.Response object with the result of the HTTP call.
+        """
+        request = Request(
+            self.api_key,
+            route.url,
+            route.headers,
+            params,
+            route.validator,
+            session=self.session,
+            route=route.name,
+            trusted=self.trusted,
+            stream=stream,
+        )
+        if route.method == "GET":
+            return request.get()
+        return request.post()
 
     def __getattr__(self, method_name):
         """
@@ -73,92 +141,108 @@ class Endpoint:
         return method
 
     @check_empty_parameters
-    def _bulk(self, model: Type[BaseModel], **kwargs):
+    def _bulk(
+        self,
+        model: Type[BaseModel],
+        params: Optional[BaseModel] = None,
+        stream: bool = False,
+        **kwargs,
+    ):
         """
         Calls PeopleDataLabs' bulk enrichment API.
 
         Args:
             model: The model used for parameters validation.
+            params (:obj:`BaseModel`, optional): An instance of model
+                holding parameters already validated.
+            stream (:obj:`bool`, optional): Whether the body of the
+                response is read on demand, e.g. by a RecordStream.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = self.get_url(endpoint="bulk")
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers=headers,
-            params=kwargs,
-            validator=model,
-        ).post()
+        return self._call(
+            self._route("bulk", "POST", model),
+            merge_params(params, kwargs),
+            stream,
+        )
 
     @check_empty_parameters
-    def _cleaner(self, model: Type[BaseModel], **kwargs):
+    def _cleaner(
+        self,
+        model: Type[BaseModel],
+        params: Optional[BaseModel] = None,
+        **kwargs,
+    ):
         """
         Calls PeopleDataLabs' cleaner API.
 
         Args:
             model: The model used for parameters validation.
+            params (:obj:`BaseModel`, optional): An instance of model
+                holding parameters already validated.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = self.get_url(endpoint="clean")
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers=headers,
-            params=kwargs,
-            validator=model,
-        ).get()
+        return self._call(
+            self._route("clean", "GET", model),
+            merge_params(params, kwargs),
+        )
 
     @check_empty_parameters
-    def _enrichment(self, model: Type[BaseModel], **kwargs):
+    def _enrichment(
+        self,
+        model: Type[BaseModel],
+        params: Optional[BaseModel] = None,
+        **kwargs,
+    ):
         """
         Calls PeopleDataLabs' enrichment API.
 
         Args:
             model: The model used for parameters validation.
+            params (:obj:`BaseModel`, optional): An instance of model
+                holding parameters already validated.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = self.get_url(endpoint="enrich")
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers=headers,
-            params=kwargs,
-            validator=model,
-        ).get()
+        return self._call(
+            self._route("enrich", "GET", model),
+            merge_params(params, kwargs),
+        )
 
     @check_empty_parameters
-    def _identify(self, model: Type[BaseModel], **kwargs):
+    def _identify(
+        self,
+        model: Type[BaseModel],
+        params: Optional[BaseModel] = None,
+        **kwargs,
+    ):
         """
         Calls PeopleDataLabs' identify API.
 
         Args:
             model: The model used for parameters validation.
+            params (:obj:`BaseModel`, optional): An instance of model
+                holding parameters already validated.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = self.get_url(endpoint="identify")
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers=headers,
-            params=kwargs,
-            validator=model,
-        ).get()
+        return self._call(
+            self._route("identify", "GET", model),
+            merge_params(params, kwargs),
+        )
 
     def _retrieve(
         self,
@@ -179,78 +263,226 @@ class Endpoint:
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = self.get_url(endpoint="retrieve")
-        url += "/" + person_id
+        route = self._route("retrieve", "GET", model)
         return Request(
-            api_key=self.api_key,
-            url=url,
-            headers=headers,
-            params=kwargs,
-            validator=model,
+            self.api_key,
+            route.url + "/" + person_id,
+            route.headers,
+            kwargs,
+            route.validator,
+            session=self.session,
+            route=route.name,
+            trusted=self.trusted,
         ).get()
 
     @check_empty_parameters
-    def _search(self, model: Type[BaseModel], **kwargs):
+    def _search(
+        self,
+        model: Type[BaseModel],
+        params: Optional[BaseModel] = None,
+        stream: bool = False,
+        **kwargs,
+    ):
         """
         Calls PeopleDataLabs' search API.
 
         Args:
             model: The model used for parameters validation.
+            params (:obj:`BaseModel`, optional): An instance of model
+                holding parameters already validated.
+            stream (:obj:`bool`, optional): Whether the body of the
+                response is read on demand, e.g. by a RecordStream.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = self.get_url(endpoint="search")
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers=headers,
-            params=kwargs,
-            validator=model,
-        ).post()
+        return self._call(
+            self._route("search", "POST", model),
+            merge_params(params, kwargs),
+            stream,
+        )
 
     @check_empty_parameters
-    def _changelog(self, model: Type[BaseModel], **kwargs):
+    def _changelog(
+        self,
+        model: Type[BaseModel],
+        params: Optional[BaseModel] = None,
+        **kwargs,
+    ):
         """
         Calls PeopleDataLabs' changelog API.
 
         Args:
             model: The model used for parameters validation.
+            params (:obj:`BaseModel`, optional): An instance of model
+                holding parameters already validated.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = self.get_url(endpoint="changelog")
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers=headers,
-            params=kwargs,
-            validator=model,
-        ).post()
+        return self._call(
+            self._route("changelog", "POST", model),
+            merge_params(params, kwargs),
+        )
 
     @check_empty_parameters
-    def _company_bulk(self, model: Type[BaseModel], **kwargs):
+    def _company_bulk(
+        self,
+        model: Type[BaseModel],
+        params: Optional[BaseModel] = None,
+        stream: bool = False,
+        **kwargs,
+    ):
         """
         Calls PeopleDataLabs' company bulk enrichment API.
 
         Args:
             model: The model used for parameters validation.
+            params (:obj:`BaseModel`, optional): An instance of model
+                holding parameters already validated.
+            stream (:obj:`bool`, optional): Whether the body of the
+                response is read on demand, e.g. by a RecordStream.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = self.get_url(endpoint="enrich/bulk")
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers=headers,
-            params=kwargs,
-            validator=model,
-        ).post()
+        return self._call(
+            self._route("enrich/bulk", "POST", model),
+            merge_params(params, kwargs),
+            stream,
+        )
+
+    def _iter_bulk(
+        self,
+        bulk: Callable,
+        requests: Iterable[dict],
+        batch_size: int,
+        max_workers: int,
+        **kwargs,
+    ):
+        """
+        Sends any number of requests through a bulk API, in concurrent batches.
+
+        Args:
+            bulk: The bulk API method.
+            requests (iterable of dict): The requests to send.
+            batch_size (int): The number of requests sent per call.
+            max_workers (int): The maximum number of concurrent calls.
+            **kwargs: Additional parameters for every call.
+
+        Returns:
+            An iterator over the result of each request, in input order.
+            An async iterator if the endpoint uses an AsyncSession.
+        """
+        if not 1 <= batch_size <= settings.bulk_batch_size:
+            raise ValueError(
+                f"batch_size must be between 1 and {settings.bulk_batch_size}."
+            )
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        retry = self.session.retry if self.session is not None else None
+        if isinstance(self.session, AsyncSession):
+            return aiter_bulk(
+                bulk, requests, batch_size, max_workers, retry, **kwargs
+            )
+        return iter_bulk(
+            bulk, requests, batch_size, max_workers, retry, **kwargs
+        )
+
+    def _iter_scroll(
+        self,
+        call: Callable,
+        scroll_token: Optional[str],
+        page_offset: int,
+        **kwargs,
+    ):
+        """
+        Iterates over all the records of a paginated API by following its
+        scroll_token.
+
+        Args:
+            call: The API method.
+            scroll_token (str): The token to resume from, if any.
+            page_offset (int): The number of records of the resumed page
+                to skip.
+            **kwargs: Parameters for every call.
+
+        Returns:
+            A ScrollIterator, or an AsyncScrollIterator if the endpoint
+            uses an AsyncSession.
+        """
+
+        def fetch(token):
+            return call(scroll_token=token, **kwargs)
+
+        if isinstance(self.session, AsyncSession):
+            iterator = AsyncScrollIterator
+        else:
+            iterator = ScrollIterator
+        return iterator(
+            fetch, scroll_token=scroll_token, page_offset=page_offset
+        )
+
+    def _iter_pages(
+        self,
+        call: Callable,
+        max_workers: int,
+        ordered: bool,
+        **kwargs,
+    ):
+        """
+        Iterates over the records of a search by fetching its pages
+        concurrently, by offset.
+
+        Args:
+            call: The search API method.
+            max_workers (int): The maximum number of concurrent calls.
+            ordered (bool): Whether records are yielded in search order.
+            **kwargs: Parameters for every call. 'from_' is the offset of
+                the first page and 'size' the number of records per page.
+
+        Returns:
+            An iterator over the records, or an async iterator if the
+            endpoint uses an AsyncSession.
+        """
+        size = kwargs.pop("size", settings.search_page_size)
+        if not 1 <= size <= settings.search_page_size:
+            raise ValueError(
+                f"size must be between 1 and {settings.search_page_size}."
+            )
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        start = kwargs.pop("from_", None) or 0
+
+        def fetch(offset, page_size):
+            return call(from_=offset, size=page_size, **kwargs)
+
+        if isinstance(self.session, AsyncSession):
+            return aiter_pages(fetch, start, size, max_workers, ordered)
+        return iter_pages(fetch, start, size, max_workers, ordered)
+
+    def _stream_records(self, call: Callable, key: Optional[str], **kwargs):
+        """
+        Calls an API with a streamed response and decodes its records one at a
+        time.
+
+        Args:
+            call: The API method.
+            key (str): The member of the response holding the records, or
+                None for a top-level array.
+            **kwargs: Parameters for the call.
+
+        Returns:
+            A RecordStream, or an AsyncRecordStream if the endpoint uses an
+            AsyncSession.
+        """
+        response = call(stream=True, **kwargs)
+        if isinstance(self.session, AsyncSession):
+            return AsyncRecordStream(response, key)
+        return RecordStream(response, key)
@@ -2,11 +2,15 @@
 Defines all API endpoints for the 'Company' section.
 """
 
+from typing import Iterable, Optional
+
 from pydantic.v1.dataclasses import dataclass
 
 from . import Endpoint
 from ..models import company as company_models
 from ..logger import get_logger
+from ..settings import settings
+from ..utils import check_empty_parameters
 
 
 logger = get_logger("company")
@@ -20,57 +24,210 @@ class Company(Endpoint):
 
     section: str = "company"
 
-    def enrichment(self, **kwargs):
+    def enrichment(
+        self, params: Optional[company_models.EnrichmentModel] = None, **kwargs
+    ):
         """
         Calls PeopleDataLabs' company/enrich API.
         https://docs.peopledatalabs.com/docs/company-enrichment-api.
 
         Args:
+            params (:obj:`EnrichmentModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._enrichment(company_models.EnrichmentModel, **kwargs)
-
-    def bulk(self, **kwargs):
+        return self._enrichment(
+            company_models.EnrichmentModel, params, **kwargs
+        )
+
+    def bulk(
+        self,
+        params: Optional[company_models.CompanyBulkModel] = None,
+        **kwargs,
+    ):
         """
         Calls PeopleDataLabs' company bulk enrichment API.
         https://docs.peopledatalabs.com/docs/bulk-company-enrichment-api.
 
         Args:
+            params (:obj:`CompanyBulkModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._company_bulk(company_models.CompanyBulkModel, **kwargs)
+        return self._company_bulk(
+            company_models.CompanyBulkModel, params, **kwargs
+        )
 
-    def search(self, **kwargs):
+    @check_empty_parameters
+    def stream_bulk(self, **kwargs):
+        """
+        Calls the company bulk API and decodes its results one at a time from
+        the response stream, so that memory stays proportional to one result
+        instead of the whole response.
+
+        Args:
+            **kwargs: Parameters for the API as defined
+                in the documentation.
+
+        Returns:
+            A RecordStream yielding one result per request, in order. It
+            raises APIError if the call fails.
+        """
+        return self._stream_records(self.bulk, None, **kwargs)
+
+    def iter_bulk(
+        self,
+        requests: Iterable[dict],
+        batch_size: int = settings.bulk_batch_size,
+        max_workers: int = settings.bulk_max_workers,
+        **kwargs,
+    ):
+        """
+        Enriches any number of companies through the company bulk API.
+
+        Requests are sent in batches of `batch_size`, with at most
+        `max_workers` batches in flight, and are read lazily so that inputs
+        larger than memory can be streamed.
+
+        Args:
+            requests (iterable of dict): The requests to send, as accepted
+                in the 'requests' parameter of the bulk API.
+            batch_size (:obj:`int`, optional): The number of requests sent
+                per call, at most 100.
+            max_workers (:obj:`int`, optional): The maximum number of
+                concurrent calls.
+            **kwargs: Additional parameters for every call, e.g. 'required'.
+
+        Returns:
+            An iterator over the result of each request, in input order.
+            Each result carries the metadata of its request. Requests of a
+            failed call get the call's status and error.
+        """
+        return self._iter_bulk(
+            self.bulk, requests, batch_size, max_workers, **kwargs
+        )
+
+    def search(
+        self, params: Optional[company_models.SearchModel] = None, **kwargs
+    ):
         """
         Calls PeopleDataLabs' company/search API.
         https://docs.peopledatalabs.com/docs/company-search-api.
 
         Args:
+            params (:obj:`SearchModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._search(company_models.SearchModel, **kwargs)
+        return self._search(company_models.SearchModel, params, **kwargs)
+
+    @check_empty_parameters
+    def stream_search(self, **kwargs):
+        """
+        Calls the company/search API and decodes the records of the page one at
+        a time from the response stream, so that memory stays proportional to
+        one record instead of the whole page.
+
+        Args:
+            **kwargs: Parameters for the API as defined
+                in the documentation.
+
+        Returns:
+            A RecordStream yielding the records of the page. Its fields
+            hold the other members of the response, e.g. 'total' and
+            'scroll_token', once the records are read. It yields no records
+            if none match, and raises APIError if the call fails.
+        """
+        return self._stream_records(self.search, "data", **kwargs)
+
+    @check_empty_parameters
+    def iter_search(
+        self,
+        scroll_token: Optional[str] = None,
+        page_offset: int = 0,
+        **kwargs,
+    ):
+        """
+        Iterates over all the records matching a company search, across pages.
+
+        Pages are requested by following the scroll_token of each response
+        and the next page is fetched while the current one is consumed.
+        The iterator's scroll_token and page_offset attributes can be saved
+        and passed back to resume an interrupted iteration.
+
+        Args:
+            scroll_token (:obj:`str`, optional): The token to resume from.
+            page_offset (:obj:`int`, optional): The number of records of
+                the resumed page to skip.
+            **kwargs: Parameters for the search API as defined in the
+                documentation. 'size' defaults to 100 records per page.
+
+        Returns:
+            A ScrollIterator yielding one record at a time. It raises
+            APIError if a call fails.
+        """
+        kwargs.setdefault("size", settings.search_page_size)
+        return self._iter_scroll(
+            self.search, scroll_token, page_offset, **kwargs
+        )
+
+    @check_empty_parameters
+    def parallel_search(
+        self,
+        max_workers: int = settings.search_max_workers,
+        ordered: bool = True,
+        **kwargs,
+    ):
+        """
+        Iterates over the records matching a company search, fetching its pages
+        concurrently.
+
+        The first page is fetched to read the total number of matches,
+        then the following pages are fetched by offset, with at most
+        `max_workers` calls in flight. Offsets only reach the first 10,000
+        records: use iter_search for larger searches.
+
+        Args:
+            max_workers (:obj:`int`, optional): The maximum number of
+                concurrent calls.
+            ordered (:obj:`bool`, optional): Whether records are yielded in
+                search order. If False, each page is yielded as soon as it
+                arrives.
+            **kwargs: Parameters for the search API as defined in the
+                documentation. 'from_' is the offset of the first record
+                and 'size' defaults to 100 records per page.
+
+        Returns:
+            An iterator yielding one record at a time. It raises APIError
+            if a call fails.
+        """
+        return self._iter_pages(self.search, max_workers, ordered, **kwargs)
 
-    def cleaner(self, **kwargs):
+    def cleaner(
+        self, params: Optional[company_models.CleanerModel] = None, **kwargs
+    ):
         """
         Calls PeopleDataLabs' company/clean API.
 
         Args:
+            params (:obj:`CleanerModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._cleaner(company_models.CleanerModel, **kwargs)
+        return self._cleaner(company_models.CleanerModel, params, **kwargs)
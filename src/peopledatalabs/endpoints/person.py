@@ -2,6 +2,8 @@
 Defines all API endpoints for the 'Person' section.
 """
 
+from typing import Iterable, Optional
+
 from pydantic.v1 import (
     StrictStr,
     validate_arguments,
@@ -12,11 +14,20 @@ from . import Endpoint
 from .. import models
 from ..models import person as person_models
 from ..logger import get_logger
+from ..settings import settings
+from ..utils import check_empty_parameters
 
 
 logger = get_logger("endpoints.person")
 
 
+@validate_arguments
+def _check_person_id(person_id: StrictStr):  # pylint: disable=unused-argument
+    """
+    Raises the ValidationError of an invalid person ID.
+    """
+
+
 @dataclass
 class Person(Endpoint):
     """
@@ -25,50 +36,110 @@ class Person(Endpoint):
 
     section: str = "person"
 
-    def bulk(self, **kwargs):
+    def bulk(self, params: Optional[person_models.BulkModel] = None, **kwargs):
         """
         Calls PeopleDataLabs' person/bulk enrichment API.
         https://docs.peopledatalabs.com/docs/bulk-enrichment-api.
 
         Args:
+            params (:obj:`BulkModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._bulk(person_models.BulkModel, **kwargs)
+        return self._bulk(person_models.BulkModel, params, **kwargs)
+
+    @check_empty_parameters
+    def stream_bulk(self, **kwargs):
+        """
+        Calls the person/bulk API and decodes its results one at a time from
+        the response stream, so that memory stays proportional to one result
+        instead of the whole response.
+
+        Args:
+            **kwargs: Parameters for the API as defined
+                in the documentation.
+
+        Returns:
+            A RecordStream yielding one result per request, in order. It
+            raises APIError if the call fails.
+        """
+        return self._stream_records(self.bulk, None, **kwargs)
 
-    def enrichment(self, **kwargs):
+    def iter_bulk(
+        self,
+        requests: Iterable[dict],
+        batch_size: int = settings.bulk_batch_size,
+        max_workers: int = settings.bulk_max_workers,
+        **kwargs,
+    ):
+        """
+        Enriches any number of persons through the person/bulk API.
+
+        Requests are sent in batches of `batch_size`, with at most
+        `max_workers` batches in flight, and are read lazily so that inputs
+        larger than memory can be streamed.
+
+        Args:
+            requests (iterable of dict): The requests to send, as accepted
+                in the 'requests' parameter of the bulk API.
+            batch_size (:obj:`int`, optional): The number of requests sent
+                per call, at most 100.
+            max_workers (:obj:`int`, optional): The maximum number of
+                concurrent calls.
+            **kwargs: Additional parameters for every call, e.g. 'required'.
+
+        Returns:
+            An iterator over the result of each request, in input order.
+            Each result carries the metadata of its request. Requests of a
+            failed call get the call's status and error.
+        """
+        return self._iter_bulk(
+            self.bulk, requests, batch_size, max_workers, **kwargs
+        )
+
+    def enrichment(
+        self, params: Optional[person_models.EnrichmentModel] = None, **kwargs
+    ):
         """
         Calls PeopleDataLabs' person/enrich API.
         https://docs.peopledatalabs.com/docs/enrichment-api.
 
         Args:
+            params (:obj:`EnrichmentModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._enrichment(person_models.EnrichmentModel, **kwargs)
+        return self._enrichment(
+            person_models.EnrichmentModel, params, **kwargs
+        )
 
-    def identify(self, **kwargs):
+    def identify(
+        self, params: Optional[person_models.IdentifyModel] = None, **kwargs
+    ):
         """
         Calls PeopleDataLabs' person/identify API.
         https://docs.peopledatalabs.com/docs/identify-api.
 
         Args:
+            params (:obj:`IdentifyModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._identify(person_models.IdentifyModel, **kwargs)
+        return self._identify(person_models.IdentifyModel, params, **kwargs)
 
-    @validate_arguments
-    def retrieve(self, person_id: StrictStr, **kwargs):
+    def retrieve(self, person_id: Optional[StrictStr] = None, **kwargs):
         """
         Calls PeopleDataLabs' person/retrieve API.
         https://docs.peopledatalabs.com/docs/person-retrieve-api.
@@ -81,33 +152,160 @@ class Person(Endpoint):
 
         Returns:
             A requests.Response object with the result of the HTTP call.
+
+        Raises:
+            pydantic.v1.ValidationError: If person_id is not a string.
         """
+        if not isinstance(person_id, str):
+            _check_person_id(person_id)
         return self._retrieve(models.BaseRequestModel, person_id, **kwargs)
 
-    def search(self, **kwargs):
+    def search(
+        self, params: Optional[person_models.SearchModel] = None, **kwargs
+    ):
         """
         Calls PeopleDataLabs' person/search API.
         https://docs.peopledatalabs.com/docs/search-api.
 
         Args:
+            params (:obj:`SearchModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._search(person_models.SearchModel, **kwargs)
+        return self._search(person_models.SearchModel, params, **kwargs)
+
+    @check_empty_parameters
+    def stream_search(self, **kwargs):
+        """
+        Calls the person/search API and decodes the records of the page one at
+        a time from the response stream, so that memory stays proportional to
+        one record instead of the whole page.
+
+        Args:
+            **kwargs: Parameters for the API as defined
+                in the documentation.
+
+        Returns:
+            A RecordStream yielding the records of the page. Its fields
+            hold the other members of the response, e.g. 'total' and
+            'scroll_token', once the records are read. It yields no records
+            if none match, and raises APIError if the call fails.
+        """
+        return self._stream_records(self.search, "data", **kwargs)
+
+    @check_empty_parameters
+    def iter_search(
+        self,
+        scroll_token: Optional[str] = None,
+        page_offset: int = 0,
+        **kwargs,
+    ):
+        """
+        Iterates over all the records matching a person search, across pages.
+
+        Pages are requested by following the scroll_token of each response
+        and the next page is fetched while the current one is consumed.
+        The iterator's scroll_token and page_offset attributes can be saved
+        and passed back to resume an interrupted iteration.
+
+        Args:
+            scroll_token (:obj:`str`, optional): The token to resume from.
+            page_offset (:obj:`int`, optional): The number of records of
+                the resumed page to skip.
+            **kwargs: Parameters for the search API as defined in the
+                documentation. 'size' defaults to 100 records per page.
+
+        Returns:
+            A ScrollIterator yielding one record at a time. It raises
+            APIError if a call fails.
+        """
+        kwargs.setdefault("size", settings.search_page_size)
+        return self._iter_scroll(
+            self.search, scroll_token, page_offset, **kwargs
+        )
+
+    @check_empty_parameters
+    def parallel_search(
+        self,
+        max_workers: int = settings.search_max_workers,
+        ordered: bool = True,
+        **kwargs,
+    ):
+        """
+        Iterates over the records matching a person search, fetching its pages
+        concurrently.
 
-    def changelog(self, **kwargs):
+        The first page is fetched to read the total number of matches,
+        then the following pages are fetched by offset, with at most
+        `max_workers` calls in flight. Offsets only reach the first 10,000
+        records: use iter_search for larger searches.
+
+        Args:
+            max_workers (:obj:`int`, optional): The maximum number of
+                concurrent calls.
+            ordered (:obj:`bool`, optional): Whether records are yielded in
+                search order. If False, each page is yielded as soon as it
+                arrives.
+            **kwargs: Parameters for the search API as defined in the
+                documentation. 'from_' is the offset of the first record
+                and 'size' defaults to 100 records per page.
+
+        Returns:
+            An iterator yielding one record at a time. It raises APIError
+            if a call fails.
+        """
+        return self._iter_pages(self.search, max_workers, ordered, **kwargs)
+
+    def changelog(
+        self, params: Optional[person_models.ChangelogModel] = None, **kwargs
+    ):
         """
         Calls PeopleDataLabs' person/changelog API.
         https://docs.peopledatalabs.com/docs/person-changelog-api.
 
         Args:
+            params (:obj:`ChangelogModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._changelog(person_models.ChangelogModel, **kwargs)
+        return self._changelog(person_models.ChangelogModel, params, **kwargs)
+
+    @check_empty_parameters
+    def iter_changelog(
+        self,
+        scroll_token: Optional[str] = None,
+        page_offset: int = 0,
+        **kwargs,
+    ):
+        """
+        Iterates over all the changelog entries between origin_version and
+        current_version, across pages.
+
+        Pages are requested by following the scroll_token of each response
+        and the next page is fetched while the current one is consumed, so
+        that memory stays constant whatever the size of the release diff.
+        The iterator's scroll_token and page_offset attributes can be saved
+        and passed back to resume an interrupted sync.
+
+        Args:
+            scroll_token (:obj:`str`, optional): The token to resume from.
+            page_offset (:obj:`int`, optional): The number of entries of the
+                resumed page to skip.
+            **kwargs: Parameters for the changelog API as defined in the
+                documentation.
+
+        Returns:
+            A ScrollIterator yielding one changelog entry at a time. It
+            raises APIError if a call fails.
+        """
+        return self._iter_scroll(
+            self.changelog, scroll_token, page_offset, **kwargs
+        )
@@ -2,6 +2,8 @@
 Defines all API endpoints for the 'School' section.
 """
 
+from typing import Optional
+
 from pydantic.v1.dataclasses import dataclass
 
 from . import Endpoint
@@ -20,15 +22,19 @@ class School(Endpoint):
 
     section: str = "school"
 
-    def cleaner(self, **kwargs):
+    def cleaner(
+        self, params: Optional[school_models.CleanerModel] = None, **kwargs
+    ):
         """
         Calls PeopleDataLabs' school/clean API.
 
         Args:
+            params (:obj:`CleanerModel`, optional): Parameters
+                already validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        return self._cleaner(school_models.CleanerModel, **kwargs)
+        return self._cleaner(school_models.CleanerModel, params, **kwargs)
@@ -14,3 +14,20 @@ class InvalidEndpointError(Exception):
     Thrown when an endpoint is called for a section which does not support that
     endpoint.
     """
+
+
+class APIError(Exception):
+    """
+    Thrown when an API call made on the caller's behalf, e.g. while iterating
+    over search results, fails.
+
+    Args:
+        response: The response of the failed call.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        super().__init__(
+            f"API call failed with status {response.status_code}:"
+            f" {response.text}"
+        )
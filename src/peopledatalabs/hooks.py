@@ -0,0 +1,201 @@
+"""
+Instrumentation hooks.
+
+Callbacks registered on a client are called with an Event at each stage of
+the lifecycle of its calls:
+
+- request_start: a call is about to be sent, or served from the cache.
+- request_end: a call is over, with its final response, or with no
+  status if it failed without one.
+- retry: an attempt failed transiently and is retried.
+- cache_hit: a call was served from the cache.
+- validation: the parameters of a call were validated.
+
+Events are only built when a callback is registered for them, so that
+hooks cost nothing otherwise.
+"""
+
+import threading
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from .logger import get_logger
+from .ratelimit import parse_rate_limit
+
+
+logger = get_logger("hooks")
+
+EVENTS = ("request_start", "request_end", "retry", "cache_hit", "validation")
+
+CREDIT_HEADERS = (
+    "x-call-credits-spent",
+    "x-call-credits-type",
+    "x-totallimit-remaining",
+    "x-totallimit-purchased-remaining",
+    "x-totallimit-overages-remaining",
+    "x-lifetime-used",
+)
+
+
+def parse_credits(headers) -> Dict[str, object]:
+    """
+    Reads the credit headers of a response.
+
+    Args:
+        headers: The response headers.
+
+    Returns:
+        A dict mapping each credit header sent, without its "x-" prefix and
+        with underscores, to its value, as an int when numeric.
+    """
+    values = {}
+    for header in CREDIT_HEADERS:
+        value = headers.get(header)
+        if value is not None:
+            name = header[2:].replace("-", "_")
+            values[name] = int(value) if value.isdigit() else value
+    return values
+
+
+class Event(NamedTuple):
+    """
+    An event of the lifecycle of a call.
+
+    Attributes:
+        name (str): The name of the event, one of EVENTS.
+        route (str): The API route, e.g. "person/enrich".
+        method (str): The HTTP method.
+        url (str): The URL of the call, without its parameters.
+        status (int): The HTTP status of the response, None if an attempt
+            failed without one.
+        duration (float): For request_end, the total time of the call,
+            retries included; for validation, the time spent validating.
+            In seconds.
+        connect (float): The time spent opening a new connection (DNS
+            resolution, TCP and TLS handshakes) for the last attempt, 0.0
+            if a pooled connection was reused.
+        ttfb (float): The time from sending the last attempt to receiving
+            the headers of its response.
+        request_bytes (int): The size of the request body.
+        response_bytes (int): The size of the response body, as received.
+        rate_limit (tuple): The (limit, remaining, window in seconds) of
+            the rate-limit headers of the response, if any.
+        credits (dict): The credit headers of the response, see
+            parse_credits.
+        cached (bool): Whether the response was served from the cache.
+        attempt (int): For retry, the number of the failed attempt, from 0.
+        delay (float): For retry, the time waited before retrying.
+    """
+
+    name: str
+    route: Optional[str] = None
+    method: Optional[str] = None
+    url: Optional[str] = None
+    status: Optional[int] = None
+    duration: Optional[float] = None
+    connect: Optional[float] = None
+    ttfb: Optional[float] = None
+    request_bytes: Optional[int] = None
+    response_bytes: Optional[int] = None
+    rate_limit: Optional[Tuple[float, Optional[float], float]] = None
+    credits: Optional[dict] = None
+    cached: bool = False
+    attempt: Optional[int] = None
+    delay: Optional[float] = None
+
+
+def response_fields(response) -> dict:
+    """
+    Returns the status, rate-limit and credit fields of an event from a
+    response.
+    """
+    return {
+        "status": response.status_code,
+        "rate_limit": parse_rate_limit(response.headers),
+        "credits": parse_credits(response.headers),
+    }
+
+
+class Hooks:
+    """
+    Thread-safe registry of the callbacks of a client.
+
+    Callbacks are called synchronously, in registration order, from the
+    thread (or event loop) of the call; exceptions they raise are logged
+    and ignored.
+    """
+
+    def __init__(self):
+        self._callbacks = dict.fromkeys(EVENTS, ())
+        self._lock = threading.Lock()
+
+    @classmethod
+    def __get_validators__(cls):
+        """
+        Allows hooks to be used as fields of pydantic dataclasses.
+        """
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value):
+        """
+        Checks the value is an instance of this class.
+        """
+        if not isinstance(value, cls):
+            raise TypeError(f"Expected {cls.__name__}, got {type(value)}.")
+        return value
+
+    def _check(self, event: str):
+        if event not in self._callbacks:
+            raise ValueError(
+                f"Unknown event {event!r}, expected one of {EVENTS}."
+            )
+
+    def on(
+        self, event: str, callback: Optional[Callable[[Event], None]] = None
+    ):
+        """
+        Registers a callback for an event.
+
+        Args:
+            event (str): The name of the event, one of EVENTS.
+            callback: The function called with each Event. If None, a
+                decorator registering the decorated function is returned.
+
+        Returns:
+            The callback.
+
+        Raises:
+            ValueError: If the event is unknown.
+        """
+        self._check(event)
+        if callback is None:
+            return lambda callback: self.on(event, callback)
+        with self._lock:
+            self._callbacks[event] += (callback,)
+        return callback
+
+    def off(self, event: str, callback: Callable[[Event], None]):
+        """
+        Unregisters a callback of an event.
+        """
+        self._check(event)
+        with self._lock:
+            callbacks = list(self._callbacks[event])
+            callbacks.remove(callback)
+            self._callbacks[event] = tuple(callbacks)
+
+    def wants(self, event: str) -> bool:
+        """
+        Checks whether callbacks are registered for an event.
+        """
+        return bool(self._callbacks[event])
+
+    def emit(self, event: Event):
+        """
+        Calls the callbacks of an event.
+        """
+        for callback in self._callbacks[event.name]:
+            try:
+                callback(event)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Hook %r failed on %s", callback, event.name)
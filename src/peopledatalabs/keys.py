@@ -0,0 +1,218 @@
+"""
+Pooling of several API keys in one client.
+
+Each key has its own rate limits and credits. Before each attempt of a
+call, the pool picks the key with the most headroom on the route of the
+call, from the rate-limit and credit headers of the responses it got, so
+that the throughput of the client adds up across keys. Keys which are
+rate limited on a route are skipped until their pause is over; keys
+which are out of credits or rejected are sidelined for
+settings.key_cooldown seconds. Calls answered so are retried on another
+key at once.
+"""
+
+from itertools import count
+import time
+from typing import Dict, List, Optional
+
+from .hooks import parse_credits
+from .logger import get_logger
+from .ratelimit import RateLimiter
+from .settings import settings
+
+
+logger = get_logger("keys")
+
+
+def mask(key: str) -> str:
+    """
+    Returns the last characters of a key, for logs and snapshots.
+    """
+    return "..." + key[-4:]
+
+
+class _KeyState:  # pylint: disable=too-few-public-methods
+    """
+    What the pool knows about one of its keys.
+    """
+
+    __slots__ = ("key", "limiter", "credits", "sidelined_until")
+
+    def __init__(self, key: str, limits: Optional[Dict[str, int]]):
+        self.key = key
+        self.limiter = RateLimiter(limits)
+        self.credits = None
+        self.sidelined_until = 0.0
+
+
+class KeyPool:
+    """
+    Thread-safe pool of API keys shared by the calls of a client.
+
+    Args:
+        keys (list of str): The API keys, in order of preference while
+            nothing is known about their limits.
+        limits (:obj:`dict` of str: int, optional): Calls allowed per
+            minute for each route and key, used until the API reports its
+            own limits.
+        pace (:obj:`bool`, optional): Whether calls are paced to the rate
+            limits of their key. Headroom is tracked either way.
+        cooldown (:obj:`float`, optional): How long keys out of credits or
+            rejected are sidelined, in seconds.
+    """
+
+    exhausted_statuses = frozenset({401, 402})
+    failover_statuses = exhausted_statuses | {429}
+
+    def __init__(
+        self,
+        keys: List[str],
+        limits: Optional[Dict[str, int]] = None,
+        pace: bool = True,
+        cooldown: float = settings.key_cooldown,
+    ):
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            raise ValueError("A key pool needs at least one key.")
+        self.pace = pace
+        self.cooldown = cooldown
+        self._states = {key: _KeyState(key, limits) for key in keys}
+        self._turn = count()
+
+    @property
+    def keys(self) -> List[str]:
+        """
+        The keys of the pool.
+        """
+        return list(self._states)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @classmethod
+    def __get_validators__(cls):
+        """
+        Allows key pools to be used as fields of pydantic dataclasses.
+        """
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value):
+        """
+        Checks the value is an instance of this class.
+        """
+        if not isinstance(value, cls):
+            raise TypeError(f"Expected {cls.__name__}, got {type(value)}.")
+        return value
+
+    def _headroom(self, state: _KeyState, route: Optional[str], now: float):
+        """
+        Returns the headroom of a key on a route, None if sidelined.
+        """
+        if state.sidelined_until > now:
+            return None
+        return state.limiter.bucket(route).headroom()
+
+    def pick(self, route: Optional[str]) -> str:
+        """
+        Returns the key with the most headroom on a route.
+
+        Keys with the same headroom take turns. If every key is sidelined,
+        the one whose sideline ends first is returned, so that the call
+        still gets the API's answer.
+
+        Args:
+            route (str): The API route.
+        """
+        now = time.monotonic()
+        states = list(self._states.values())
+        start = next(self._turn) % len(states)
+        best, best_headroom = None, None
+        for state in states[start:] + states[:start]:
+            headroom = self._headroom(state, route, now)
+            if headroom is not None and (
+                best_headroom is None or headroom > best_headroom
+            ):
+                best, best_headroom = state, headroom
+        if best is None:
+            best = min(
+                states,
+                key=lambda state: max(
+                    state.sidelined_until,
+                    state.limiter.bucket(route).paused_until,
+                ),
+            )
+        return best.key
+
+    def reserve(self, key: str, route: Optional[str]) -> float:
+        """
+        Takes a token of a key for a call to a route.
+
+        Returns:
+            The number of seconds to wait before sending the call.
+        """
+        if not self.pace:
+            return 0.0
+        return self._states[key].limiter.reserve(route)
+
+    def update(self, key: str, route: Optional[str], response) -> bool:
+        """
+        Records the limits and credits of a key reported by a response.
+
+        Args:
+            key (str): The key the call was sent with.
+            route (str): The API route.
+            response: The response of the call.
+
+        Returns:
+            Whether the call failed because of its key (rate limited, out
+            of credits or rejected) and another key can take it.
+        """
+        state = self._states[key]
+        state.limiter.update(route, response)
+        reported = parse_credits(response.headers)
+        if isinstance(reported.get("totallimit_remaining"), int):
+            overages = reported.get("totallimit_overages_remaining")
+            state.credits = reported["totallimit_remaining"] + (
+                overages if isinstance(overages, int) else 0
+            )
+        exhausted = response.status_code in self.exhausted_statuses or (
+            state.credits is not None and state.credits <= 0
+        )
+        if exhausted:
+            state.sidelined_until = time.monotonic() + self.cooldown
+            logger.warning(
+                "Sidelining API key %s for %ss after %s",
+                mask(key),
+                self.cooldown,
+                response.status_code,
+            )
+        if response.status_code not in self.failover_statuses:
+            return False
+        now = time.monotonic()
+        return any(
+            other is not state
+            and self._headroom(other, route, now) is not None
+            for other in self._states.values()
+        )
+
+    def snapshot(self) -> List[dict]:
+        """
+        Returns what is known about each key.
+
+        Returns:
+            A list with, for each key: "key", its last characters;
+            "sidelined", the seconds left before it is used again;
+            "credits", the credits left, if reported; and "headroom", the
+            fraction of the rate limit left per route, None while paused.
+        """
+        now = time.monotonic()
+        return [
+            {
+                "key": mask(state.key),
+                "sidelined": max(state.sidelined_until - now, 0.0),
+                "credits": state.credits,
+                "headroom": state.limiter.headroom(),
+            }
+            for state in self._states.values()
+        ]
@@ -1,9 +1,17 @@
 """
 Logging utility module to invoke different children of the same root logger,
 from different modules (and tests).
+
+Request logging is built for the hot path: nothing is copied or
+serialized unless a record is actually emitted, calls can be sampled,
+and payloads are logged on a single line with long lists summarized,
+unless the "pretty" style is asked for.
 """
 
+from itertools import count
+import json
 import logging
+from typing import Optional
 
 from .settings import settings
 
@@ -36,3 +44,112 @@ def get_logger(name: str = None, log_level: str = settings.log_level):
     logger.debug("Got logger %s", logger)
 
     return logger
+
+
+class LazyParams:  # pylint: disable=too-few-public-methods
+    """
+    Parameters of a call, serialized to JSON only when formatted into an
+    emitted log record. The API key is redacted.
+
+    Args:
+        params (dict): The parameters.
+        pretty (:obj:`bool`, optional): Whether the JSON is indented and
+            holds lists in full. Otherwise it is written on one line and
+            lists longer than settings.log_max_items are summarized.
+    """
+
+    __slots__ = ("params", "pretty")
+
+    def __init__(self, params: Optional[dict], pretty: bool = False):
+        self.params = params
+        self.pretty = pretty
+
+    @staticmethod
+    def _summarize(value):
+        if isinstance(value, list) and len(value) > settings.log_max_items:
+            return f"<{len(value)} items>"
+        return value
+
+    def __str__(self) -> str:
+        params = self.params or {}
+        if "api_key" in params:
+            params = {**params, "api_key": "***"}
+        if self.pretty:
+            return json.dumps(params, indent=2, default=str)
+        return json.dumps(
+            {key: self._summarize(value) for key, value in params.items()},
+            separators=(",", ":"),
+            default=str,
+        )
+
+
+class RequestLogger:  # pylint: disable=too-few-public-methods
+    """
+    Logs the calls sent by a client at INFO level.
+
+    Args:
+        style (:obj:`str`, optional): "compact" for a single line with
+            long lists summarized, "pretty" for indented JSON of the full
+            parameters, or "kv" for key=value records whose fields are also
+            set as "pdl_*" attributes of the LogRecord, for structured
+            handlers.
+        sample_rate (:obj:`int`, optional): Log one call in sample_rate.
+        logger (:obj:`logging.Logger`, optional): The logger to write to.
+    """
+
+    styles = ("compact", "pretty", "kv")
+
+    def __init__(
+        self,
+        style: str = settings.log_style,
+        sample_rate: int = settings.log_sample_rate,
+        logger: Optional[logging.Logger] = None,
+    ):
+        if style not in self.styles:
+            raise ValueError(f"style must be one of {self.styles}.")
+        if sample_rate < 1:
+            raise ValueError("sample_rate must be at least 1.")
+        self.style = style
+        self.sample_rate = sample_rate
+        self.logger = logger or get_logger("requests")
+        self._calls = count()
+
+    def log(
+        self,
+        method: str,
+        url: str,
+        route: Optional[str],
+        params: Optional[dict],
+    ):
+        """
+        Logs a call, if INFO records are enabled and the call is sampled.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL called.
+            route (str): The API route.
+            params (dict): The query parameters or JSON body.
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        if self.sample_rate > 1 and next(self._calls) % self.sample_rate:
+            return
+        if self.style == "kv":
+            self.logger.info(
+                "method=%s route=%s url=%s params=%s",
+                method,
+                route,
+                url,
+                LazyParams(params),
+                extra={
+                    "pdl_method": method,
+                    "pdl_route": route,
+                    "pdl_url": url,
+                },
+            )
+        else:
+            self.logger.info(
+                "Calling %s with params: %s",
+                url,
+                LazyParams(params, pretty=self.style == "pretty"),
+            )
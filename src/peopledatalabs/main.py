@@ -2,178 +2,506 @@
 Client's main module.
 """
 
+import importlib
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Union,
+)
+
 from pydantic.v1 import (
     HttpUrl,
+    confloat,
+    conint,
     constr,
     validator,
 )
 from pydantic.v1.dataclasses import dataclass
 
-from .endpoints import Endpoint
-from .endpoints.person import Person
-from .endpoints.company import Company
-from .endpoints.location import Location
-from .endpoints.school import School
-from .logger import get_logger
+from .cache import BaseCache
+from .hooks import Event, Hooks
+from .keys import KeyPool
+from .logger import RequestLogger, get_logger
+from .metrics import Metrics
 from .models import AutocompleteModel, JobTitleModel, IPModel
+from .ratelimit import RateLimiter
+from .retry import Retry
 from .requests import Request
+from .routes import Route, RouteTable
+from .session import AsyncSession, Session
 from .settings import settings
+from .transport import Transport
 from .utils import check_empty_parameters
+from .validation import merge_params
+
+if TYPE_CHECKING:
+    from .endpoints import Endpoint
+    from .endpoints.company import Company
+    from .endpoints.location import Location
+    from .endpoints.person import Person
+    from .endpoints.school import School
 
 
 logger = get_logger()
 
+__all__ = [
+    "AsyncPDLPY",
+    "Company",
+    "Endpoint",
+    "Location",
+    "PDLPY",
+    "Person",
+    "School",
+]
+
+_SECTIONS = {
+    "Endpoint": "endpoints",
+    "Company": "endpoints.company",
+    "Location": "endpoints.location",
+    "Person": "endpoints.person",
+    "School": "endpoints.school",
+}
+
+
+def __getattr__(name: str):
+    """
+    Imports the endpoint classes on first access, so that importing the client
+    does not load every section and its models.
+    """
+    if name in _SECTIONS:
+        module = importlib.import_module(f".{_SECTIONS[name]}", __package__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ClientConfig:  # pylint: disable=too-few-public-methods
+    """
+    Validation settings of the client: fields are validated before
+    __post_init__ uses them.
+    """
+
+    post_init_call = "after_validation"
+
 
-@dataclass
-class PDLPY:
+@dataclass(config=ClientConfig)
+class PDLPY:  # pylint: disable=too-many-instance-attributes
     """
     Client's main class. All methods derive from the instantiation of this
     class.
 
     Args:
-        api_key (:obj:`str`, optional): The authentication
-            API key for API calls.
+        api_key (:obj:`str` or list of str, optional): The authentication
+            API key for API calls. Given several keys, each call is sent
+            with the key which has the most rate limit headroom left on its
+            API, see peopledatalabs.keys; api_key is then the first key and
+            the pool is available as `keys`.
         base_path (:obj:`str`, optional): PeopleDataLabs' API base URL.
         version (:obj:`str`, optional): PeopleDataLabs' API version.
             Will be used only if base_path has no value.
-        log_level (:obj:`str`, optional): The logger level.
+        log_level (:obj:`str`, optional): The level of the PeopleDataLabs
+            logger. As with any logger, it applies to the whole process.
+        log_style (:obj:`str`, optional): How calls are logged at INFO
+            level: "compact" (one line, long lists summarized), "pretty"
+            (indented JSON of all parameters) or "kv" (key=value records).
+        log_sample_rate (:obj:`int`, optional): Log one call in
+            log_sample_rate.
+        sandbox (:obj:`bool`, optional): Whether to call the sandbox API.
+        pool_size (:obj:`int`, optional): The maximum number of pooled
+            connections kept open to the API.
+        keep_alive (:obj:`bool`, optional): Whether pooled connections are
+            kept open between calls.
+        rate_limit (:obj:`bool`, optional): Whether calls are paced to the
+            rate limits reported by the API.
+        rate_limits (:obj:`dict` of str: int, optional): Calls allowed per
+            minute for each API route (e.g. "person/enrich"), used until
+            the API reports its own limits.
+        max_retries (:obj:`int`, optional): The maximum number of retries
+            of a call failed with 429, 502, 503, 504 or a connection error.
+        retry_backoff (:obj:`float`, optional): The base of the exponential
+            backoff between retries, in seconds.
+        retry_budget (:obj:`float`, optional): The fraction of calls which
+            may be retried, so that retries cannot amplify an outage.
+        cache (:obj:`BaseCache`, optional): Cache serving the successful
+            responses of enrichment, cleaner, autocomplete, job_title and
+            ip calls, e.g. a MemoryCache.
+        trusted (:obj:`bool`, optional): Whether parameters are sent
+            without being validated, only dropping unknown and None values.
+            Meant for inputs generated by pipelines which already comply
+            with the API.
+        coalesce (:obj:`bool`, optional): Whether identical concurrent GET
+            calls, e.g. enrichments of the same email from many threads,
+            share a single request and its response.
+        hooks (:obj:`Hooks`, optional): The callbacks notified of the
+            lifecycle of calls, which can also be registered with on().
+        metrics (:obj:`Metrics`, optional): Collects per-route counters,
+            latency histograms, in-flight gauges, cache hit ratios and
+            rate-limit headroom of the calls, readable with its snapshot()
+            and prometheus() methods.
+        transport (:obj:`Transport` or str, optional): The transport
+            sending the requests: "requests" (the default), "urllib3", which
+            drives a urllib3 connection pool directly for less overhead per
+            call but ignores proxies set in the environment, or a custom
+            Transport. Not supported by AsyncPDLPY.
+        compress (:obj:`bool`, optional): Whether the JSON bodies of POST
+            calls, e.g. bulk requests and search queries, are gzipped when
+            at least settings.compress_min_bytes long.
+
+    The client owns a connection pool which is shared by all its sections.
+    Call close() when done, or use the client as a context manager.
     """
 
-    api_key: str = settings.api_key
+    session_class = Session
+
+    api_key: Union[str, List[str]] = settings.api_key
     base_path: HttpUrl = None
     version: constr(regex=settings.version_re) = settings.version
     log_level: str = None
+    log_style: Literal["compact", "pretty", "kv"] = settings.log_style
+    log_sample_rate: conint(ge=1) = settings.log_sample_rate
     sandbox: bool = False
+    pool_size: conint(ge=1) = settings.pool_size
+    keep_alive: bool = settings.keep_alive
+    rate_limit: bool = settings.rate_limit
+    rate_limits: Dict[str, conint(ge=1)] = None
+    max_retries: conint(ge=0) = settings.max_retries
+    retry_backoff: confloat(ge=0) = settings.retry_backoff
+    retry_budget: confloat(ge=0) = settings.retry_budget
+    cache: BaseCache = None
+    trusted: bool = False
+    coalesce: bool = settings.coalesce
+    hooks: Hooks = None
+    metrics: Metrics = None
+    transport: Union[Literal["requests", "urllib3"], Transport] = None
+    compress: bool = settings.compress
 
     @validator("api_key", pre=True, always=True)
     def api_key_not_none(cls, v):
         """
         Checks an API key is passed to the Client object.
         """
-        if v is None:
+        if v is None or (isinstance(v, (list, tuple)) and not v):
             raise ValueError("Please enter a value for API key.")
         return v
 
     def __post_init__(self):
         """
-        Sets the actual base_path and sets log_level globally across modules.
+        Sets the actual base_path, sets the level of the PeopleDataLabs logger
+        if log_level is given, and opens the connection pool.
+
+        The global settings are only read: clients holding different API
+        keys or options can be used side by side, from any thread.
         """
         if self.base_path is None:
             self.base_path = settings.base_path + self.version
         if self.log_level is not None:
-            settings.log_level = self.log_level
             logger.setLevel(self.log_level)
         if self.sandbox:
             self.base_path = settings.sandbox_base_path + self.version
+        self.keys = None
+        if isinstance(self.api_key, list):
+            self.keys = KeyPool(
+                self.api_key, self.rate_limits, pace=self.rate_limit
+            )
+            self.api_key = self.keys.keys[0]
+        self.rate_limiter = (
+            RateLimiter(self.rate_limits)
+            if self.rate_limit and self.keys is None
+            else None
+        )
+        self.retry = (
+            Retry(
+                max_retries=self.max_retries,
+                backoff=self.retry_backoff,
+                budget=self.retry_budget,
+            )
+            if self.max_retries
+            else None
+        )
+        if self.hooks is None:
+            self.hooks = Hooks()
+        if self.metrics is not None:
+            self.metrics.attach(self.hooks)
+        self._sections = {}
+        self._session = self.session_class(
+            pool_size=self.pool_size,
+            keep_alive=self.keep_alive,
+            rate_limiter=self.rate_limiter,
+            retry=self.retry,
+            cache=self.cache,
+            request_logger=RequestLogger(
+                style=self.log_style, sample_rate=self.log_sample_rate
+            ),
+            coalesce=self.coalesce,
+            hooks=self.hooks,
+            transport=self.transport,
+            keys=self.keys,
+            compress=self.compress,
+        )
+        self._routes = RouteTable(
+            self.api_key, self.base_path, self._session.accept_encoding
+        )
+
+    def __setattr__(self, name: str, value):
+        """
+        Sets an attribute.
+
+        Once the client is built, changing its API key, its base URL or
+        sandbox recompiles its routes and rebuilds its sections, which
+        would otherwise keep calling with the former ones.
+        """
+        changed = getattr(self, name, None) != value
+        super().__setattr__(name, value)
+        if not changed or "_routes" not in self.__dict__:
+            return
+        if name == "sandbox":
+            base_path = (
+                settings.sandbox_base_path if value else settings.base_path
+            )
+            self.base_path = base_path + self.version
+        elif name in ("api_key", "base_path"):
+            self._routes = RouteTable(
+                self.api_key, self.base_path, self._session.accept_encoding
+            )
+            self._sections = {}
+
+    def on(
+        self, event: str, callback: Optional[Callable[[Event], None]] = None
+    ):
+        """
+        Registers a callback for an event of the lifecycle of calls:
+        "request_start", "request_end", "retry", "cache_hit" or
+        "validation". See peopledatalabs.hooks.Event for their fields.
+
+        Args:
+            event (str): The name of the event.
+            callback: The function called with each Event. If None, a
+                decorator registering the decorated function is returned.
+
+        Returns:
+            The callback.
+        """
+        return self.hooks.on(event, callback)
+
+    def close(self):
+        """
+        Closes the connections pooled by the client.
+        """
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     @check_empty_parameters
-    def autocomplete(self, **kwargs):
+    def autocomplete(
+        self, params: Optional[AutocompleteModel] = None, **kwargs
+    ):
         """
         Calls PeopleDataLabs' autocomplete API.
 
         Args:
+            params (:obj:`AutocompleteModel`, optional): Parameters already
+                validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = Endpoint(self.api_key, self.base_path).get_url(
-            endpoint="autocomplete"
+        return self._call(
+            self._routes.get("autocomplete", "GET", AutocompleteModel),
+            merge_params(params, kwargs),
         )
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers={
-                "Accept-Encoding": "gzip",
-                "Content-Type": "application/json",
-                "User-Agent": "PDL-PYTHON-SDK",
-                "SDK-Version": settings.sdk_version,
-            },
-            params=kwargs,
-            validator=AutocompleteModel,
-        ).get()
 
     @check_empty_parameters
-    def job_title(self, **kwargs):
+    def job_title(self, params: Optional[JobTitleModel] = None, **kwargs):
         """
         Calls PeopleDataLabs' job_title API.
 
         Args:
+            params (:obj:`JobTitleModel`, optional): Parameters already
+                validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = Endpoint(self.api_key, self.base_path).get_url(
-            endpoint="job_title/enrich"
+        return self._call(
+            self._routes.get("job_title/enrich", "GET", JobTitleModel),
+            merge_params(params, kwargs),
         )
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers={
-                "Accept-Encoding": "gzip",
-                "Content-Type": "application/json",
-                "User-Agent": "PDL-PYTHON-SDK",
-                "SDK-Version": settings.sdk_version,
-            },
-            params=kwargs,
-            validator=JobTitleModel,
-        ).get()
 
     @check_empty_parameters
-    def ip(self, **kwargs):
+    def ip(self, params: Optional[IPModel] = None, **kwargs):
         """
         Calls PeopleDataLabs' IP Enrichment API.
 
         Args:
+            params (:obj:`IPModel`, optional): Parameters already
+                validated, sent without validating them again.
             **kwargs: Parameters for the API as defined
                 in the documentation.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        url = Endpoint(self.api_key, self.base_path).get_url(
-            endpoint="ip/enrich"
+        return self._call(
+            self._routes.get("ip/enrich", "GET", IPModel),
+            merge_params(params, kwargs),
+        )
+
+    def _call(self, route: Route, params):
+        """
+        Calls a top-level API through its compiled route.
+        """
+        request = Request(
+            self.api_key,
+            route.url,
+            route.headers,
+            params,
+            route.validator,
+            session=self._session,
+            route=route.name,
+            trusted=self.trusted,
         )
-        return Request(
-            api_key=self.api_key,
-            url=url,
-            headers={
-                "Accept-Encoding": "gzip",
-                "Content-Type": "application/json",
-                "User-Agent": "PDL-PYTHON-SDK",
-                "SDK-Version": settings.sdk_version,
-            },
-            params=kwargs,
-            validator=IPModel,
-        ).get()
+        return request.get()
+
+    def _section(self, name: str):
+        """
+        Returns the endpoint of a section, importing its module and its models
+        on first use.
+
+        Args:
+            name (str): The name of the section, e.g. "person".
+        """
+        section = self._sections.get(name)
+        if section is None:
+            module = importlib.import_module(f".endpoints.{name}", __package__)
+            section = getattr(module, name.capitalize())(
+                self.api_key,
+                self.base_path,
+                session=self._session,
+                trusted=self.trusted,
+                routes=self._routes,
+            )
+            section = self._sections.setdefault(name, section)
+        return section
 
     @property
-    def company(self):
+    def company(self) -> "Company":
         """
         Calls API from the company section.
         """
-        return Company(self.api_key, self.base_path)
+        return self._section("company")
 
     @property
-    def location(self):
+    def location(self) -> "Location":
         """
         Calls API from the location section.
         """
-        return Location(self.api_key, self.base_path)
+        return self._section("location")
 
     @property
-    def school(self):
+    def school(self) -> "School":
         """
         Calls API from the school section.
         """
-        return School(self.api_key, self.base_path)
+        return self._section("school")
 
     @property
-    def person(self):
+    def person(self) -> "Person":
         """
         Calls API from the person section.
         """
-        return Person(self.api_key, self.base_path)
+        return self._section("person")
+
+
+@dataclass(config=ClientConfig)
+class AsyncPDLPY(PDLPY):
+    """
+    Asyncio version of the client.
+
+    Exposes the same sections and APIs as PDLPY, validated with the same
+    models, but every API call returns an awaitable resolving to a
+    httpx.Response. All calls share a single asyncio connection pool, which
+    is closed with `await client.close()` or by using the client as an
+    async context manager.
+
+    Requires httpx: pip install peopledatalabs[async].
+
+    Args:
+        api_key (:obj:`str` or list of str, optional): The authentication
+            API key for API calls. Given several keys, each call is sent
+            with the key which has the most rate limit headroom left on its
+            API, see peopledatalabs.keys; api_key is then the first key and
+            the pool is available as `keys`.
+        base_path (:obj:`str`, optional): PeopleDataLabs' API base URL.
+        version (:obj:`str`, optional): PeopleDataLabs' API version.
+            Will be used only if base_path has no value.
+        log_level (:obj:`str`, optional): The level of the PeopleDataLabs
+            logger. As with any logger, it applies to the whole process.
+        log_style (:obj:`str`, optional): How calls are logged at INFO
+            level: "compact" (one line, long lists summarized), "pretty"
+            (indented JSON of all parameters) or "kv" (key=value records).
+        log_sample_rate (:obj:`int`, optional): Log one call in
+            log_sample_rate.
+        sandbox (:obj:`bool`, optional): Whether to call the sandbox API.
+        pool_size (:obj:`int`, optional): The maximum number of pooled
+            connections kept open to the API.
+        keep_alive (:obj:`bool`, optional): Whether pooled connections are
+            kept open between calls.
+        rate_limit (:obj:`bool`, optional): Whether calls are paced to the
+            rate limits reported by the API.
+        rate_limits (:obj:`dict` of str: int, optional): Calls allowed per
+            minute for each API route (e.g. "person/enrich"), used until
+            the API reports its own limits.
+        max_retries (:obj:`int`, optional): The maximum number of retries
+            of a call failed with 429, 502, 503, 504 or a connection error.
+        retry_backoff (:obj:`float`, optional): The base of the exponential
+            backoff between retries, in seconds.
+        retry_budget (:obj:`float`, optional): The fraction of calls which
+            may be retried, so that retries cannot amplify an outage.
+        cache (:obj:`BaseCache`, optional): Cache serving the successful
+            responses of enrichment, cleaner, autocomplete, job_title and
+            ip calls, e.g. a MemoryCache.
+        trusted (:obj:`bool`, optional): Whether parameters are sent
+            without being validated, only dropping unknown and None values.
+            Meant for inputs generated by pipelines which already comply
+            with the API.
+        coalesce (:obj:`bool`, optional): Whether identical concurrent GET
+            calls, e.g. enrichments of the same email from many threads,
+            share a single request and its response.
+        hooks (:obj:`Hooks`, optional): The callbacks notified of the
+            lifecycle of calls, which can also be registered with on().
+        metrics (:obj:`Metrics`, optional): Collects per-route counters,
+            latency histograms, in-flight gauges, cache hit ratios and
+            rate-limit headroom of the calls, readable with its snapshot()
+            and prometheus() methods.
+        compress (:obj:`bool`, optional): Whether the JSON bodies of POST
+            calls, e.g. bulk requests and search queries, are gzipped when
+            at least settings.compress_min_bytes long.
+    """
+
+    session_class = AsyncSession
+
+    async def close(self):  # pylint: disable=invalid-overridden-method
+        """
+        Closes the connections pooled by the client.
+        """
+        await self._session.close()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' with AsyncPDLPY.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,423 @@
+"""
+In-process metrics of the calls of a client.
+
+Metrics are fed by the hooks of the client and kept per API route:
+
+- calls by HTTP status, and retries;
+- latency histograms, with log-linear buckets in the style of HDR
+  histograms: each power of two is split in 16 linear sub-buckets, so
+  that any latency is recorded within 6.25% of its value, from 1
+  microsecond to an hour, in a fixed array of counts;
+- calls in flight;
+- cache hits and hit ratio;
+- the last rate limit and credits reported by the API.
+
+Updates take no lock: each thread records into its own shard, and shards
+are only merged when a snapshot or an export is requested. The shards of
+threads which are gone are folded into a single retired shard, so that
+short-lived threads do not accumulate.
+"""
+
+from collections import defaultdict
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+import weakref
+
+from .hooks import Event, Hooks
+from .logger import get_logger
+
+
+logger = get_logger("metrics")
+
+SUB_BUCKET_BITS = 4
+
+# Enough buckets for latencies up to 2**32 microseconds, over an hour.
+BUCKETS = (32 - SUB_BUCKET_BITS) << SUB_BUCKET_BITS
+
+PROMETHEUS_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def bucket_index(microseconds: int) -> int:
+    """
+    Returns the index of the histogram bucket of a latency.
+    """
+    exponent = max(microseconds.bit_length() - SUB_BUCKET_BITS - 1, 0)
+    index = (exponent << SUB_BUCKET_BITS) + (microseconds >> exponent)
+    return min(index, BUCKETS - 1)
+
+
+def bucket_upper_bound(index: int) -> float:
+    """
+    Returns the upper bound of a histogram bucket, in seconds.
+    """
+    exponent = max((index >> SUB_BUCKET_BITS) - 1, 0)
+    mantissa = index - (exponent << SUB_BUCKET_BITS)
+    return ((mantissa + 1) << exponent) / 1e6
+
+
+class Histogram:
+    """
+    Merged view of the latency histograms of a route.
+
+    Args:
+        counts (list of int): The number of latencies in each bucket.
+        total (float): The sum of the latencies, in seconds.
+    """
+
+    def __init__(self, counts: List[int], total: float):
+        self.counts = counts
+        self.total = total
+        self.count = sum(counts)
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """
+        Returns an upper bound of a quantile of the latencies, in seconds, or
+        None if nothing was recorded.
+        """
+        if not self.count:
+            return None
+        rank = max(fraction * self.count, 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return bucket_upper_bound(index)
+        return bucket_upper_bound(BUCKETS - 1)
+
+    def cumulative(self, bounds: Iterable[float]) -> List[int]:
+        """
+        Returns the number of latencies under each bound, as Prometheus
+        histogram buckets.
+
+        Bounds are matched at bucket precision.
+        """
+        cumulative = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            while (
+                index < BUCKETS and bucket_upper_bound(index) <= bound + 1e-9
+            ):
+                seen += self.counts[index]
+                index += 1
+            cumulative.append(seen)
+        return cumulative
+
+
+class _Shard:  # pylint: disable=too-few-public-methods
+    """
+    The metrics recorded by one thread.
+    """
+
+    __slots__ = ("calls", "retries", "in_flight", "cache_hits", "latency")
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.retries = defaultdict(int)
+        self.in_flight = defaultdict(int)
+        self.cache_hits = defaultdict(int)
+        self.latency = {}
+
+
+def _fold(shards: Iterable[_Shard]) -> _Shard:
+    """
+    Returns a new shard holding the sum of shards.
+    """
+    folded = _Shard()
+    for shard in shards:
+        for name in ("calls", "retries", "in_flight", "cache_hits"):
+            counts = getattr(folded, name)
+            for key, value in dict(getattr(shard, name)).items():
+                counts[key] += value
+        for route, (counts, total) in dict(shard.latency).items():
+            latency = folded.latency.setdefault(route, [[0] * BUCKETS, 0.0])
+            latency[0] = [a + b for a, b in zip(latency[0], counts)]
+            latency[1] += total
+    return folded
+
+
+def _call_weakly(method: weakref.WeakMethod, *args):
+    """
+    Calls a weakly referenced method, unless its object is gone.
+    """
+    method = method()
+    if method is not None:
+        method(*args)
+
+
+def _merge(dicts: Iterable[dict]) -> Dict:
+    merged = defaultdict(int)
+    for values in dicts:
+        for key, value in dict(values).items():
+            merged[key] += value
+    return dict(merged)
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _latency_samples(histograms: Dict[str, Histogram]) -> Iterator:
+    for route, histogram in histograms.items():
+        cumulative = histogram.cumulative(PROMETHEUS_BUCKETS)
+        for bound, count in zip(PROMETHEUS_BUCKETS, cumulative):
+            yield "_bucket", (("route", route), ("le", bound)), count
+        yield "_bucket", (("route", route), ("le", "+Inf")), histogram.count
+        yield "_sum", (("route", route),), histogram.total
+        yield "_count", (("route", route),), histogram.count
+
+
+def _series(snapshot: dict, histograms: Dict[str, Histogram]) -> Iterator:
+    """
+    Yields the (name, type, description, samples) of each Prometheus metric,
+    samples being (name suffix, labels, value) tuples.
+    """
+    yield "requests_total", "counter", "Calls by API route and status.", (
+        ("", (("route", route), ("status", status or "error")), count)
+        for route, counts in snapshot["calls"].items()
+        for status, count in counts.items()
+    )
+    yield "retries_total", "counter", "Retried attempts by API route.", (
+        ("", (("route", route),), count)
+        for route, count in snapshot["retries"].items()
+    )
+    yield "requests_in_flight", "gauge", "Calls in flight by API route.", (
+        ("", (("route", route),), count)
+        for route, count in snapshot["in_flight"].items()
+    )
+    yield "request_duration_seconds", "histogram", "Latency of calls.", (
+        _latency_samples(histograms)
+    )
+    yield "cache_hits_total", "counter", "Calls served from the cache.", (
+        ("", (("route", route),), cache["hits"])
+        for route, cache in snapshot["cache"].items()
+    )
+    for field, description in (
+        ("remaining", "Calls left in the current rate-limit window."),
+        ("headroom", "Fraction of the rate limit left in the window."),
+    ):
+        yield f"rate_limit_{field}", "gauge", description, (
+            ("", (("route", route),), limit[field])
+            for route, limit in snapshot["rate_limits"].items()
+            if limit[field] is not None
+        )
+    yield "credits", "gauge", "Credit headers of the last response.", (
+        ("", (("name", name),), value)
+        for name, value in snapshot["credits"].items()
+        if isinstance(value, int)
+    )
+
+
+class Metrics:
+    """
+    Metrics of the calls of one or more clients.
+
+    Attach it to a client with PDLPY(metrics=Metrics()), then read it
+    with snapshot() or prometheus().
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+        self.rate_limits = {}
+        self.credits = {}
+
+    @classmethod
+    def __get_validators__(cls):
+        """
+        Allows metrics to be used as fields of pydantic dataclasses.
+        """
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value):
+        """
+        Checks the value is an instance of this class.
+        """
+        if not isinstance(value, cls):
+            raise TypeError(f"Expected {cls.__name__}, got {type(value)}.")
+        return value
+
+    def attach(self, hooks: Hooks):
+        """
+        Registers the callbacks recording the metrics on hooks.
+        """
+        hooks.on("request_start", self._on_start)
+        hooks.on("request_end", self._on_end)
+        hooks.on("retry", self._on_retry)
+        hooks.on("cache_hit", self._on_cache_hit)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            weakref.finalize(
+                threading.current_thread(),
+                _call_weakly,
+                weakref.WeakMethod(self._retire),
+                shard,
+            )
+        return shard
+
+    def _retire(self, shard: _Shard):
+        """
+        Folds the shard of a thread which is gone into the retired shard.
+        """
+        with self._lock:
+            self._retired = _fold((self._retired, shard))
+            self._shards.remove(shard)
+
+    def _all_shards(self) -> List[_Shard]:
+        """
+        Returns the shards of the live threads and the retired shard.
+        """
+        with self._lock:
+            return self._shards + [self._retired]
+
+    def _on_start(self, event: Event):
+        self._shard().in_flight[event.route] += 1
+
+    def _on_end(self, event: Event):
+        shard = self._shard()
+        route = event.route
+        shard.in_flight[route] -= 1
+        shard.calls[route, event.status] += 1
+        latency = shard.latency.get(route)
+        if latency is None:
+            latency = shard.latency[route] = [[0] * BUCKETS, 0.0]
+        latency[0][bucket_index(int(event.duration * 1e6))] += 1
+        latency[1] += event.duration
+        if event.rate_limit is not None:
+            self.rate_limits[route] = event.rate_limit
+        if event.credits:
+            self.credits = event.credits
+
+    def _on_retry(self, event: Event):
+        self._shard().retries[event.route] += 1
+
+    def _on_cache_hit(self, event: Event):
+        self._shard().cache_hits[event.route] += 1
+
+    def histograms(self) -> Dict[str, Histogram]:
+        """
+        Returns the merged latency histogram of each route.
+        """
+        merged = {}
+        for shard in self._all_shards():
+            for route, (counts, total) in dict(shard.latency).items():
+                counts = list(counts)
+                if route not in merged:
+                    merged[route] = [counts, total]
+                    continue
+                merged[route][0] = [
+                    a + b for a, b in zip(merged[route][0], counts)
+                ]
+                merged[route][1] += total
+        return {
+            route: Histogram(counts, total)
+            for route, (counts, total) in merged.items()
+        }
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current value of every metric, per route.
+
+        Returns:
+            A dict with:
+            - "calls": {route: {status: count}}, status None for calls
+              which failed without a response;
+            - "retries", "in_flight": {route: count};
+            - "latency": {route: {"count", "sum", "p50", "p90", "p99"}},
+              in seconds;
+            - "cache": {route: {"hits", "ratio"}};
+            - "rate_limits": {route: {"limit", "remaining", "window",
+              "headroom"}}, headroom being the fraction of the limit left;
+            - "credits": the last credit headers, see hooks.parse_credits.
+        """
+        shards = self._all_shards()
+        calls = {}
+        for (route, status), count in _merge(
+            shard.calls for shard in shards
+        ).items():
+            calls.setdefault(route, {})[status] = count
+        totals = {
+            route: sum(counts.values()) for route, counts in calls.items()
+        }
+        latency = {}
+        for route, histogram in self.histograms().items():
+            latency[route] = {
+                "count": histogram.count,
+                "sum": histogram.total,
+                **{
+                    f"p{round(q * 100)}": histogram.quantile(q)
+                    for q in QUANTILES
+                },
+            }
+        cache = {
+            route: {"hits": hits, "ratio": hits / totals[route]}
+            for route, hits in _merge(
+                shard.cache_hits for shard in shards
+            ).items()
+            if totals.get(route)
+        }
+        rate_limits = {
+            route: {
+                "limit": limit,
+                "remaining": remaining,
+                "window": window,
+                "headroom": None if remaining is None else remaining / limit,
+            }
+            for route, (limit, remaining, window) in dict(
+                self.rate_limits
+            ).items()
+        }
+        return {
+            "calls": calls,
+            "retries": _merge(shard.retries for shard in shards),
+            "in_flight": _merge(shard.in_flight for shard in shards),
+            "latency": latency,
+            "cache": cache,
+            "rate_limits": rate_limits,
+            "credits": dict(self.credits),
+        }
+
+    def prometheus(self, prefix: str = "pdl") -> str:
+        """
+        Exports the metrics in the Prometheus text format.
+
+        Args:
+            prefix (:obj:`str`, optional): The prefix of the metric names.
+
+        Returns:
+            The text of the metrics, e.g. to serve on a /metrics endpoint.
+        """
+        lines = []
+        for name, kind, description, samples in _series(
+            self.snapshot(), self.histograms()
+        ):
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                labels = ",".join(
+                    f'{label}="{_label(text)}"' for label, text in labels
+                )
+                lines.append(f"{prefix}_{name}{suffix}{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
@@ -3,10 +3,15 @@ Client's models for validation.
 """
 
 from enum import Enum
-from typing import Optional, Literal
+import json
+from json.decoder import scanstring
+import re
+import sys
+from typing import Iterator, Optional, Literal, Tuple, Union
 
 from pydantic.v1 import (
     BaseModel,
+    Field,
     conint,
     root_validator,
 )
@@ -16,6 +21,41 @@ from ..logger import get_logger
 
 logger = get_logger("models")
 
+_DECODER = json.JSONDecoder()
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+def iter_members(raw: bytes) -> Iterator[Tuple[str, object, int, int]]:
+    """
+    Yields the name, the value and the start and end offsets in raw of the
+    value of each member of a JSON object, decoded in a single pass.
+
+    Args:
+        raw (bytes): The JSON of the object.
+    """
+    text = raw.decode()
+    ascii_only = len(text) == len(raw)
+    chars = size = 0
+    pos = _WHITESPACE.match(text, _WHITESPACE.match(text).end() + 1).end()
+    while pos < len(text) and text[pos] == '"':
+        name, pos = scanstring(text, pos + 1)
+        start = _WHITESPACE.match(
+            text, _WHITESPACE.match(text, pos).end() + 1
+        ).end()
+        value, end = _DECODER.raw_decode(text, start)
+        if ascii_only:
+            yield sys.intern(name), value, start, end
+        else:
+            size += len(text[chars:start].encode())
+            chars = start
+            yield sys.intern(name), value, size, size + len(
+                text[start:end].encode()
+            )
+        pos = _WHITESPACE.match(
+            text, _WHITESPACE.match(text, end).end() + 1
+        ).end()
+
 
 class BaseRequestModel(BaseModel):
     """
@@ -41,11 +81,20 @@ class AdditionalParametersModel(BaseModel):
 class BaseSearchModel(BaseRequestModel):
     """
     Common fields validation model for search APIs (company, person).
+
+    The offset is given as from_ and sent as the API's from parameter.
     """
 
+    class Config:  # pylint: disable=too-few-public-methods
+        """
+        Accepts fields by name as well as by alias.
+        """
+
+        allow_population_by_field_name = True
+
     query: Optional[dict]
     sql: Optional[str]
-    from_: Optional[conint(ge=0, le=9999)]
+    from_: Optional[conint(ge=0, le=9999)] = Field(alias="from")
     scroll_token: Optional[str]
     titlecase: Optional[bool]
 
@@ -127,3 +176,128 @@ class IPModel(BaseModel):
     min_confidence: Optional[
         Literal["very high", "high", "moderate", "low", "very low"]
     ]
+
+
+class BaseRecord:
+    """
+    Base class for compact, read-only result records.
+
+    A record keeps the raw JSON of a result and its hot scalar fields,
+    listed in the __slots__ of each subclass. Any other field, e.g. the
+    nested sections of a profile, is decoded from its span of the raw JSON
+    when first accessed, as an attribute or an item, and memoized alone.
+    The spans of all fields are located in a single pass over the raw JSON
+    on first access.
+
+    Args:
+        raw (bytes): The JSON of the result.
+        **fields: The values of the hot fields.
+    """
+
+    __slots__ = ("raw", "_fields", "_spans")
+
+    def __init__(self, raw: bytes, **fields):
+        self.raw = raw
+        self._fields = None
+        self._spans = None
+        for name in type(self).__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def _hot(cls, data: dict, fields: dict) -> dict:
+        """
+        Returns the values of the hot fields, taken from data unless given.
+        """
+        hot = {name: data.get(name) for name in cls.__slots__}
+        hot.update(
+            (name, value)
+            for name, value in fields.items()
+            if value is not None
+        )
+        return hot
+
+    @classmethod
+    def from_dict(cls, data: dict, **fields):
+        """
+        Builds a record from a decoded result.
+
+        Args:
+            data (dict): The result.
+            **fields: Values of hot fields missing from data, e.g. the
+                likelihood of a match.
+        """
+        raw = json.dumps(data, separators=(",", ":")).encode()
+        return cls(raw, **cls._hot(data, fields))
+
+    @classmethod
+    def from_json(cls, raw: Union[bytes, str], **fields):
+        """
+        Builds a record from the JSON of a result, which is kept as is.
+
+        Args:
+            raw (bytes): The JSON of the result.
+            **fields: Values of hot fields missing from the JSON.
+        """
+        if isinstance(raw, str):
+            raw = raw.encode()
+        return cls(raw, **cls._hot(json.loads(raw), fields))
+
+    def _field(self, name: str):
+        """
+        Returns a field decoded from the raw JSON, memoizing it.
+
+        Raises:
+            KeyError: If the result has no such field.
+        """
+        if self._fields is None:
+            self._fields = {}
+        elif name in self._fields:
+            return self._fields[name]
+        if self._spans is None:
+            self._spans = {
+                member: (start, end)
+                for member, _, start, end in iter_members(self.raw)
+            }
+        start, end = self._spans[name]
+        value = self._fields[name] = json.loads(self.raw[start:end])
+        return value
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._field(name)
+        except KeyError as ex:
+            raise AttributeError(
+                f"{type(self).__name__} has no field {name!r}."
+            ) from ex
+
+    def __getitem__(self, name: str):
+        if name in type(self).__slots__:
+            return getattr(self, name)
+        return self._field(name)
+
+    def get(self, name: str, default=None):
+        """
+        Returns a field, or default if the result has no such field.
+        """
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> dict:
+        """
+        Decodes the whole result, including the hot fields.
+        """
+        data = json.loads(self.raw)
+        for name in type(self).__slots__:
+            if data.get(name) is None and getattr(self, name) is not None:
+                data[name] = getattr(self, name)
+        return data
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in type(self).__slots__
+        )
+        return f"{type(self).__name__}({fields})"
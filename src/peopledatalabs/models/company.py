@@ -12,6 +12,7 @@ from pydantic.v1 import (
 
 from . import (
     AdditionalParametersModel,
+    BaseRecord,
     BaseRequestModel,
     BaseSearchModel,
 )
@@ -128,3 +129,42 @@ class CleanerModel(BaseRequestModel):
             )
 
         return value
+
+
+class CompanyRecord(BaseRecord):
+    """
+    Compact record of a company, e.g. an enrichment match or a search result.
+
+    The hot fields below are plain attributes; all others, like
+    locations or profiles, are decoded on first access.
+
+    Attributes:
+        id (str): The PDL ID of the company.
+        name (str): The name of the company.
+        website (str): The website of the company.
+        likelihood (int): The likelihood of an enrichment match.
+    """
+
+    __slots__ = ("id", "name", "website", "likelihood")
+
+    @classmethod
+    def from_result(cls, result: dict):
+        """
+        Builds a record from an enrichment result, e.g. an item of a bulk
+        response, which holds the company at its top level.
+
+        Args:
+            result (dict): The result.
+        """
+        return cls.from_dict(result)
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Builds a record from the response of a company/enrich call, keeping its
+        body as is.
+
+        Args:
+            response: The response of a successful call.
+        """
+        return cls.from_json(response.content)
@@ -7,7 +7,6 @@ from typing import List, Optional, Union
 
 from pydantic.v1 import (
     BaseModel,
-    EmailStr,
     root_validator,
     conint,
     validator,
@@ -15,9 +14,12 @@ from pydantic.v1 import (
 
 from . import (
     AdditionalParametersModel,
+    BaseRecord,
     BaseRequestModel,
     BaseSearchModel,
+    iter_members,
 )
+from ..validation import EmailStr
 
 
 class PersonBaseModel(BaseModel):
@@ -201,3 +203,53 @@ class ChangelogModel(BaseModel):
             raise ValueError("Either 'ids' or 'type' must be provided.")
 
         return values
+
+
+class PersonRecord(BaseRecord):
+    """
+    Compact record of a person, e.g. an enrichment match or a search result.
+
+    The hot fields below are plain attributes; all others, like
+    experience, education or profiles, are decoded on first access.
+
+    Attributes:
+        id (str): The PDL ID of the person.
+        full_name (str): The full name of the person.
+        likelihood (int): The likelihood of an enrichment match.
+        job_company_id (str): The PDL ID of the person's current company.
+    """
+
+    __slots__ = ("id", "full_name", "likelihood", "job_company_id")
+
+    @classmethod
+    def from_result(cls, result: dict):
+        """
+        Builds a record from an enrichment result, e.g. an item of a bulk
+        response, holding the person in 'data' and the likelihood aside.
+
+        Args:
+            result (dict): The result.
+        """
+        return cls.from_dict(
+            result["data"], likelihood=result.get("likelihood")
+        )
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Builds a record from the response of a person/enrich call, keeping the
+        JSON of its 'data' as is.
+
+        Args:
+            response: The response of a successful call.
+        """
+        body = response.content
+        members = {
+            name: (value, start, end)
+            for name, value, start, end in iter_members(body)
+        }
+        data, start, end = members["data"]
+        likelihood = members.get("likelihood", (None,))[0]
+        return cls(
+            body[start:end], **cls._hot(data, {"likelihood": likelihood})
+        )
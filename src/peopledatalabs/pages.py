@@ -0,0 +1,167 @@
+"""
+Parallel iterators over the pages of offset-paginated searches.
+
+The first page is fetched alone to read the total number of matches,
+then the pages after it are fetched concurrently by their offset, so
+that a search spanning N pages takes about N / max_workers round trips
+instead of N. At most 2 * max_workers pages are requested or held ahead
+of the records yielded, so that memory stays bounded however slow a page
+is. Offsets cannot go past settings.search_max_records, so larger
+searches must be followed by scroll token instead.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, List, Tuple
+
+from .errors import APIError
+from .logger import get_logger
+from .settings import settings
+
+
+logger = get_logger("pages")
+
+
+def read_page(response, records_key: str = "data") -> Tuple[List, int]:
+    """
+    Extracts the records and the total number of matches from a page.
+
+    Raises:
+        APIError: If the call failed.
+    """
+    if response.status_code == 404:
+        return [], 0
+    if response.status_code != 200:
+        raise APIError(response)
+    body = response.json()
+    return body.get(records_key) or [], body.get("total") or 0
+
+
+def page_offsets(start: int, size: int, total: int) -> List[Tuple[int, int]]:
+    """
+    Returns the (offset, size) of the pages after the first one.
+
+    Args:
+        start (int): The offset of the first page.
+        size (int): The number of records per page.
+        total (int): The total number of matches.
+    """
+    end = min(total, settings.search_max_records)
+    if total > end:
+        logger.warning(
+            "Search matches %s records, only the first %s can be reached"
+            " by offset: use iter_search to scroll through all of them",
+            total,
+            end,
+        )
+    return [
+        (offset, min(size, end - offset))
+        for offset in range(start + size, end, size)
+    ]
+
+
+def _next_done(pending: Deque, ordered: bool):
+    """
+    Removes the next future from pending: the first one submitted if ordered,
+    else the first one done, waiting for it.
+    """
+    if ordered:
+        return pending.popleft()
+    future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+    pending.remove(future)
+    return future
+
+
+async def _anext_done(pending: Deque, ordered: bool):
+    """
+    Asyncio version of _next_done, for tasks.
+    """
+    if ordered:
+        await asyncio.wait((pending[0],))
+        return pending.popleft()
+    done, _ = await asyncio.wait(pending, return_when=FIRST_COMPLETED)
+    task = next(iter(done))
+    pending.remove(task)
+    return task
+
+
+def iter_pages(
+    fetch: Callable,
+    start: int,
+    size: int,
+    max_workers: int,
+    ordered: bool = True,
+):
+    """
+    Iterates over the records of an offset-paginated search, fetching its pages
+    from a pool of threads.
+
+    Args:
+        fetch: Function calling the API for the page at an offset, called
+            with the offset and size of the page.
+        start (int): The offset of the first page.
+        size (int): The number of records per page.
+        max_workers (int): The maximum number of concurrent calls.
+        ordered (:obj:`bool`, optional): Whether records are yielded in
+            search order, or as soon as their page arrives.
+
+    Returns:
+        An iterator over the records. It raises APIError if a call fails.
+    """
+    records, total = read_page(fetch(start, size))
+    yield from records
+    pages = page_offsets(start, size, total) if records else []
+    if not pages:
+        return
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for page in pages:
+                pending.append(executor.submit(fetch, *page))
+                if len(pending) >= 2 * max_workers:
+                    future = _next_done(pending, ordered)
+                    yield from read_page(future.result())[0]
+            while pending:
+                future = _next_done(pending, ordered)
+                yield from read_page(future.result())[0]
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+async def aiter_pages(
+    fetch: Callable,
+    start: int,
+    size: int,
+    max_workers: int,
+    ordered: bool = True,
+):
+    """
+    Asyncio version of iter_pages, fetching the pages from concurrent tasks.
+    """
+    records, total = read_page(await fetch(start, size))
+    for record in records:
+        yield record
+    pages = page_offsets(start, size, total) if records else []
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch_page(offset, page_size):
+        async with semaphore:
+            return await fetch(offset, page_size)
+
+    pending = deque()
+    try:
+        for page in pages:
+            pending.append(asyncio.ensure_future(fetch_page(*page)))
+            if len(pending) >= 2 * max_workers:
+                task = await _anext_done(pending, ordered)
+                for record in read_page(task.result())[0]:
+                    yield record
+        while pending:
+            task = await _anext_done(pending, ordered)
+            for record in read_page(task.result())[0]:
+                yield record
+    finally:
+        for task in pending:
+            task.cancel()
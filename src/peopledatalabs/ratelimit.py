@@ -0,0 +1,272 @@
+"""
+Client-side rate limiting.
+
+Calls are paced by one token bucket per API route. Buckets can be seeded
+from configuration and are continuously adjusted from the rate-limit
+headers returned by the API, so that the client runs at the allowed
+throughput without being answered 429.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .logger import get_logger
+from .settings import settings
+
+
+logger = get_logger("ratelimit")
+
+WINDOWS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+_WINDOW_VALUE_RE = re.compile(r"(\w+)['\"]?\s*:\s*(\d+)")
+
+
+def parse_limit_header(value: Optional[str]) -> Dict[str, int]:
+    """
+    Parses a rate-limit header into a mapping of window to count.
+
+    The API sends values like "{'minute': 100}"; a bare number is read as
+    a per-minute value.
+
+    Args:
+        value (str): The header value.
+
+    Returns:
+        A dict mapping window names ("second", "minute", ...) to counts.
+        Empty if the value cannot be parsed.
+    """
+    if not value:
+        return {}
+    value = value.strip()
+    if value.isdigit():
+        return {"minute": int(value)}
+    return {
+        window: int(count)
+        for window, count in _WINDOW_VALUE_RE.findall(value)
+        if window in WINDOWS
+    }
+
+
+def parse_rate_limit(headers) -> Optional[Tuple[float, float, float]]:
+    """
+    Reads the rate limit of the shortest window from response headers.
+
+    Args:
+        headers: The response headers.
+
+    Returns:
+        A (limit, remaining, window in seconds) tuple, with remaining None
+        if not sent, or None if the response carries no limit.
+    """
+    limits = parse_limit_header(headers.get("x-ratelimit-limit"))
+    if not limits:
+        return None
+    window = min(limits, key=WINDOWS.get)
+    remaining = parse_limit_header(headers.get("x-ratelimit-remaining"))
+    return limits[window], remaining.get(window), WINDOWS[window]
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    Reads the Retry-After header, in seconds.
+
+    Args:
+        headers: The response headers.
+
+    Returns:
+        The number of seconds to wait, or None if absent or not numeric.
+    """
+    try:
+        return max(float(headers.get("retry-after")), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Callers reserve a token and wait for the returned delay; tokens can go
+    negative, which queues callers fairly without holding the lock while
+    waiting. A bucket without a rate lets every call through until a
+    limit is known.
+
+    Args:
+        rate (:obj:`float`, optional): Tokens added per second.
+        capacity (:obj:`float`, optional): The maximum number of tokens.
+    """
+
+    def __init__(
+        self, rate: Optional[float] = None, capacity: Optional[float] = None
+    ):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if self.rate is not None:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._updated) * self.rate
+            )
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Takes a token.
+
+        Returns:
+            The number of seconds to wait before sending the call.
+        """
+        with self._lock:
+            now = time.monotonic()
+            pause = max(self.paused_until - now, 0.0)
+            if self.rate is None:
+                return pause
+            self._refill(now)
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return pause
+            return max(-self.tokens / self.rate, pause)
+
+    def headroom(self) -> Optional[float]:
+        """
+        Returns the fraction of the capacity available now.
+
+        Returns:
+            1.0 if no limit is known yet, None while paused. Negative when
+            callers are queued.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.paused_until > now:
+                return None
+            if self.rate is None:
+                return 1.0
+            self._refill(now)
+            return self.tokens / self.capacity
+
+    def update(self, limit: float, remaining: Optional[float], window: float):
+        """
+        Adjusts the bucket to the limit reported by the API.
+
+        Args:
+            limit (float): The number of calls allowed per window.
+            remaining (float): The number of calls left in the current
+                window, if known.
+            window (float): The length of the window in seconds.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.rate is None:
+                self.tokens = limit
+            self.rate = limit / window
+            self.capacity = limit
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+
+    def pause(self, seconds: float):
+        """
+        Holds back all calls for the given number of seconds.
+
+        Args:
+            seconds (float): How long to pause.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.paused_until = max(self.paused_until, now + seconds)
+            if self.rate is not None:
+                self.tokens = min(self.tokens, 0.0)
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by API route (e.g. "person/enrich", "autocomplete").
+
+    A single RateLimiter is owned by each client and shared by all the
+    threads and asyncio tasks using it.
+
+    Args:
+        limits (:obj:`dict` of str: int, optional): Calls allowed per
+            minute for each route, used until the API reports its own
+            limits. Routes without a value are not limited until then.
+    """
+
+    default_pause = 1.0
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = dict(limits or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, route: Optional[str]) -> TokenBucket:
+        """
+        Returns the bucket of a route, creating it on first use.
+
+        Args:
+            route (str): The API route.
+        """
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(route)
+                if bucket is None:
+                    limit = self.limits.get(route)
+                    bucket = TokenBucket(
+                        rate=limit / 60 if limit else None, capacity=limit
+                    )
+                    self._buckets[route] = bucket
+        return bucket
+
+    def headroom(self) -> Dict[Optional[str], Optional[float]]:
+        """
+        Returns the headroom of each route called so far, see
+        TokenBucket.headroom.
+        """
+        return {
+            route: bucket.headroom()
+            for route, bucket in list(self._buckets.items())
+        }
+
+    def reserve(self, route: Optional[str]) -> float:
+        """
+        Takes a token for a call to a route.
+
+        Args:
+            route (str): The API route.
+
+        Returns:
+            The number of seconds to wait before sending the call.
+        """
+        delay = self.bucket(route).reserve()
+        if delay:
+            logger.debug("Rate limiting %s for %.3fs", route, delay)
+        return delay
+
+    def update(self, route: Optional[str], response):
+        """
+        Adjusts the bucket of a route from the headers of a response.
+
+        A 429 response pauses the bucket for Retry-After seconds, at most
+        settings.retry_after_max.
+
+        Args:
+            route (str): The API route.
+            response: The response of a call to the route.
+        """
+        bucket = self.bucket(route)
+        rate_limit = parse_rate_limit(response.headers)
+        if rate_limit is not None:
+            bucket.update(*rate_limit)
+        if response.status_code == 429:
+            pause = parse_retry_after(response.headers)
+            if pause is None:
+                pause = self.default_pause
+            pause = min(pause, settings.retry_after_max)
+            logger.warning("Rate limited on %s, pausing %ss", route, pause)
+            bucket.pause(pause)
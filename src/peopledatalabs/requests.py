@@ -4,61 +4,94 @@ Requests module.
 All requests are handled here.
 """
 
-import json
-from typing import Dict, Type
+import time
+from typing import Any, Dict, Optional, Type
 
-from pydantic.v1 import (
-    BaseModel,
-    HttpUrl,
-)
-from pydantic.v1.dataclasses import dataclass
-import requests
+from pydantic.v1 import BaseModel
 
+from .hooks import Event
 from .logger import get_logger
+from .session import BaseSession, Session
+from .validation import validate_params
 
 
 logger = get_logger("requests")
 
 
-@dataclass
-class Request:
+class Request:  # pylint: disable=too-many-instance-attributes
     """
     Base class for all HTTP requests.
 
+    A plain class rather than a pydantic dataclass: its arguments come
+    from the compiled routes of the client, and only the parameters of the
+    call need validating.
+
     Args:
         api_key (str): The authentication API key for API calls.
         url (str): URL of the API to call.
-        headers (dict of str: str): The request headers.
-        params (dict): The parameters to use in the API call.
+        headers (dict of str: str): The request headers, which are not
+            mutated.
+        params (dict): The parameters to use in the API call, or an
+            instance of the validator holding them already validated.
         validator: The validator to use to validate params.
+        session (:obj:`BaseSession`, optional): The connection pool to send
+            the request through. If None, a one-off connection is used.
+        route (:obj:`str`, optional): The API route, e.g. "person/enrich".
+        trusted (:obj:`bool`, optional): Whether params are sent without
+            being validated.
+        stream (:obj:`bool`, optional): Whether the response body is read
+            on demand, e.g. by a RecordStream, instead of being downloaded
+            at once.
     """
 
-    api_key: str
-    url: HttpUrl
-    headers: Dict[str, str]
-    params: dict
-    validator: Type[BaseModel]
-
-    def __post_init__(self):
-        """
-        Validates self.params using the validator received in self.validator.
-        """
-        logger.debug("Request object received params: %s", self.params)
-        self.params = self.validator(**self.params).dict(exclude_none=True)
+    __slots__ = (
+        "api_key",
+        "url",
+        "headers",
+        "params",
+        "validator",
+        "session",
+        "route",
+        "trusted",
+        "stream",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        api_key: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Any,
+        validator: Type[BaseModel],
+        *,
+        session: Optional[BaseSession] = None,
+        route: Optional[str] = None,
+        trusted: bool = False,
+        stream: bool = False,
+    ):
+        self.api_key = api_key
+        self.url = url
+        self.headers = headers
+        self.validator = validator
+        self.session = session
+        self.route = route
+        self.trusted = trusted
+        self.stream = stream
+        logger.debug("Request object received params: %s", params)
+        hooks = getattr(session, "hooks", None)
+        start = time.perf_counter()
+        self.params = validate_params(validator, params, trusted=trusted)
+        if hooks is not None and hooks.wants("validation"):
+            hooks.emit(
+                Event(
+                    "validation",
+                    route,
+                    url=url,
+                    duration=time.perf_counter() - start,
+                )
+            )
         logger.debug("Request object params after validation: %s", self.params)
 
-    def _sanitize_params(self) -> dict:
-        """
-        Creates a copy of params with sensitive data redacted for logging.
-
-        Returns:
-            A sanitized copy of the parameters dictionary.
-        """
-        logger_params = self.params.copy()
-        if "api_key" in logger_params:
-            logger_params["api_key"] = "***"
-        return logger_params
-
     def get(self):
         """
         Executes a GET request from the specified API.
@@ -69,30 +102,47 @@ class Request:
             A requests.Response object with the result of the HTTP call.
         """
         self.params["api_key"] = self.api_key
-        logger.info(
-            "Calling %s with params: %s",
-            self.url,
-            json.dumps(self._sanitize_params(), indent=2),
-        )
-        return requests.get(
-            self.url, params=self.params, headers=self.headers, timeout=None
-        )
+        return self._send("GET", self.headers, params=self.params)
 
     def post(self):
         """
         Executes a POST request to the specified API.
 
-        User's api_key is sent as a 'X-api-key' header.
+        User's api_key is sent as a 'X-api-key' header, unless the headers
+        of a compiled route already hold it.
 
         Returns:
             A requests.Response object with the result of the HTTP call.
         """
-        self.headers["X-api-key"] = self.api_key
-        logger.info(
-            "Calling %s with params: %s",
-            self.url,
-            json.dumps(self._sanitize_params(), indent=2),
-        )
-        return requests.post(
-            self.url, json=self.params, headers=self.headers, timeout=None
-        )
+        headers = self.headers
+        if headers.get("X-api-key") != self.api_key:
+            headers = {**headers, "X-api-key": self.api_key}
+        return self._send("POST", headers, json=self.params)
+
+    def _send(self, method: str, headers: Dict[str, str], **kwargs):
+        """
+        Sends the request through self.session, or through a one-off session if
+        none was given.
+
+        Args:
+            method (str): The HTTP method.
+            headers (dict of str: str): The request headers.
+            **kwargs: Either the query params or the JSON body.
+
+        Returns:
+            A requests.Response object with the result of the HTTP call, or
+            an awaitable resolving to a httpx.Response if self.session is
+            an AsyncSession.
+        """
+        kwargs.update(route=self.route, headers=headers, timeout=None)
+        if self.stream:
+            kwargs["stream"] = True
+        if self.session is not None:
+            return self.session.request(method, self.url, **kwargs)
+        session = Session()
+        if self.stream:
+            # The one-off session must outlive the call for the body to be
+            # read; its connection is released with the response.
+            return session.request(method, self.url, **kwargs)
+        with session:
+            return session.request(method, self.url, **kwargs)
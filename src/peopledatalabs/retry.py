@@ -0,0 +1,187 @@
+"""
+Automatic retries of failed calls.
+
+Transient failures (429, 502, 503, 504 and dropped connections) are
+retried with exponential backoff and full jitter, honoring Retry-After.
+Retries are drawn from a budget shared by all the calls of a client, so
+that they cannot amplify an outage. Calls which are not idempotent, such
+as bulk POSTs the API may have processed and billed, are only resent
+after errors raised while connecting, before anything was sent.
+"""
+
+import random
+import threading
+from typing import Iterator, Optional, Tuple, Type
+
+from .logger import get_logger
+from .ratelimit import parse_retry_after
+from .settings import settings
+
+
+logger = get_logger("retry")
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _causes(error: BaseException) -> Iterator[BaseException]:
+    """
+    Yields an error and the errors it wraps, as causes, contexts, arguments or
+    the reason of urllib3's MaxRetryError.
+    """
+    pending, seen = [error], set()
+    while pending:
+        error = pending.pop()
+        if not isinstance(error, BaseException) or id(error) in seen:
+            continue
+        seen.add(id(error))
+        yield error
+        pending.extend(error.args)
+        pending.extend(
+            (error.__cause__, error.__context__, getattr(error, "reason", 0))
+        )
+
+
+def is_resendable(
+    method: str,
+    error: BaseException,
+    connect_errors: Tuple[Type[BaseException], ...],
+) -> bool:
+    """
+    Checks whether a call which raised an error may be sent again.
+
+    Args:
+        method (str): The HTTP method of the call.
+        error (Exception): The error raised by the attempt.
+        connect_errors (tuple of type): The errors raised while
+            connecting, before any byte of the request was sent.
+
+    Returns:
+        True for idempotent methods, or if the error, or one it wraps, is
+        one of connect_errors.
+    """
+    if method.upper() in IDEMPOTENT_METHODS:
+        return True
+    return any(isinstance(cause, connect_errors) for cause in _causes(error))
+
+
+class RetryBudget:
+    """
+    Thread-safe budget of retries.
+
+    Every call deposits `ratio` retries and every retry withdraws one, so
+    that over time retries stay under `ratio` times the number of calls.
+    The balance starts at `minimum` retries and is capped at the retries
+    earned by `window` calls, so that busy clients can absorb a burst of
+    failures while a long quiet spell cannot bank an unbounded balance.
+
+    Args:
+        ratio (float): The fraction of calls which may be retried.
+        minimum (int): The number of retries allowed regardless of ratio.
+        window (:obj:`int`, optional): The number of calls whose retries
+            can be saved up.
+    """
+
+    def __init__(
+        self,
+        ratio: float,
+        minimum: int,
+        window: int = settings.retry_budget_window,
+    ):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.maximum = max(minimum, ratio * window)
+        self.balance = float(minimum)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """
+        Records a call.
+        """
+        with self._lock:
+            self.balance = min(self.balance + self.ratio, self.maximum)
+
+    def withdraw(self) -> bool:
+        """
+        Takes a retry from the budget.
+
+        Returns:
+            True if the budget allowed the retry.
+        """
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class Retry:
+    """
+    Retry policy and budget of a client.
+
+    Callers deposit into the budget once per call, then ask get_delay
+    after each failed attempt.
+
+    Args:
+        max_retries (:obj:`int`, optional): The maximum number of retries
+            of a single call.
+        backoff (:obj:`float`, optional): The base delay in seconds; the
+            delay before retry n is drawn uniformly from
+            [0, backoff * 2 ** n].
+        max_backoff (:obj:`float`, optional): The maximum delay in seconds.
+        max_retry_after (:obj:`float`, optional): The maximum delay in
+            seconds when honoring Retry-After.
+        budget (:obj:`float`, optional): The fraction of calls which may be
+            retried, on top of settings.retry_budget_min retries.
+    """
+
+    statuses = frozenset({429, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_retries: int = settings.max_retries,
+        backoff: float = settings.retry_backoff,
+        max_backoff: float = settings.retry_backoff_max,
+        budget: float = settings.retry_budget,
+        max_retry_after: float = settings.retry_after_max,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.budget = RetryBudget(budget, settings.retry_budget_min)
+
+    def is_retryable(self, response) -> bool:
+        """
+        Checks whether a response reports a transient failure.
+        """
+        return response.status_code in self.statuses
+
+    def get_delay(self, attempt: int, response=None) -> Optional[float]:
+        """
+        Decides whether a failed attempt is retried.
+
+        Args:
+            attempt (int): The number of the failed attempt, from 0.
+            response: The response of the attempt, or None if it raised.
+
+        Returns:
+            The number of seconds to wait before retrying, or None if the
+            attempt must not be retried.
+        """
+        if response is not None and not self.is_retryable(response):
+            return None
+        if attempt >= self.max_retries:
+            return None
+        if not self.budget.withdraw():
+            logger.warning("Retry budget exhausted, not retrying")
+            return None
+        delay = None
+        if response is not None:
+            delay = parse_retry_after(response.headers)
+        if delay is not None:
+            delay = min(delay, self.max_retry_after)
+        else:
+            delay = random.uniform(
+                0, min(self.max_backoff, self.backoff * 2**attempt)
+            )
+        return delay
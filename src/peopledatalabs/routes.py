@@ -0,0 +1,131 @@
+"""
+Table of the API routes of a client.
+
+Each route is compiled once per client, on its first call: its URL, HTTP
+method, validator and headers are then reused by every call, instead of
+being rebuilt each time.
+"""
+
+import threading
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Type
+
+from pydantic.v1 import BaseModel
+
+from .logger import get_logger
+from .settings import settings
+
+
+logger = get_logger("routes")
+
+# The default headers of every call. Each client takes a read-only
+# snapshot of them when it is built, so that changes made here apply to the
+# clients built afterwards and calls never write to them.
+HEADERS = {
+    "Accept-Encoding": "gzip",
+    "Content-Type": "application/json",
+    "User-Agent": "PDL-PYTHON-SDK",
+    "SDK-Version": settings.sdk_version,
+}
+
+
+class Route(NamedTuple):
+    """
+    A compiled API route.
+
+    Attributes:
+        name (str): The route, relative to the base path, e.g.
+            "person/enrich".
+        url (str): The URL of the route.
+        method (str): The HTTP method, "GET" or "POST".
+        validator: The model validating the parameters of a call.
+        headers (mapping of str: str): The read-only headers of a call,
+            including the API key of POST calls.
+    """
+
+    name: str
+    url: str
+    method: str
+    validator: Type[BaseModel]
+    headers: Mapping[str, str]
+
+
+class RouteTable:
+    """
+    The compiled routes of a client, shared by all its sections.
+
+    Args:
+        api_key (str): The API key sent with every call.
+        base_path (str): The base URL of the API.
+        accept_encoding (:obj:`str`, optional): The response encodings the
+            session of the client can decode. If None, the Accept-Encoding
+            of HEADERS is kept.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_path: str,
+        accept_encoding: Optional[str] = None,
+    ):
+        self.api_key = api_key
+        self.base_path = base_path
+        headers = dict(HEADERS)
+        if accept_encoding is not None:
+            headers["Accept-Encoding"] = accept_encoding
+        self.headers = MappingProxyType(headers)
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def __get_validators__(cls):
+        """
+        Allows route tables to be used as fields of pydantic dataclasses.
+        """
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value):
+        """
+        Checks the value is an instance of this class.
+        """
+        if not isinstance(value, cls):
+            raise TypeError(f"Expected {cls.__name__}, got {type(value)}.")
+        return value
+
+    def get(self, name: str, method: str, validator: Type[BaseModel]) -> Route:
+        """
+        Returns a route, compiling it on first use.
+
+        Args:
+            name (str): The route, e.g. "person/enrich".
+            method (str): The HTTP method of the route.
+            validator: The model validating the parameters of a call.
+        """
+        route = self._routes.get(name)
+        if route is None:
+            with self._lock:
+                route = self._routes.get(name)
+                if route is None:
+                    route = self._routes[name] = self._compile(
+                        name, method, validator
+                    )
+        return route
+
+    def _compile(
+        self, name: str, method: str, validator: Type[BaseModel]
+    ) -> Route:
+        headers = dict(self.headers)
+        if method == "POST":
+            headers["X-api-key"] = self.api_key
+        logger.debug("Compiled route %s %s", method, name)
+        return Route(
+            name,
+            f"{self.base_path}/{name}",
+            method,
+            validator,
+            MappingProxyType(headers),
+        )
+
+    def __len__(self) -> int:
+        return len(self._routes)
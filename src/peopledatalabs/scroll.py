@@ -0,0 +1,138 @@
+"""
+Iterators following the scroll_token of paginated APIs.
+
+Records are yielded one by one while the next page is fetched in the
+background, so that at most two pages are held in memory.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from .errors import APIError
+from .logger import get_logger
+
+
+logger = get_logger("scroll")
+
+
+class BaseScrollIterator:  # pylint: disable=too-few-public-methods
+    """
+    Base class for scroll iterators.
+
+    The position of the iterator is given by scroll_token and page_offset:
+    the token of the page holding the next record, and the index of that
+    record in the page. Passing both back to a new iterator resumes right
+    after the last record yielded.
+
+    Args:
+        fetch: Function calling the API for the page of a scroll token
+            (None for the first page).
+        scroll_token (:obj:`str`, optional): The token to resume from.
+        page_offset (:obj:`int`, optional): The number of records of the
+            resumed page to skip.
+        records_key (:obj:`str`, optional): The key holding the records in
+            the API response.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable,
+        scroll_token: Optional[str] = None,
+        page_offset: int = 0,
+        records_key: str = "data",
+    ):
+        self._fetch = fetch
+        self.scroll_token = scroll_token
+        self.page_offset = page_offset
+        self.records_key = records_key
+        self.total = None
+
+    def _read_page(self, response) -> Tuple[List[dict], Optional[str]]:
+        """
+        Extracts the records and the next scroll token from a page.
+
+        Raises:
+            APIError: If the call failed.
+        """
+        if response.status_code == 404:
+            return [], None
+        if response.status_code != 200:
+            raise APIError(response)
+        body = response.json()
+        if self.total is None:
+            self.total = body.get("total")
+        records = body.get(self.records_key) or []
+        next_token = body.get("scroll_token") if records else None
+        logger.debug(
+            "Read page of %s records, next scroll_token: %s",
+            len(records),
+            next_token,
+        )
+        return records, next_token
+
+
+class ScrollIterator(BaseScrollIterator):
+    """
+    Iterator over all records of a paginated API, with one page of read-ahead
+    fetched from a background thread.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._records = self._generate()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> dict:
+        return next(self._records)
+
+    def _generate(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(self._fetch, self.scroll_token)
+            while future is not None:
+                records, next_token = self._read_page(future.result())
+                future = None
+                if next_token:
+                    future = executor.submit(self._fetch, next_token)
+                for index in range(self.page_offset, len(records)):
+                    self.page_offset = index + 1
+                    yield records[index]
+                self.scroll_token, self.page_offset = next_token, 0
+        finally:
+            executor.shutdown(wait=False)
+
+
+class AsyncScrollIterator(BaseScrollIterator):
+    """
+    Async iterator over all records of a paginated API, reading one page ahead
+    from a background task.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._records = self._generate()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        return await self._records.__anext__()
+
+    async def _generate(self):
+        task = asyncio.ensure_future(self._fetch(self.scroll_token))
+        try:
+            while task is not None:
+                records, next_token = self._read_page(await task)
+                task = None
+                if next_token:
+                    task = asyncio.ensure_future(self._fetch(next_token))
+                for index in range(self.page_offset, len(records)):
+                    self.page_offset = index + 1
+                    yield records[index]
+                self.scroll_token, self.page_offset = next_token, 0
+        finally:
+            if task is not None:
+                task.cancel()
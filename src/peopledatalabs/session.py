@@ -0,0 +1,801 @@
+"""
+Session module.
+
+Holds the connection pool shared by every request issued from a client.
+"""
+
+import abc
+import time
+from typing import Optional, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import urllib3
+
+from .cache import BaseCache, CachedResponse, cache_key
+from .compression import encode_body, httpx_encodings
+from .hooks import Event, Hooks, response_fields
+from .keys import KeyPool
+from .logger import RequestLogger, get_logger
+from .ratelimit import RateLimiter
+from .retry import Retry, is_resendable
+from .settings import settings
+from .singleflight import AsyncSingleFlight, SingleFlight, flight_key
+from .transport import Transport, connect_time, make_transport
+
+
+logger = get_logger("session")
+
+
+def _tracer(timing: dict):
+    """
+    Returns a trace extension of httpx recording when each stage of a call
+    happens into timing.
+    """
+
+    async def trace(name: str, info):  # pylint: disable=unused-argument
+        timing[name] = time.perf_counter()
+
+    return trace
+
+
+# pylint: disable-next=too-few-public-methods,too-many-instance-attributes
+class BaseSession(abc.ABC):
+    """
+    Base class for the connection pools owned by clients.
+
+    Args:
+        pool_size (:obj:`int`, optional): The maximum number of connections
+            kept open per host.
+        keep_alive (:obj:`bool`, optional): Whether connections are kept
+            open between calls. If False every call opens a new connection.
+        rate_limiter (:obj:`RateLimiter`, optional): Paces the calls sent
+            through the session. If None calls are not paced.
+        retry (:obj:`Retry`, optional): Retries the calls which failed
+            transiently. If None calls are not retried.
+        cache (:obj:`BaseCache`, optional): Caches successful responses of
+            GET calls to cacheable routes. If None nothing is cached.
+        request_logger (:obj:`RequestLogger`, optional): Logs the calls
+            sent through the session. Defaults to the settings' style and
+            sample rate.
+        coalesce (:obj:`bool`, optional): Whether identical concurrent
+            calls share a single request.
+        hooks (:obj:`Hooks`, optional): The callbacks notified of the
+            lifecycle of calls.
+        keys (:obj:`KeyPool`, optional): The API keys the attempts of calls
+            are balanced over. If given, it paces calls per key instead of
+            rate_limiter.
+        compress (:obj:`bool`, optional): Whether JSON bodies of at least
+            settings.compress_min_bytes are gzipped.
+
+    Attributes:
+        accept_encoding (str): The Accept-Encoding header of the calls,
+            listing the response encodings the session can decode.
+        connect_errors (tuple of type): The errors raised while connecting,
+            after which calls with any method may be sent again.
+    """
+
+    flight_class = SingleFlight
+    accept_encoding = "gzip"
+    connect_errors = ()
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pool_size: int = settings.pool_size,
+        keep_alive: bool = settings.keep_alive,
+        *,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[Retry] = None,
+        cache: Optional[BaseCache] = None,
+        request_logger: Optional[RequestLogger] = None,
+        coalesce: bool = settings.coalesce,
+        hooks: Optional[Hooks] = None,
+        keys: Optional[KeyPool] = None,
+        compress: bool = settings.compress,
+    ):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.cache = cache
+        self.request_logger = request_logger or RequestLogger()
+        self.single_flight = self.flight_class() if coalesce else None
+        self.hooks = hooks or Hooks()
+        self.keys = keys
+        self.compress = compress
+
+    def _flight_key(self, method: str, url: str, kwargs: dict):
+        """
+        Returns the key coalescing identical concurrent calls, or None if the
+        call is sent on its own.
+
+        Only GET calls are coalesced: POST calls, e.g. bulk enrichments and
+        searches, are billed per call and rarely repeated while in flight.
+        Streamed responses cannot be shared, so they are never coalesced.
+        """
+        if (
+            self.single_flight is None
+            or method != "GET"
+            or kwargs.get("stream")
+        ):
+            return None
+        return flight_key(
+            method, url, kwargs.get("params") or kwargs.get("json")
+        )
+
+    def _start(self, method: str, url: str, route: Optional[str]) -> float:
+        """
+        Notifies the start of a call and returns its start time.
+        """
+        if self.hooks.wants("request_start"):
+            self.hooks.emit(Event("request_start", route, method, str(url)))
+        return time.perf_counter()
+
+    def _end(self, start: float, event: Event, response, measures: dict):
+        """
+        Notifies the end of a call.
+
+        Args:
+            start (float): The start time of the call.
+            event (Event): The request_end event, with the fields known
+                before the call.
+            response: The final response.
+            measures (dict): The connect, ttfb, request_bytes and
+                response_bytes fields, if measured.
+        """
+        self.hooks.emit(
+            event._replace(
+                duration=time.perf_counter() - start,
+                **response_fields(response),
+                **measures,
+            )
+        )
+
+    def _fail(self, start: float, method: str, url: str, route):
+        """
+        Notifies the end of a call which failed without a response.
+        """
+        if self.hooks.wants("request_end"):
+            self.hooks.emit(
+                Event(
+                    "request_end",
+                    route,
+                    method,
+                    str(url),
+                    duration=time.perf_counter() - start,
+                )
+            )
+
+    def _cache_lookup(
+        self,
+        method: str,
+        url: str,
+        route: Optional[str],
+        params: Optional[dict],
+    ):
+        """
+        Looks a call up in the cache.
+
+        Returns:
+            A (key, ttl, response) tuple: key and ttl are None if the call
+            is not cacheable, response is None on a miss.
+        """
+        if self.cache is None or method != "GET":
+            return None, None, None
+        ttl = self.cache.ttl(route)
+        if ttl is None:
+            return None, None, None
+        key = cache_key(url, params)
+        response = self.cache.get(key)
+        if isinstance(response, CachedResponse):
+            response = self._restore(response)
+        if response is not None and self.hooks.wants("cache_hit"):
+            self.hooks.emit(
+                Event("cache_hit", route, method, str(url), cached=True)
+            )
+        return key, ttl, response
+
+    @abc.abstractmethod
+    def _restore(self, cached: CachedResponse):
+        """
+        Rebuilds a response from its cached copy.
+        """
+
+    def _cache_store(self, key: Optional[str], ttl: float, response):
+        """
+        Caches the response of a cacheable call if it succeeded.
+        """
+        if key is not None and response.status_code == 200:
+            self.cache.set(key, response, ttl)
+
+    def _resendable(self, method: str, route: Optional[str], error) -> bool:
+        """
+        Checks whether a call whose attempt raised error may be retried:
+        POSTs are only retried if nothing was sent, as the API may have
+        processed, and billed, a call whose response was lost.
+        """
+        if self.retry is None:
+            return False
+        if is_resendable(method, error, self.connect_errors):
+            return True
+        logger.warning(
+            "Not resending %s %s after %r, which may have been processed",
+            method,
+            route,
+            error,
+        )
+        return False
+
+    def _pick_key(self, route: Optional[str]) -> Optional[str]:
+        """
+        Returns the key of an attempt, None if the session has no keys.
+        """
+        return None if self.keys is None else self.keys.pick(route)
+
+    @staticmethod
+    def _sign(key: Optional[str], kwargs: dict) -> dict:
+        """
+        Returns kwargs with key replacing the key set by the Request, as the
+        api_key param or the X-api-key header.
+        """
+        if key is None:
+            return kwargs
+        params, headers = kwargs.get("params"), kwargs.get("headers")
+        kwargs = dict(kwargs)
+        if params and "api_key" in params:
+            kwargs["params"] = {**params, "api_key": key}
+        if headers and "X-api-key" in headers:
+            kwargs["headers"] = {**headers, "X-api-key": key}
+        return kwargs
+
+    def _before_attempt(
+        self, route: Optional[str], key: Optional[str] = None
+    ) -> float:
+        """
+        Returns the number of seconds to wait before sending an attempt.
+        """
+        if self.keys is not None:
+            return self.keys.reserve(key, route)
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.reserve(route)
+
+    def _after_attempt(
+        self,
+        route: Optional[str],
+        tries: dict,
+        response,
+        key: Optional[str] = None,
+    ) -> Optional[float]:
+        """
+        Processes the outcome of an attempt.
+
+        Args:
+            route (str): The API route.
+            tries (dict): The "retries" and "failovers" of the call so far,
+                counted from 0 and updated when the call is sent again.
+            response: The response, or None if the attempt raised a
+                transient error.
+            key (:obj:`str`, optional): The key of the attempt, if the
+                session has keys.
+
+        Returns:
+            The number of seconds to wait before sending the call again,
+            or None if the call is over. Calls failed because of their key
+            are sent again at once on another key, up to once per key,
+            outside of the retry policy: failovers neither count as
+            retries nor draw from the retry budget.
+        """
+        attempt = tries["retries"]
+        failover = False
+        if response is not None and self.keys is not None:
+            failover = self.keys.update(key, route, response) and (
+                tries["failovers"] < len(self.keys)
+            )
+        elif response is not None and self.rate_limiter is not None:
+            self.rate_limiter.update(route, response)
+        if self.retry is not None and attempt == tries["failovers"] == 0:
+            self.retry.budget.deposit()
+        if failover:
+            delay = 0.0
+        elif self.retry is None:
+            return None
+        else:
+            delay = self.retry.get_delay(attempt, response)
+        if delay is None:
+            return None
+        if self.hooks.wants("retry"):
+            self.hooks.emit(
+                Event(
+                    "retry",
+                    route,
+                    status=None if response is None else response.status_code,
+                    attempt=attempt,
+                    delay=delay,
+                )
+            )
+        logger.info(
+            "Retrying %s in %.2fs after attempt %s failed with %s",
+            route,
+            delay,
+            attempt + tries["failovers"] + 1,
+            "an error" if response is None else response.status_code,
+        )
+        tries["failovers" if failover else "retries"] += 1
+        return delay
+
+    @classmethod
+    def __get_validators__(cls):
+        """
+        Allows sessions to be used as fields of pydantic dataclasses.
+        """
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value):
+        """
+        Checks the value is an instance of this class.
+        """
+        if not isinstance(value, cls):
+            raise TypeError(f"Expected {cls.__name__}, got {type(value)}.")
+        return value
+
+
+class Session(BaseSession):
+    """
+    Long-lived pool of keep-alive HTTP connections.
+
+    A single Session is owned by each client instance and is reused by all
+    its sections (person, company, location, school) and by the top-level
+    APIs, so that TCP and TLS handshakes are paid once per connection
+    instead of once per call.
+
+    Args:
+        pool_size (:obj:`int`, optional): The maximum number of connections
+            kept open per host.
+        keep_alive (:obj:`bool`, optional): Whether connections are kept
+            open between calls. If False every call opens a new connection.
+        rate_limiter (:obj:`RateLimiter`, optional): Paces the calls sent
+            through the session. If None calls are not paced.
+        retry (:obj:`Retry`, optional): Retries the calls which failed
+            transiently. If None calls are not retried.
+        cache (:obj:`BaseCache`, optional): Caches successful responses of
+            GET calls to cacheable routes. If None nothing is cached.
+        request_logger (:obj:`RequestLogger`, optional): Logs the calls
+            sent through the session. Defaults to the settings' style and
+            sample rate.
+        coalesce (:obj:`bool`, optional): Whether identical concurrent
+            calls share a single request.
+        hooks (:obj:`Hooks`, optional): The callbacks notified of the
+            lifecycle of calls.
+        transport (:obj:`Transport` or str, optional): The transport
+            sending the requests, or the name of a shipped one, "requests"
+            or "urllib3". Defaults to settings.transport.
+        keys (:obj:`KeyPool`, optional): The API keys the attempts of calls
+            are balanced over.
+        compress (:obj:`bool`, optional): Whether JSON bodies of at least
+            settings.compress_min_bytes are gzipped.
+    """
+
+    connect_errors = (
+        requests.ConnectTimeout,
+        urllib3.exceptions.ConnectTimeoutError,
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pool_size: int = settings.pool_size,
+        keep_alive: bool = settings.keep_alive,
+        *,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[Retry] = None,
+        cache: Optional[BaseCache] = None,
+        request_logger: Optional[RequestLogger] = None,
+        coalesce: bool = settings.coalesce,
+        hooks: Optional[Hooks] = None,
+        transport: Union[Transport, str, None] = None,
+        keys: Optional[KeyPool] = None,
+        compress: bool = settings.compress,
+    ):
+        super().__init__(
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            rate_limiter=rate_limiter,
+            retry=retry,
+            cache=cache,
+            request_logger=request_logger,
+            coalesce=coalesce,
+            hooks=hooks,
+            keys=keys,
+            compress=compress,
+        )
+        self.transport = make_transport(transport, pool_size, keep_alive)
+        self.accept_encoding = self.transport.accept_encoding
+        logger.debug(
+            "Opened session with pool_size=%s, keep_alive=%s, transport=%s",
+            pool_size,
+            keep_alive,
+            type(self.transport).__name__,
+        )
+
+    def request(
+        self, method: str, url: str, route: Optional[str] = None, **kwargs
+    ):
+        """
+        Sends an HTTP request through the connection pool.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to call.
+            route (:obj:`str`, optional): The API route, e.g.
+                "person/enrich", used to pace calls per API.
+            **kwargs: Additional arguments for requests.Request, and the
+                'timeout' of each attempt.
+
+        Returns:
+            A requests.Response object with the result of the HTTP call.
+        """
+        self.request_logger.log(
+            method, url, route, kwargs.get("params") or kwargs.get("json")
+        )
+        start = self._start(method, url, route)
+        key, ttl, response = self._cache_lookup(
+            method, url, route, kwargs.get("params")
+        )
+        cached = response is not None
+        if not cached:
+            connect_time.value = 0.0
+            flight = self._flight_key(method, url, kwargs)
+            try:
+                if flight is None:
+                    response = self._send(method, url, route, **kwargs)
+                else:
+                    response = self.single_flight.do(
+                        flight,
+                        lambda: self._send(method, url, route, **kwargs),
+                    )
+            except BaseException:
+                self._fail(start, method, url, route)
+                raise
+            self._cache_store(key, ttl, response)
+        if self.hooks.wants("request_end"):
+            self._end(
+                start,
+                Event("request_end", route, method, str(url), cached=cached),
+                response,
+                (
+                    {"response_bytes": len(response.content)}
+                    if cached
+                    else self._measure(response)
+                ),
+            )
+        return response
+
+    @staticmethod
+    def _measure(response: requests.Response) -> dict:
+        """
+        Returns the timings and sizes of the last attempt of a call.
+        """
+        body = getattr(response.request, "body", None) or b""
+        return {
+            "connect": connect_time.value,
+            "ttfb": response.elapsed.total_seconds(),
+            "request_bytes": len(body),
+            "response_bytes": (
+                response.raw.tell()
+                if hasattr(response.raw, "tell")
+                else len(response.content)
+            ),
+        }
+
+    def _restore(self, cached: CachedResponse) -> requests.Response:
+        response = requests.Response()
+        response.status_code = cached.status_code
+        response.headers = CaseInsensitiveDict(cached.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = cached.url
+        response.reason = "OK"
+        response._content = cached.content  # pylint: disable=W0212
+        return response
+
+    def _send(self, method: str, url: str, route: Optional[str], **kwargs):
+        """
+        Sends an HTTP request, retrying it if it failed transiently.
+
+        The request is prepared, and its body serialized, once for all
+        attempts sent with the same key. With stream=True the body of
+        the response is not read.
+        """
+        timeout = kwargs.pop("timeout", None)
+        stream = kwargs.pop("stream", False)
+        if self.compress:
+            kwargs = encode_body(kwargs)
+        prepared = key = None
+        tries = {"retries": 0, "failovers": 0}
+        while True:
+            picked = self._pick_key(route)
+            if prepared is None or picked != key:
+                key = picked
+                prepared = self.transport.prepare(
+                    method, url, **self._sign(key, kwargs)
+                )
+            delay = self._before_attempt(route, key)
+            if delay:
+                time.sleep(delay)
+            error = None
+            try:
+                response = self.transport.send(
+                    prepared, timeout=timeout, stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout) as ex:
+                if not self._resendable(method, route, ex):
+                    raise
+                response, error = None, ex
+            delay = self._after_attempt(route, tries, response, key)
+            if delay is None:
+                if response is None:
+                    raise error
+                return response
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class AsyncSession(BaseSession):
+    """
+    Long-lived pool of keep-alive HTTP connections for asyncio clients.
+
+    Requests are sent with httpx, which must be installed with the 'async'
+    extra: pip install peopledatalabs[async].
+
+    Args:
+        pool_size (:obj:`int`, optional): The maximum number of connections
+            kept open per host.
+        keep_alive (:obj:`bool`, optional): Whether connections are kept
+            open between calls. If False every call opens a new connection.
+        rate_limiter (:obj:`RateLimiter`, optional): Paces the calls sent
+            through the session. If None calls are not paced.
+        retry (:obj:`Retry`, optional): Retries the calls which failed
+            transiently. If None calls are not retried.
+        cache (:obj:`BaseCache`, optional): Caches successful responses of
+            GET calls to cacheable routes. If None nothing is cached.
+        request_logger (:obj:`RequestLogger`, optional): Logs the calls
+            sent through the session. Defaults to the settings' style and
+            sample rate.
+        coalesce (:obj:`bool`, optional): Whether identical concurrent
+            calls share a single request.
+        hooks (:obj:`Hooks`, optional): The callbacks notified of the
+            lifecycle of calls.
+        transport (None): Not supported: calls are sent with httpx.
+        keys (:obj:`KeyPool`, optional): The API keys the attempts of calls
+            are balanced over.
+        compress (:obj:`bool`, optional): Whether JSON bodies of at least
+            settings.compress_min_bytes are gzipped.
+    """
+
+    flight_class = AsyncSingleFlight
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pool_size: int = settings.pool_size,
+        keep_alive: bool = settings.keep_alive,
+        *,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[Retry] = None,
+        cache: Optional[BaseCache] = None,
+        request_logger: Optional[RequestLogger] = None,
+        coalesce: bool = settings.coalesce,
+        hooks: Optional[Hooks] = None,
+        transport: None = None,
+        keys: Optional[KeyPool] = None,
+        compress: bool = settings.compress,
+    ):
+        if transport is not None:
+            raise ValueError(
+                "The asyncio client sends its calls with httpx, it does not"
+                " support other transports."
+            )
+        super().__init__(
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            rate_limiter=rate_limiter,
+            retry=retry,
+            cache=cache,
+            request_logger=request_logger,
+            coalesce=coalesce,
+            hooks=hooks,
+            keys=keys,
+            compress=compress,
+        )
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        try:
+            import httpx
+        except ImportError as ex:
+            raise ImportError(
+                "The asyncio client requires httpx."
+                " Install it with: pip install peopledatalabs[async]"
+            ) from ex
+        self._sleep = asyncio.sleep
+        self._httpx = httpx
+        self.accept_encoding = httpx_encodings(httpx)
+        self._transport_errors = httpx.TransportError
+        self.connect_errors = (
+            httpx.ConnectError,
+            httpx.ConnectTimeout,
+            httpx.PoolTimeout,
+        )
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size if keep_alive else 0,
+            ),
+        )
+        logger.debug(
+            "Opened async session with pool_size=%s, keep_alive=%s",
+            pool_size,
+            keep_alive,
+        )
+
+    async def request(
+        self, method: str, url: str, route: Optional[str] = None, **kwargs
+    ):
+        """
+        Sends an HTTP request through the connection pool.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to call.
+            route (:obj:`str`, optional): The API route, e.g.
+                "person/enrich", used to pace calls per API.
+            **kwargs: Additional arguments for httpx.AsyncClient.request.
+
+        Returns:
+            A httpx.Response object with the result of the HTTP call.
+        """
+        self.request_logger.log(
+            method, url, route, kwargs.get("params") or kwargs.get("json")
+        )
+        start = self._start(method, url, route)
+        key, ttl, response = self._cache_lookup(
+            method, url, route, kwargs.get("params")
+        )
+        cached = response is not None
+        timing = {}
+        if not cached:
+            if self.hooks.wants("request_end"):
+                kwargs["extensions"] = {"trace": _tracer(timing)}
+            flight = self._flight_key(method, url, kwargs)
+            try:
+                if flight is None:
+                    response = await self._send(method, url, route, **kwargs)
+                else:
+                    response = await self.single_flight.do(
+                        flight,
+                        lambda: self._send(method, url, route, **kwargs),
+                    )
+            except BaseException:
+                self._fail(start, method, url, route)
+                raise
+            self._cache_store(key, ttl, response)
+        if self.hooks.wants("request_end"):
+            self._end(
+                start,
+                Event("request_end", route, method, str(url), cached=cached),
+                response,
+                (
+                    {"response_bytes": len(response.content)}
+                    if cached
+                    else self._measure(response, timing)
+                ),
+            )
+        return response
+
+    @staticmethod
+    def _measure(response, timing: dict) -> dict:
+        """
+        Returns the timings and sizes of the last attempt of a call, from the
+        stages traced by httpx.
+        """
+        if not timing:
+            # The call was coalesced with another one.
+            return {"response_bytes": response.num_bytes_downloaded}
+        connected = timing.get(
+            "connection.start_tls.complete",
+            timing.get("connection.connect_tcp.complete"),
+        )
+        sent = timing.get(
+            "http11.send_request_headers.started",
+            timing.get("http2.send_request_headers.started"),
+        )
+        received = timing.get(
+            "http11.receive_response_headers.complete",
+            timing.get("http2.receive_response_headers.complete"),
+        )
+        measures = {
+            "connect": (
+                connected - timing["connection.connect_tcp.started"]
+                if connected is not None
+                else 0.0
+            ),
+            "request_bytes": len(response.request.content),
+            "response_bytes": response.num_bytes_downloaded,
+        }
+        if sent is not None and received is not None:
+            measures["ttfb"] = received - sent
+        return measures
+
+    def _restore(self, cached: CachedResponse):
+        return self._httpx.Response(
+            cached.status_code,
+            headers=cached.headers,
+            content=cached.content,
+            request=self._httpx.Request("GET", cached.url),
+        )
+
+    async def _send(
+        self, method: str, url: str, route: Optional[str], **kwargs
+    ):
+        """
+        Sends an HTTP request, retrying it if it failed transiently.
+
+        The request is built, and its body serialized, once for all
+        attempts sent with the same key. With stream=True the body of
+        the response is not read.
+        """
+        stream = kwargs.pop("stream", False)
+        if self.compress:
+            kwargs = encode_body(kwargs, field="content")
+        prepared = key = None
+        tries = {"retries": 0, "failovers": 0}
+        while True:
+            picked = self._pick_key(route)
+            if prepared is None or picked != key:
+                key = picked
+                prepared = self._http.build_request(
+                    method, url, **self._sign(key, kwargs)
+                )
+            delay = self._before_attempt(route, key)
+            if delay:
+                await self._sleep(delay)
+            error = None
+            try:
+                response = await self._http.send(prepared, stream=stream)
+            except self._transport_errors as ex:
+                if not self._resendable(method, route, ex):
+                    raise
+                response, error = None, ex
+            delay = self._after_attempt(route, tries, response, key)
+            if delay is None:
+                if response is None:
+                    raise error
+                return response
+            if response is not None:
+                await response.aclose()
+            await self._sleep(delay)
+
+    async def close(self):
+        """
+        Closes all pooled connections.
+        """
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
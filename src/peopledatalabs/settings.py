@@ -16,10 +16,40 @@ class Settings:
     base_path: HttpUrl = "https://api.peopledatalabs.com/"
     log_level: str = None
     log_format: str = "{asctime} [{levelname}] - {name}.{funcName}: {message}"
+    log_style: str = "compact"
+    log_sample_rate: int = 1
+    log_max_items: int = 10
     version: str = "v5"
     version_re: str = r"^v[0-9]$"
     sandbox_base_path: HttpUrl = "https://sandbox.api.peopledatalabs.com/"
     sdk_version: str = "6.4.13"
+    pool_size: int = 10
+    keep_alive: bool = True
+    bulk_batch_size: int = 100
+    bulk_max_workers: int = 4
+    search_page_size: int = 100
+    search_max_records: int = 10000
+    search_max_workers: int = 8
+    rate_limit: bool = True
+    key_cooldown: float = 3600.0
+    max_retries: int = 3
+    retry_backoff: float = 0.5
+    retry_backoff_max: float = 30.0
+    retry_after_max: float = 60.0
+    retry_budget: float = 0.2
+    retry_budget_min: int = 10
+    retry_budget_window: int = 1000
+    cache_size: int = 10000
+    cache_ttl: float = 86400.0
+    disk_cache_max_bytes: int = 1 << 30
+    disk_cache_timeout: float = 30.0
+    email_cache_size: int = 10000
+    stream_chunk_size: int = 65536
+    coalesce: bool = False
+    compress: bool = False
+    compress_min_bytes: int = 1024
+    compress_level: int = 1
+    transport: str = "requests"
 
 
 settings = Settings()
@@ -0,0 +1,142 @@
+"""
+Coalescing of identical concurrent calls.
+
+When several threads, or tasks, issue the same GET call while it is in
+flight, only the first one sends it and the others wait for its outcome:
+they all receive the same response, or the same exception. Calls are
+identified by their method, URL and canonical parameters, regardless of
+the API key. Nothing is kept once a call is over, so that, unlike a
+cache, later calls are always sent.
+"""
+
+import threading
+from typing import Callable, Optional
+
+from .cache import cache_key
+from .logger import get_logger
+
+
+logger = get_logger("singleflight")
+
+
+def flight_key(method: str, url: str, params: Optional[dict]) -> str:
+    """
+    Builds the key identifying identical calls.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The URL of the call.
+        params (dict): The validated query parameters or JSON body.
+    """
+    return f"{method} {cache_key(url, params)}"
+
+
+class _Flight:  # pylint: disable=too-few-public-methods
+    """
+    Outcome of an in-flight call, shared with the threads waiting for it.
+    """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Thread-safe coalescing of identical concurrent calls.
+
+    Attributes:
+        shared (int): The number of calls served by another in-flight call.
+    """
+
+    def __init__(self):
+        self.shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable):
+        """
+        Runs func, unless a call with the same key is in flight, in which case
+        its outcome is awaited and returned instead.
+
+        Args:
+            key (str): The key of the call.
+            func: The function sending the call.
+
+        Returns:
+            The result of func, shared by all the coalesced calls.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.shared += 1
+        if not leader:
+            logger.debug("Joining in-flight call %s", key)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = func()
+        except BaseException as ex:
+            flight.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def __len__(self):
+        return len(self._flights)
+
+
+class AsyncSingleFlight:
+    """
+    Coalescing of identical concurrent calls of asyncio tasks.
+
+    Each call runs in its own task, shielded from the cancellation of the
+    callers, so that cancelling one caller does not fail the others.
+
+    Attributes:
+        shared (int): The number of calls served by another in-flight call.
+    """
+
+    def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        self.shared = 0
+        self._flights = {}
+        self._ensure_future = asyncio.ensure_future
+        self._shield = asyncio.shield
+
+    async def do(self, key: str, func: Callable):
+        """
+        Awaits func(), unless a call with the same key is in flight, in which
+        case its outcome is awaited and returned instead.
+
+        Args:
+            key (str): The key of the call.
+            func: The coroutine function sending the call.
+
+        Returns:
+            The result of func, shared by all the coalesced calls.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = self._ensure_future(func())
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self.shared += 1
+            logger.debug("Joining in-flight call %s", key)
+        return await self._shield(flight)
+
+    def __len__(self):
+        return len(self._flights)
@@ -0,0 +1,269 @@
+"""
+Incremental decoding of the records of large responses.
+
+The body of a response is read chunk by chunk and the records of its
+array, either the top-level array of a bulk response or the 'data' array
+of a search response, are decoded and yielded one at a time. Only the
+text of the record being decoded is buffered, so that memory stays
+proportional to one record instead of one page.
+"""
+
+import codecs
+import json
+from typing import Iterator, Optional
+
+from .errors import APIError
+from .logger import get_logger
+from .settings import settings
+
+
+logger = get_logger("stream")
+
+_MORE = object()
+
+_WHITESPACE = " \t\r\n"
+
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+
+class ArrayParser:
+    """
+    Push parser yielding the items of a JSON array as they are completed.
+
+    Chunks of the body are given to feed(), and close() is called at its
+    end; parse() yields each item of the array, or _MORE when it needs
+    the next chunk. Each item is decoded by the C decoder of the json
+    module as soon as its last byte is available.
+
+    Args:
+        key (:obj:`str`, optional): The member of the top-level object
+            holding the array. If None, the body is expected to be an
+            array. Other members of a top-level object are decoded into
+            `fields`.
+    """
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self.buffer = ""
+        self.eof = False
+        self.fields = {}
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, chunk: bytes):
+        """
+        Appends a chunk of the body to the buffer.
+        """
+        self.buffer += self._text.decode(chunk)
+
+    def close(self):
+        """
+        Marks the end of the body.
+        """
+        self.buffer += self._text.decode(b"", final=True)
+        self.eof = True
+
+    def _truncated(self):
+        return ValueError("Truncated JSON in streamed response.")
+
+    def _skip_whitespace(self, pos: int):
+        """
+        Yields _MORE until a non-whitespace character is available at or after
+        pos, then returns its position.
+        """
+        while True:
+            while pos < len(self.buffer) and self.buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(self.buffer):
+                return pos
+            if self.eof:
+                raise self._truncated()
+            yield _MORE
+
+    def _value(self, pos: int):
+        """
+        Yields _MORE until the JSON value starting at pos is complete, then
+        returns it with the position right after it.
+
+        A number at the end of the buffer may continue in the next
+        chunk, so a value is only returned once the delimiter following
+        it, or the end of the body, is seen.
+        """
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                if self.eof or (
+                    end < len(self.buffer) and self.buffer[end] in _DELIMITERS
+                ):
+                    return value, end
+            yield _MORE
+
+    def _expect(self, pos: int, chars: str):
+        """
+        Yields _MORE until a non-whitespace character is available, checks it
+        is one of chars and returns it with its position.
+        """
+        pos = yield from self._skip_whitespace(pos)
+        char = self.buffer[pos]
+        if char not in chars:
+            raise ValueError(
+                f"Unexpected {char!r} in streamed response, expected one"
+                f" of {chars!r}."
+            )
+        return char, pos
+
+    def _items(self, pos: int):
+        """
+        Yields the items of the array whose "[" is at pos, then returns the
+        position after its "]".
+        """
+        pos = yield from self._skip_whitespace(pos + 1)
+        if self.buffer[pos] == "]":
+            return pos + 1
+        while True:
+            item, end = yield from self._value(pos)
+            yield item
+            self.buffer = self.buffer[end:]
+            char, pos = yield from self._expect(0, ",]")
+            if char == "]":
+                return pos + 1
+            pos = yield from self._skip_whitespace(pos + 1)
+
+    def parse(self):
+        """
+        Yields the items of the array, and _MORE when more bytes are needed.
+        """
+        char, pos = yield from self._expect(0, "[{")
+        if char == "[":
+            if self.key is None:
+                yield from self._items(pos)
+            return
+        pos += 1
+        while True:
+            char, pos = yield from self._expect(pos, '"}')
+            if char == "}":
+                return
+            name, pos = yield from self._value(pos)
+            _, pos = yield from self._expect(pos, ":")
+            pos = yield from self._skip_whitespace(pos + 1)
+            if name == self.key and self.buffer[pos] == "[":
+                pos = yield from self._items(pos)
+            else:
+                self.fields[name], pos = yield from self._value(pos)
+            char, pos = yield from self._expect(pos, ",}")
+            if char == "}":
+                return
+            pos += 1
+
+
+class RecordStream:
+    """
+    Iterator over the records of a streamed response.
+
+    The response must have been requested with stream=True, and is closed
+    once all its records are read. The other members of the body, e.g.
+    'total' and 'scroll_token' of a search, are available in `fields` once
+    the iteration is over. A 404 yields no records; any other failed call
+    raises APIError when the iteration starts.
+
+    Args:
+        response (requests.Response): The streamed response.
+        key (:obj:`str`, optional): The member holding the records, e.g.
+            "data" for search responses, or None for the top-level array
+            of bulk responses.
+        chunk_size (:obj:`int`, optional): The number of bytes read at a
+            time.
+    """
+
+    def __init__(
+        self,
+        response,
+        key: Optional[str] = None,
+        chunk_size: int = settings.stream_chunk_size,
+    ):
+        self.response = response
+        self.status_code = response.status_code
+        self._parser = ArrayParser(key)
+        self.fields = self._parser.fields
+        self._records = self._generate(response.iter_content(chunk_size))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._records)
+
+    def _generate(self, chunks: Iterator[bytes]):
+        parser = self._parser
+        try:
+            if self.status_code not in (200, 404):
+                raise APIError(self.response)
+            for record in parser.parse():
+                if record is not _MORE:
+                    yield record
+                    continue
+                chunk = next(chunks, None)
+                if chunk is None:
+                    parser.close()
+                else:
+                    parser.feed(chunk)
+        finally:
+            self.response.close()
+
+
+class AsyncRecordStream:
+    """
+    Async iterator over the records of a streamed httpx response.
+
+    Args:
+        response: The streamed httpx.Response, or an awaitable resolving
+            to it.
+        key (:obj:`str`, optional): The member holding the records, e.g.
+            "data" for search responses, or None for the top-level array
+            of bulk responses.
+        chunk_size (:obj:`int`, optional): The number of bytes read at a
+            time.
+    """
+
+    def __init__(
+        self,
+        response,
+        key: Optional[str] = None,
+        chunk_size: int = settings.stream_chunk_size,
+    ):
+        self.response = response
+        self.status_code = None
+        self._parser = ArrayParser(key)
+        self.fields = self._parser.fields
+        self._records = self._generate(chunk_size)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._records.__anext__()
+
+    async def _generate(self, chunk_size: int):
+        if not hasattr(self.response, "aiter_bytes"):
+            self.response = await self.response
+        self.status_code = self.response.status_code
+        chunks = self.response.aiter_bytes(chunk_size)
+        parser = self._parser
+        try:
+            if self.status_code not in (200, 404):
+                await self.response.aread()
+                raise APIError(self.response)
+            for record in parser.parse():
+                if record is not _MORE:
+                    yield record
+                    continue
+                try:
+                    parser.feed(await chunks.__anext__())
+                except StopAsyncIteration:
+                    parser.close()
+        finally:
+            await self.response.aclose()
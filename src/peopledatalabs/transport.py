@@ -0,0 +1,380 @@
+"""
+Transports sending the HTTP requests of synchronous sessions.
+
+A transport only moves bytes: the session above it paces, retries, caches
+and instruments calls. Two transports are shipped:
+
+- "requests" (the default): a requests.Session, with its full handling of
+  proxies from the environment, cookies and redirects.
+- "urllib3": a urllib3 connection pool driven directly, skipping the
+  per-call work of requests that API calls never need (session merging,
+  cookie jars, redirect resolution, hooks dispatch).
+
+Custom transports, e.g. test doubles or an HTTP/2 client, subclass
+Transport and are passed to the client as PDLPY(transport=MyTransport()).
+Every transport returns requests.Response objects and raises
+requests.ConnectionError or requests.Timeout on transient failures, so
+that the rest of the client is unaware of the transport in use. Failures
+to connect, before anything was sent, are raised as requests.ConnectTimeout
+or wrap a urllib3 ConnectTimeoutError, so that POSTs are only resent then.
+"""
+
+import abc
+import datetime
+from json import dumps
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import urllib3
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .compression import urllib3_encodings
+from .logger import get_logger
+from .settings import settings
+
+
+logger = get_logger("transport")
+
+# Time spent by the current thread opening connections during its call.
+connect_time = threading.local()
+
+
+class _TimedConnection:  # pylint: disable=too-few-public-methods
+    """
+    Mixin of urllib3 connections timing their opening.
+    """
+
+    def connect(self):
+        """
+        Opens the connection, adding the time spent to connect_time.
+        """
+        start = time.perf_counter()
+        super().connect()  # pylint: disable=no-member
+        connect_time.value = (
+            getattr(connect_time, "value", 0.0) + time.perf_counter() - start
+        )
+
+
+class _TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+POOL_CLASSES = {
+    "http": _TimedHTTPConnectionPool,
+    "https": _TimedHTTPSConnectionPool,
+}
+
+
+class _TimedAdapter(HTTPAdapter):
+    """
+    Transport adapter of requests timing the opening of connections.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(POOL_CLASSES)
+
+
+class Transport(abc.ABC):
+    """
+    Base class for transports.
+
+    Subclasses implement prepare() and send(), and close() if they hold
+    connections.
+
+    Args:
+        pool_size (:obj:`int`, optional): The maximum number of connections
+            kept open per host.
+        keep_alive (:obj:`bool`, optional): Whether connections are kept
+            open between calls.
+
+    Attributes:
+        accept_encoding (str): The Accept-Encoding header of the calls,
+            listing the response encodings the transport can decode.
+    """
+
+    accept_encoding = "gzip"
+
+    def __init__(
+        self,
+        pool_size: int = settings.pool_size,
+        keep_alive: bool = settings.keep_alive,
+    ):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+
+    @classmethod
+    def __get_validators__(cls):
+        """
+        Allows transports to be used as fields of pydantic dataclasses.
+        """
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value):
+        """
+        Checks the value is an instance of this class.
+        """
+        if not isinstance(value, cls):
+            raise TypeError(f"Expected {cls.__name__}, got {type(value)}.")
+        return value
+
+    @abc.abstractmethod
+    def prepare(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Encodes a request once for all its attempts.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to call, without its query string.
+            params (:obj:`dict`, optional): The query parameters.
+            json (:obj:`dict`, optional): The JSON body.
+            data (:obj:`bytes`, optional): The body, already encoded,
+                instead of json.
+            headers (:obj:`dict`, optional): The request headers.
+
+        Returns:
+            The prepared request, given back to send(). It must have a
+            `body` attribute, the bytes of the body or None.
+        """
+
+    @abc.abstractmethod
+    def send(self, prepared, *, timeout=None, stream: bool = False):
+        """
+        Sends a prepared request.
+
+        Args:
+            prepared: A request returned by prepare().
+            timeout (:obj:`float`, optional): The timeout of the attempt.
+            stream (:obj:`bool`, optional): Whether the body of the
+                response is read on demand instead of at once.
+
+        Returns:
+            A requests.Response object with the result of the HTTP call.
+
+        Raises:
+            requests.ConnectionError, requests.Timeout: If the call failed
+                without a response, so that it may be retried. POSTs are
+                only retried after a requests.ConnectTimeout, or an error
+                wrapping a urllib3 ConnectTimeoutError.
+        """
+
+    def close(self):
+        """
+        Closes the pooled connections.
+        """
+
+
+class RequestsTransport(Transport):
+    """
+    Transport sending requests with a requests.Session.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = settings.pool_size,
+        keep_alive: bool = settings.keep_alive,
+    ):
+        super().__init__(pool_size, keep_alive)
+        self.accept_encoding = urllib3_encodings()
+        self._http = requests.Session()
+        adapter = _TimedAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+        if not keep_alive:
+            self._http.headers["Connection"] = "close"
+
+    def prepare(self, method: str, url: str, **kwargs):
+        return self._http.prepare_request(
+            requests.Request(method, url, **kwargs)
+        )
+
+    def send(self, prepared, *, timeout=None, stream: bool = False):
+        send_kwargs = self._http.merge_environment_settings(
+            prepared.url, {}, stream, None, None
+        )
+        return self._http.send(prepared, timeout=timeout, **send_kwargs)
+
+    def close(self):
+        self._http.close()
+
+
+class PreparedCall:  # pylint: disable=too-few-public-methods
+    """
+    A request encoded by Urllib3Transport.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The URL, with its query string.
+        headers (dict of str: str): The request headers.
+        body (bytes): The body, or None.
+    """
+
+    __slots__ = ("method", "url", "headers", "body")
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[bytes],
+    ):
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport sending requests straight through a urllib3 PoolManager.
+
+    Proxies set in the environment and redirects are not followed.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = settings.pool_size,
+        keep_alive: bool = settings.keep_alive,
+    ):
+        super().__init__(pool_size, keep_alive)
+        self.accept_encoding = urllib3_encodings()
+        self._pool = urllib3.PoolManager(
+            num_pools=pool_size, maxsize=pool_size
+        )
+        self._pool.pool_classes_by_scheme = dict(POOL_CLASSES)
+
+    def prepare(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> PreparedCall:
+        headers = dict(headers or {})
+        if not self.keep_alive:
+            headers["Connection"] = "close"
+        if params:
+            query = urlencode(
+                [
+                    (name, value)
+                    for name, value in params.items()
+                    if value is not None
+                ],
+                doseq=True,
+            )
+            if query:
+                url += ("&" if "?" in url else "?") + query
+        body = data
+        if json is not None:
+            body = dumps(json, allow_nan=False).encode()
+            headers.setdefault("Content-Type", "application/json")
+        return PreparedCall(method, url, headers, body)
+
+    def send(
+        self, prepared: PreparedCall, *, timeout=None, stream: bool = False
+    ) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            raw = self._pool.urlopen(
+                prepared.method,
+                prepared.url,
+                body=prepared.body,
+                headers=prepared.headers,
+                timeout=urllib3.Timeout(total=timeout),
+                retries=False,
+                redirect=False,
+                preload_content=not stream,
+                decode_content=True,
+            )
+        except urllib3.exceptions.NewConnectionError as ex:
+            # Checked first: urllib3 2 makes it a ConnectTimeoutError.
+            raise requests.ConnectionError(ex) from ex
+        except urllib3.exceptions.ConnectTimeoutError as ex:
+            raise requests.ConnectTimeout(ex) from ex
+        except urllib3.exceptions.TimeoutError as ex:
+            raise requests.ReadTimeout(ex) from ex
+        except urllib3.exceptions.HTTPError as ex:
+            raise requests.ConnectionError(ex) from ex
+        response = requests.Response()
+        response.status_code = raw.status
+        response.reason = raw.reason
+        response.headers = CaseInsensitiveDict(raw.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = prepared.url
+        response.raw = raw
+        response.request = prepared
+        response.elapsed = datetime.timedelta(
+            seconds=time.perf_counter() - start
+        )
+        if not stream:
+            response._content = raw.data  # pylint: disable=W0212
+        return response
+
+    def close(self):
+        self._pool.clear()
+
+
+TRANSPORTS = {
+    "requests": RequestsTransport,
+    "urllib3": Urllib3Transport,
+}
+
+
+def make_transport(transport, pool_size: int, keep_alive: bool) -> Transport:
+    """
+    Returns the transport of a session.
+
+    Args:
+        transport: A Transport, or the name of a shipped transport, one of
+            TRANSPORTS. If None, settings.transport.
+        pool_size (int): The maximum number of connections kept open per
+            host, for shipped transports.
+        keep_alive (bool): Whether connections are kept open between calls,
+            for shipped transports.
+
+    Raises:
+        ValueError: If the name of the transport is unknown.
+    """
+    if isinstance(transport, Transport):
+        return transport
+    name = transport or settings.transport
+    if name not in TRANSPORTS:
+        raise ValueError(
+            f"Unknown transport {name!r}, expected one of {tuple(TRANSPORTS)}"
+            " or a Transport."
+        )
+    return TRANSPORTS[name](pool_size=pool_size, keep_alive=keep_alive)
@@ -4,17 +4,21 @@ Utility scripts which do not strictly belong to any other module.
 
 import functools
 
+from pydantic.v1 import BaseModel
+
 from .errors import EmptyParametersException
 
 
 def check_empty_parameters(func):
     """
     Decorator for API request methods which checks if parameters are empty.
+
+    Parameters given as a model instance count as not empty.
     """
 
     @functools.wraps(func)
     def _check(ref, *args, **kwargs):
-        if not kwargs:
+        if not kwargs and not any(isinstance(a, BaseModel) for a in args):
             raise EmptyParametersException
         return func(ref, *args, **kwargs)
 
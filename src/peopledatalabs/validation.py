@@ -0,0 +1,179 @@
+"""
+Fast validation of API parameters.
+
+Parameters are validated with the pydantic model of each API. The fields
+of each model are planned once, so that validated parameters are turned
+back into a dict by visiting only the values held by the model, without
+the generic machinery of BaseModel.dict. Parameters can also be given as
+model instances, which are not validated again, or be trusted, in which
+case only unknown keys and None values are dropped.
+
+Validating an email address is by far the most expensive check, so the
+results of the last validated addresses are memoized.
+"""
+
+import functools
+from typing import NamedTuple, Optional, Type, Union
+
+from pydantic.v1 import BaseModel
+from pydantic.v1 import EmailStr as _EmailStr
+
+from .logger import get_logger
+from .settings import settings
+
+
+logger = get_logger("validation")
+
+
+@functools.lru_cache(maxsize=settings.email_cache_size)
+def _validate_email(value: str) -> str:
+    return _EmailStr.validate(value)
+
+
+class EmailStr(_EmailStr):
+    """
+    Email address type of pydantic, memoizing validated addresses.
+    """
+
+    @classmethod
+    def validate(cls, value: str) -> str:
+        return _validate_email(value)
+
+
+class FieldPlan(NamedTuple):
+    """
+    Precomputed description of the fields of a model.
+
+    Attributes:
+        names: The names and aliases of all the fields.
+        nested: The names of the fields holding models, or lists of models.
+        aliases: The key each field is sent as, for the fields whose
+            alias differs from their name, e.g. from_ sent as from.
+    """
+
+    names: frozenset
+    nested: frozenset
+    aliases: dict
+
+
+@functools.lru_cache(maxsize=None)
+def field_plan(model: Type[BaseModel]) -> FieldPlan:
+    """
+    Returns the field plan of a model, computed on first use.
+
+    Args:
+        model: The model class.
+    """
+    nested = frozenset(
+        name
+        for name, field in model.__fields__.items()
+        if isinstance(field.type_, type) and issubclass(field.type_, BaseModel)
+    )
+    aliases = {
+        name: field.alias
+        for name, field in model.__fields__.items()
+        if field.alias != name
+    }
+    return FieldPlan(
+        frozenset(model.__fields__) | frozenset(aliases.values()),
+        nested,
+        aliases,
+    )
+
+
+def _plain(value):
+    """
+    Converts the models held by a field value into dicts.
+    """
+    if isinstance(value, BaseModel):
+        return to_dict(value)
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def to_dict(instance: BaseModel) -> dict:
+    """
+    Converts a model instance into a dict of its non-None values, as
+    instance.dict(exclude_none=True, by_alias=True) does.
+
+    Args:
+        instance: The model instance.
+
+    Returns:
+        A new dict, with nested models converted too.
+    """
+    plan = field_plan(type(instance))
+    return {
+        plan.aliases.get(name, name): (
+            _plain(value) if name in plan.nested else value
+        )
+        for name, value in instance.__dict__.items()
+        if value is not None
+    }
+
+
+def merge_params(params: Optional[BaseModel], kwargs: dict):
+    """
+    Merges the parameters of a call given as a model instance and as keyword
+    arguments.
+
+    Args:
+        params: The model instance, if any.
+        kwargs (dict): The keyword arguments.
+
+    Returns:
+        The model instance, unless keyword arguments are given too: in that
+        case they override its values and are validated together.
+    """
+    if params is None:
+        return kwargs
+    if not kwargs:
+        return params
+    merged = to_dict(params)
+    aliases = field_plan(type(params)).aliases
+    for name in kwargs:
+        merged.pop(aliases.get(name), None)
+    merged.update(kwargs)
+    return merged
+
+
+def validate_params(
+    model: Type[BaseModel],
+    params: Union[dict, BaseModel],
+    trusted: bool = False,
+) -> dict:
+    """
+    Validates the parameters of an API call.
+
+    Args:
+        model: The model of the API.
+        params: The parameters, either as a dict or as an instance of the
+            model, which is considered already validated.
+        trusted (:obj:`bool`, optional): Whether a dict of parameters is
+            sent without validation, only dropping unknown keys and None
+            values.
+
+    Returns:
+        A new dict with the parameters to send.
+
+    Raises:
+        TypeError: If params is an instance of another model.
+        pydantic.v1.ValidationError: If the parameters are invalid.
+    """
+    if isinstance(params, BaseModel):
+        if not isinstance(params, model):
+            raise TypeError(
+                f"Expected {model.__name__}, got {type(params).__name__}."
+            )
+        return to_dict(params)
+    if trusted:
+        plan = field_plan(model)
+        return {
+            plan.aliases.get(name, name): (
+                _plain(value) if name in plan.nested else value
+            )
+            for name, value in params.items()
+            if name in plan.names and value is not None
+        }
+    return to_dict(model(**params))
@@ -0,0 +1,141 @@
+"""
+All tests related to the asyncio client.
+"""
+
+import asyncio
+import logging
+
+import pytest
+from pydantic.v1 import ValidationError
+
+from peopledatalabs import AsyncPDLPY
+from peopledatalabs.errors import EmptyParametersException
+from peopledatalabs.main import Person
+
+
+httpx = pytest.importorskip("httpx")
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.async")
+
+
+def test_init_no_api_key_raises_validation_error():
+    """
+    Tests that instantiating the async client without an api key raises a
+    ValidationError.
+    """
+    with pytest.raises(ValidationError):
+        AsyncPDLPY()
+
+
+@pytest.mark.usefixtures("fake_api_key")
+def test_init_async_person(fake_api_key):
+    """
+    Tests the async client exposes the same sections as PDLPY.
+    """
+
+    async def run():
+        async with AsyncPDLPY(api_key=fake_api_key) as client:
+            assert isinstance(client.person, Person)
+            with pytest.raises(EmptyParametersException):
+                client.person.enrichment()
+
+    asyncio.run(run())
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_async_calls_every_api(mock_api, fake_api_key):
+    """
+    Tests every API of the async client is awaitable and shares one pool.
+    """
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=fake_api_key, base_path=mock_api.base_path
+        ) as client:
+            return await asyncio.gather(
+                client.person.enrichment(email="test@example.com"),
+                client.person.identify(email="test@example.com"),
+                client.person.retrieve("qEnOZ5Oh0poWnQ1luFBfVw_0000"),
+                client.person.search(sql="SELECT * FROM person;"),
+                client.person.bulk(
+                    requests=[{"params": {"profile": ["linkedin.com/in/x"]}}]
+                ),
+                client.person.changelog(
+                    origin_version="31.2",
+                    current_version="32.0",
+                    type="updated",
+                ),
+                client.company.enrichment(website="peopledatalabs.com"),
+                client.company.bulk(
+                    requests=[{"params": {"website": "peopledatalabs.com"}}]
+                ),
+                client.company.search(sql="SELECT * FROM company;"),
+                client.company.cleaner(website="peopledatalabs.com"),
+                client.location.cleaner(location="portland"),
+                client.school.cleaner(name="MIT"),
+                client.autocomplete(field="title", text="data"),
+                client.job_title(job_title="data scientist"),
+                client.ip(ip="72.212.42.169"),
+            )
+
+    responses = asyncio.run(run())
+    assert all(isinstance(r, httpx.Response) for r in responses)
+    assert all(r.status_code == 200 for r in responses)
+    assert len(mock_api.calls) == 15
+    calls = {call.path: call for call in mock_api.calls}
+    assert calls["/v5/person/enrich"].query["email"] == "test@example.com"
+    assert calls["/v5/person/bulk"].headers["x-api-key"] == fake_api_key
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_async_iter_bulk(mock_api, fake_api_key):
+    """
+    Tests iter_bulk of the async client is an async iterator.
+    """
+    mock_api.routes["/v5/person/bulk"] = lambda call: (
+        200,
+        {},
+        [
+            {"status": 200, "metadata": request["metadata"]}
+            for request in call.json()["requests"]
+        ],
+    )
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=fake_api_key, base_path=mock_api.base_path
+        ) as client:
+            requests_ = (
+                {"metadata": {"row": i}, "params": {"name": f"name {i}"}}
+                for i in range(30)
+            )
+            return [
+                result["metadata"]["row"]
+                async for result in client.person.iter_bulk(
+                    requests_, batch_size=7
+                )
+            ]
+
+    assert asyncio.run(run()) == list(range(30))
+    assert len(mock_api.calls) == 5
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key", "scroll_pages")
+def test_async_iter_search(mock_api, fake_api_key, scroll_pages):
+    """
+    Tests iter_search of the async client is an async iterator.
+    """
+    records = [{"id": str(i)} for i in range(25)]
+    mock_api.routes["/v5/person/search"] = scroll_pages(records)
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=fake_api_key, base_path=mock_api.base_path
+        ) as client:
+            iterator = client.person.iter_search(
+                sql="SELECT * FROM person;", size=10
+            )
+            return [record async for record in iterator]
+
+    assert asyncio.run(run()) == records
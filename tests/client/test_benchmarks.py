@@ -0,0 +1,135 @@
+"""
+Smoke tests of the benchmark suite, against its local mock API.
+"""
+
+import json
+import logging
+from pathlib import Path
+import subprocess
+import sys
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.benchmarks")
+
+BENCHMARKS = Path(__file__).parents[2] / "benchmarks"
+
+
+def test_throughput_benchmark_runs_every_scenario():
+    """
+    Tests the throughput benchmark drives every scenario through the mock API,
+    retrying injected failures.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            str(BENCHMARKS / "throughput.py"),
+            "--calls=20",
+            "--concurrency=1,4",
+            "--payload=256",
+            "--errors=0.1",
+            "--json",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=120,
+    ).stdout
+    rows = [json.loads(line) for line in output.splitlines()]
+    assert {row["scenario"] for row in rows} == {
+        "enrich",
+        "company_enrich",
+        "bulk",
+        "search",
+        "clean",
+        "autocomplete",
+        "ip",
+    }
+    for row in rows:
+        assert row["calls"] == 20
+        assert row["failed"] <= 1
+        assert row["p50_ms"] <= row["p99_ms"]
+
+
+def test_transport_benchmark_runs_every_transport():
+    """
+    Tests the transport benchmark measures every shipped transport.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            str(BENCHMARKS / "transport.py"),
+            "--calls=20",
+            "--payload=256",
+            "--json",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=120,
+    ).stdout
+    rows = [json.loads(line) for line in output.splitlines()]
+    assert {(row["transport"], row["scenario"]) for row in rows} == {
+        ("requests", "enrich"),
+        ("requests", "search"),
+        ("urllib3", "enrich"),
+        ("urllib3", "search"),
+    }
+    for row in rows:
+        assert row["cpu_us_per_call"] > 0
+        assert row["p50_us"] <= row["p99_us"]
+
+
+def test_overhead_benchmark_runs_every_scenario():
+    """
+    Tests the overhead benchmark measures every scenario, validated and
+    trusted.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            str(BENCHMARKS / "overhead.py"),
+            "--calls=50",
+            "--json",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=120,
+    ).stdout
+    rows = [json.loads(line) for line in output.splitlines()]
+    assert len(rows) == 12
+    assert {row["trusted"] for row in rows} == {False, True}
+    for row in rows:
+        assert row["us_per_call"] > 0
+
+
+def test_compression_benchmark_runs_every_encoding():
+    """
+    Tests the compression benchmark measures every scenario, with and without
+    compressed request bodies, and compressed bodies are smaller.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            str(BENCHMARKS / "compression.py"),
+            "--calls=2",
+            "--encodings=identity,gzip",
+            "--bandwidth-mbps=0",
+            "--latency-ms=0",
+            "--json",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=120,
+    ).stdout
+    rows = {
+        (row["response_encoding"], row["scenario"], row["compress"]): row
+        for row in map(json.loads, output.splitlines())
+    }
+    assert len(rows) == 12
+    plain = rows["identity", "person_bulk", False]
+    compressed = rows["gzip", "person_bulk", True]
+    assert compressed["request_bytes"] < plain["request_bytes"]
+    assert compressed["response_bytes"] < plain["response_bytes"]
@@ -0,0 +1,114 @@
+"""
+All tests related to the in-memory response cache.
+"""
+
+import logging
+import time
+
+import pytest
+
+from peopledatalabs import MemoryCache
+from peopledatalabs.cache import BaseCache, cache_key
+from peopledatalabs.main import PDLPY
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.cache")
+
+
+@pytest.fixture(name="cached_client")
+def fixture_cached_client(mock_api, fake_api_key):
+    """
+    Client instance calling the mock API through a MemoryCache.
+    """
+    with PDLPY(
+        api_key=fake_api_key,
+        base_path=mock_api.base_path,
+        cache=MemoryCache(maxsize=100),
+    ) as client:
+        yield client
+
+
+def test_cache_key_is_canonical():
+    """
+    Tests keys ignore the API key and the order of parameters.
+    """
+    url = "https://api.peopledatalabs.com/v5/person/enrich"
+    assert cache_key(
+        url, {"email": "a@b.com", "pretty": True, "api_key": "x"}
+    ) == cache_key(url, {"pretty": True, "email": "a@b.com"})
+    assert cache_key(url, {"email": "a@b.com"}) != cache_key(
+        url.replace("person", "company"), {"email": "a@b.com"}
+    )
+
+
+def test_incomplete_cache_rejected():
+    """
+    Tests caches missing a method of BaseCache cannot be instantiated.
+    """
+
+    class GetOnlyCache(BaseCache):  # pylint: disable=abstract-method
+        """
+        Cache without set.
+        """
+
+        def get(self, key):
+            return None
+
+        def __len__(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        GetOnlyCache()  # pylint: disable=abstract-class-instantiated
+
+
+def test_memory_cache_lru_and_ttl():
+    """
+    Tests least recently used entries are evicted first and entries expire.
+    """
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("d") is None
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 2,
+        "hit_ratio": 0.5,
+        "size": 1,
+    }
+
+
+@pytest.mark.usefixtures("cached_client", "mock_api")
+def test_identical_calls_served_from_cache(cached_client, mock_api):
+    """
+    Tests repeated enrichment and cleaner calls reach the API once.
+    """
+    for _ in range(3):
+        cached_client.person.enrichment(email="test@example.com", pretty=True)
+        cached_client.person.enrichment(pretty=True, email="test@example.com")
+        cached_client.company.cleaner(website="peopledatalabs.com")
+        cached_client.job_title(job_title="data scientist")
+    assert len(mock_api.calls) == 3
+    assert cached_client.cache.stats()["hits"] == 9
+
+
+@pytest.mark.usefixtures("cached_client", "mock_api")
+def test_uncacheable_calls_not_cached(cached_client, mock_api):
+    """
+    Tests searches and failed calls are always sent.
+    """
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        404,
+        {},
+        {"status": 404},
+    )
+    for _ in range(2):
+        cached_client.person.search(sql="SELECT * FROM person;")
+        cached_client.person.enrichment(email="test@example.com")
+    assert len(mock_api.calls) == 4
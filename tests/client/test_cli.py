@@ -0,0 +1,185 @@
+"""
+All tests related to the `pdl` command line tool.
+"""
+
+import csv
+import json
+import logging
+
+import pytest
+
+from peopledatalabs.cli import main, read_rows
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.cli")
+
+
+def bulk_route(call):
+    """
+    Mock bulk route, matching every email except those of example.org.
+    """
+    return (
+        200,
+        {},
+        [
+            {
+                "status": (
+                    404
+                    if request["params"]["email"].endswith("@example.org")
+                    else 200
+                ),
+                "metadata": request["metadata"],
+            }
+            for request in call.json()["requests"]
+        ],
+    )
+
+
+@pytest.fixture(name="people_csv")
+def fixture_people_csv(tmp_path):
+    """
+    Writes a CSV of 10 people, the 4th having an invalid email.
+    """
+    path = tmp_path / "people.csv"
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Email Address", "name", "crm_id"])
+        for row in range(10):
+            domain = "example.org" if row % 5 == 0 else "example.com"
+            email = "not an email" if row == 3 else f"p{row}@{domain}"
+            writer.writerow([email, f"person {row}", f"crm-{row}"])
+    return path
+
+
+def run(mock_api, fake_api_key, *args):
+    """
+    Runs `pdl bulk person` against the mock API.
+    """
+    mock_api.routes["/v5/person/bulk"] = bulk_route
+    return main(
+        [
+            "bulk",
+            "person",
+            *map(str, args),
+            "--map",
+            "Email Address=email",
+            "--metadata",
+            "crm_id",
+            "--batch-size",
+            "3",
+            "--workers",
+            "2",
+            "--api-key",
+            fake_api_key,
+            "--base-path",
+            mock_api.base_path,
+        ]
+    )
+
+
+def read_results(path):
+    """
+    Reads the JSONL output of a run.
+    """
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key", "people_csv")
+def test_bulk_enriches_csv(
+    mock_api, fake_api_key, people_csv, tmp_path, capsys
+):
+    """
+    Tests every row gets a result, in order, and invalid rows are not sent.
+    """
+    output = tmp_path / "out.jsonl"
+    assert run(mock_api, fake_api_key, people_csv, output) == 0
+    results = read_results(output)
+    assert [result["metadata"]["row"] for result in results] == list(range(10))
+    assert results[2]["metadata"]["crm_id"] == "crm-2"
+    assert [result["status"] for result in results] == [
+        404, 200, 200, 400, 200, 404, 200, 200, 200, 200
+    ]  # fmt: skip
+    sent = {
+        request["metadata"]["row"]: request["params"]
+        for call in mock_api.calls
+        for request in call.json()["requests"]
+    }
+    assert sorted(sent) == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    assert sent[0] == {"email": "p0@example.org", "name": "person 0"}
+    stats = capsys.readouterr().err
+    assert "rows=10 sent=9 matched=7 not_found=2 failed=0 invalid=1" in stats
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key", "people_csv")
+def test_bulk_resumes_from_checkpoint(
+    mock_api, fake_api_key, people_csv, tmp_path
+):
+    """
+    Tests an interrupted run resumes after its last checkpoint, dropping the
+    results written after it and sending only the remaining rows.
+    """
+    output = tmp_path / "out.jsonl"
+    run(mock_api, fake_api_key, people_csv, output)
+    expected = output.read_bytes()
+    lines = expected.splitlines(keepends=True)
+    checkpoint = tmp_path / "out.jsonl.checkpoint"
+    state = json.loads(checkpoint.read_text())
+    assert state["rows"] == 10
+    state["rows"] = 6
+    state["offset"] = sum(len(line) for line in lines[:6])
+    state["stats"] = {
+        "rows": 6,
+        "sent": 5,
+        "matched": 3,
+        "not_found": 2,
+        "failed": 0,
+        "invalid": 1,
+    }
+    checkpoint.write_text(json.dumps(state))
+    with open(output, "ab") as file:
+        file.write(lines[6] + b'{"partial')
+    mock_api.calls.clear()
+    assert run(mock_api, fake_api_key, people_csv, output) == 0
+    assert output.read_bytes() == expected
+    sent = [
+        request["metadata"]["row"]
+        for call in mock_api.calls
+        for request in call.json()["requests"]
+    ]
+    assert sorted(sent) == [6, 7, 8, 9]
+    assert json.loads(checkpoint.read_text())["stats"]["matched"] == 7
+
+
+def test_read_rows_jsonl(tmp_path):
+    """
+    Tests JSONL inputs are read line by line, skipping blank lines.
+    """
+    path = tmp_path / "companies.jsonl"
+    path.write_text('{"website": "a.com"}\n\n{"website": "b.com"}\n')
+    assert list(read_rows(str(path))) == [
+        {"website": "a.com"},
+        {"website": "b.com"},
+    ]
+
+
+def test_bulk_rejects_invalid_arguments(tmp_path, capsys):
+    """
+    Tests invalid arguments exit with status 2.
+    """
+    with pytest.raises(SystemExit) as info:
+        main(
+            [
+                "bulk",
+                "company",
+                str(tmp_path / "in.csv"),
+                str(tmp_path / "out.jsonl"),
+                "--batch-size",
+                "101",
+                "--api-key",
+                "key",
+            ]
+        )
+    assert info.value.code == 2
+    assert "--batch-size" in capsys.readouterr().err
@@ -0,0 +1,147 @@
+"""
+All tests related to the compression of request and response bodies.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+
+import pytest
+
+from peopledatalabs import AsyncPDLPY, PDLPY
+from peopledatalabs.compression import (
+    accept_encoding,
+    encode_body,
+    httpx_encodings,
+    urllib3_encodings,
+)
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.compression")
+
+BULK = [
+    {
+        "params": {
+            "email": f"person{i}@example.com",
+            "name": f"Person {i}",
+            "company": "peopledatalabs.com",
+            "location": "San Francisco, California",
+        }
+    }
+    for i in range(100)
+]
+
+
+def _body(call) -> dict:
+    """
+    Decodes the JSON body of a mock API call, gunzipping it if needed.
+    """
+    body = call.body
+    if call.headers.get("content-encoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+@pytest.mark.parametrize("transport", ("requests", "urllib3"))
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_large_bodies_gzipped(mock_api, fake_api_key, transport):
+    """
+    Tests large POST bodies are gzipped when asked, and small ones are sent as
+    is.
+    """
+    events = []
+    with PDLPY(
+        api_key=fake_api_key,
+        base_path=mock_api.base_path,
+        transport=transport,
+        compress=True,
+    ) as client:
+        client.on("request_end", events.append)
+        client.person.bulk(requests=BULK)
+        client.person.search(sql="SELECT * FROM person;", size=5)
+    bulk, search = mock_api.calls
+    assert bulk.headers["content-encoding"] == "gzip"
+    assert bulk.headers["content-type"] == "application/json"
+    assert bulk.headers["x-api-key"] == fake_api_key
+    assert _body(bulk) == {"requests": BULK}
+    assert events[0].request_bytes == len(bulk.body)
+    assert len(bulk.body) * 4 < len(json.dumps({"requests": BULK}))
+    assert "content-encoding" not in search.headers
+    assert _body(search) == {"sql": "SELECT * FROM person;", "size": 5}
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_bodies_not_gzipped_by_default(mock_api, fake_api_key):
+    """
+    Tests bodies are sent uncompressed unless asked.
+    """
+    with PDLPY(api_key=fake_api_key, base_path=mock_api.base_path) as client:
+        client.person.bulk(requests=BULK)
+    (bulk,) = mock_api.calls
+    assert "content-encoding" not in bulk.headers
+    assert json.loads(bulk.body) == {"requests": BULK}
+
+
+def test_encode_body():
+    """
+    Tests bodies are serialized once, and gzipped from the threshold.
+    """
+    kwargs = {"json": {"sql": "SELECT 1;"}, "headers": {"A": "b"}}
+    small = encode_body(kwargs, min_bytes=100)
+    assert small == {"data": b'{"sql": "SELECT 1;"}', "headers": {"A": "b"}}
+    large = encode_body(kwargs, field="content", min_bytes=10)
+    assert gzip.decompress(large["content"]) == small["data"]
+    assert large["headers"] == {"A": "b", "Content-Encoding": "gzip"}
+    assert kwargs["headers"] == {"A": "b"}
+    assert encode_body({"params": {}}) == {"params": {}}
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_stronger_response_encodings(mock_api, fake_api_key):
+    """
+    Tests the client asks for the strongest encodings it can decode, and
+    decodes responses in them.
+    """
+    assert accept_encoding(["gzip", "deflate", "zstd"]) == "zstd, gzip"
+    assert accept_encoding([]) == "gzip"
+    zstd = pytest.importorskip("backports.zstd")
+    body = json.dumps({"status": 200, "data": {"id": "x"}}).encode()
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        200,
+        {"Content-Encoding": "zstd"},
+        zstd.compress(body),
+    )
+    for transport in ("requests", "urllib3"):
+        with PDLPY(
+            api_key=fake_api_key,
+            base_path=mock_api.base_path,
+            transport=transport,
+        ) as client:
+            response = client.person.enrichment(email="a@example.com")
+        assert response.json() == {"status": 200, "data": {"id": "x"}}
+    assert mock_api.calls[0].headers["accept-encoding"] == (
+        urllib3_encodings()
+    )
+    assert urllib3_encodings().startswith("zstd")
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_async_bodies_gzipped(mock_api, fake_api_key):
+    """
+    Tests the asyncio client gzips large bodies alike.
+    """
+    httpx = pytest.importorskip("httpx")
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=fake_api_key, base_path=mock_api.base_path, compress=True
+        ) as client:
+            await client.person.bulk(requests=BULK)
+
+    asyncio.run(run())
+    (bulk,) = mock_api.calls
+    assert bulk.headers["content-encoding"] == "gzip"
+    assert _body(bulk) == {"requests": BULK}
+    assert bulk.headers["accept-encoding"] == httpx_encodings(httpx)
@@ -0,0 +1,112 @@
+"""
+All tests related to sharing clients across threads.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+import pytest
+
+from peopledatalabs import Metrics, PDLPY
+from peopledatalabs.endpoints import headers
+from peopledatalabs.routes import HEADERS
+from peopledatalabs.settings import settings
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.concurrency")
+
+THREADS = 16
+CALLS = 40
+
+
+def _echo(call):
+    """
+    Mock API route answering with the API key and email of the call.
+    """
+    if call.method == "POST":
+        key, email = call.headers.get("x-api-key"), call.json()["sql"]
+    else:
+        key, email = call.query.get("api_key"), call.query.get("email")
+    return 200, {}, {"status": 200, "key": key, "email": email}
+
+
+def _work(clients, thread):
+    """
+    Alternates GET and POST calls of every client from one thread, and returns
+    the mismatches between what was sent and what was received.
+    """
+    mismatches = []
+    for i in range(CALLS):
+        client = clients[(thread + i) % len(clients)]
+        email = f"t{thread}-{i}@example.com"
+        if i % 2:
+            response = client.person.search(sql=email, size=1)
+        else:
+            response = client.person.enrichment(email=email)
+        body = response.json()
+        if (body["key"], body["email"]) != (client.api_key, email):
+            mismatches.append((client.api_key, email, body))
+    return mismatches
+
+
+@pytest.mark.parametrize("transport", ("requests", "urllib3"))
+@pytest.mark.usefixtures("mock_api")
+def test_clients_shared_across_threads(mock_api, transport):
+    """
+    Tests clients holding different API keys can be shared by many threads,
+    each call carrying its own key and parameters, without altering the headers
+    and settings shared by every client.
+    """
+    mock_api.routes["/v5/person/enrich"] = _echo
+    mock_api.routes["/v5/person/search"] = _echo
+    metrics = Metrics()
+    level = logging.getLogger("PeopleDataLabs").level
+    clients = [
+        PDLPY(
+            api_key=f"key-{n}",
+            base_path=mock_api.base_path,
+            transport=transport,
+            metrics=metrics,
+            log_level="WARNING",
+        )
+        for n in range(3)
+    ]
+    try:
+        with ThreadPoolExecutor(THREADS) as pool:
+            results = list(
+                pool.map(lambda t: _work(clients, t), range(THREADS))
+            )
+    finally:
+        for client in clients:
+            client.close()
+        logging.getLogger("PeopleDataLabs").setLevel(level)
+    assert [mismatch for result in results for mismatch in result] == []
+    assert len(mock_api.calls) == THREADS * CALLS
+    calls = metrics.snapshot()["calls"]
+    assert calls["person/enrich"][200] == THREADS * CALLS // 2
+    assert calls["person/search"][200] == THREADS * CALLS // 2
+    assert "X-api-key" not in HEADERS
+    assert settings.log_level is None
+    assert headers is HEADERS
+    with pytest.raises(TypeError):
+        # pylint: disable-next=protected-access
+        clients[0]._routes.headers["X-api-key"] = "key"
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_default_headers_changed(mock_api, fake_api_key, monkeypatch):
+    """
+    Tests changes to the default headers apply to the clients built after them,
+    and not to the clients already built.
+    """
+    before = PDLPY(api_key=fake_api_key, base_path=mock_api.base_path)
+    monkeypatch.setitem(headers, "User-Agent", "pipeline")
+    after = PDLPY(api_key=fake_api_key, base_path=mock_api.base_path)
+    for client in (before, after):
+        with client:
+            client.person.enrichment(email="sean@peopledatalabs.com")
+    assert [call.headers["user-agent"] for call in mock_api.calls] == [
+        "PDL-PYTHON-SDK",
+        "pipeline",
+    ]
@@ -0,0 +1,135 @@
+"""
+All tests related to the SQLite response cache.
+"""
+
+import logging
+import multiprocessing
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from peopledatalabs import SQLiteCache
+from peopledatalabs.main import PDLPY
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.disk_cache")
+
+
+def _response(body: bytes):
+    return SimpleNamespace(
+        status_code=200,
+        headers={"Content-Type": "application/json", "Content-Length": "2"},
+        content=body,
+        url="http://localhost/v5/person/enrich",
+    )
+
+
+def test_sqlite_cache_round_trip(tmp_path):
+    """
+    Tests responses are restored with their body, status and headers.
+    """
+    cache = SQLiteCache(tmp_path / "cache.db")
+    cache.set("a", _response(b'{"status": 200}' * 100), ttl=60)
+    cached = cache.get("a")
+    assert cached.status_code == 200
+    assert cached.content == b'{"status": 200}' * 100
+    assert cached.headers == {"Content-Type": "application/json"}
+    assert cache.get("b") is None
+    assert len(cache) == 1
+
+
+def test_sqlite_cache_shared_between_instances(tmp_path):
+    """
+    Tests entries written by one instance are seen by another one on the same
+    file, as with separate processes.
+    """
+    path = tmp_path / "cache.db"
+    SQLiteCache(path).set("a", _response(b"{}"), ttl=60)
+    assert SQLiteCache(path).get("a").content == b"{}"
+
+
+def _use_forked(cache, queue):
+    """
+    Reads and writes a cache from a forked process, reporting the outcome.
+    """
+    # pylint: disable=protected-access
+    try:
+        inherited = cache._local.connection
+        parent = cache.get("parent").content
+        cache.set("child", _response(b"child"), ttl=60)
+        queue.put((parent, cache._local.connection is not inherited))
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        queue.put(error)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs fork")
+def test_sqlite_cache_after_fork(tmp_path):
+    """
+    Tests a process forked after the cache was used opens its own connection,
+    and reads and writes the shared database.
+    """
+    cache = SQLiteCache(tmp_path / "cache.db")
+    cache.set("parent", _response(b"parent"), ttl=60)
+    # pylint: disable=protected-access
+    connection = cache._local.connection
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_use_forked, args=(cache, queue))
+    process.start()
+    result = queue.get(timeout=30)
+    process.join(timeout=30)
+    assert result == (b"parent", True)
+    assert process.exitcode == 0
+    assert cache._local.connection is connection
+    assert cache.get("child").content == b"child"
+
+
+def test_sqlite_cache_eviction(tmp_path):
+    """
+    Tests expired entries, then the entries closest to expiry, are evicted.
+    """
+    cache = SQLiteCache(tmp_path / "cache.db", max_bytes=100)
+    cache.set("expired", _response(b"x"), ttl=-1)
+    for index in range(10):
+        cache.set(str(index), _response(bytes(range(50))), ttl=60 + index)
+    cache.evict()
+    assert cache.get("expired") is None
+    assert cache.get("0") is None
+    assert cache.get("9") is not None
+    assert len(cache) == 1
+
+
+def test_sqlite_cache_warm_from_snapshot(tmp_path):
+    """
+    Tests a cache can be warmed from the snapshot of another one.
+    """
+    hot = SQLiteCache(tmp_path / "hot.db")
+    hot.set("a", _response(b"{}"), ttl=60)
+    hot.set("b", _response(b"{}"), ttl=-1)
+    hot.snapshot(str(tmp_path / "snapshot.db"))
+    cold = SQLiteCache(tmp_path / "cold.db")
+    assert cold.warm(tmp_path / "snapshot.db") == 1
+    assert cold.get("a").content == b"{}"
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_disk_cached_calls(mock_api, fake_api_key, tmp_path):
+    """
+    Tests cached calls are answered from disk across clients, and that retrieve
+    calls for different ids do not collide.
+    """
+    for _ in range(2):
+        with PDLPY(
+            api_key=fake_api_key,
+            base_path=mock_api.base_path,
+            cache=SQLiteCache(tmp_path / "cache.db"),
+        ) as client:
+            response = client.person.enrichment(email="test@example.com")
+            assert response.json()["status"] == 200
+            assert client.person.retrieve(person_id="a").status_code == 200
+            assert client.person.retrieve(person_id="b").status_code == 200
+            client.person.identify(email="test@example.com")
+    assert len(mock_api.calls) == 4
+    assert client.cache.stats()["hits"] == 4
@@ -0,0 +1,202 @@
+"""
+All tests related to the instrumentation hooks.
+"""
+
+import asyncio
+import json
+import logging
+
+import pytest
+
+from peopledatalabs import AsyncPDLPY, MemoryCache, PDLPY
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.hooks")
+
+HEADERS = {
+    "x-ratelimit-limit": "{'minute': 100}",
+    "x-ratelimit-remaining": "{'minute': 99}",
+    "x-call-credits-spent": "1",
+    "x-call-credits-type": "enrich",
+    "x-totallimit-remaining": "4999",
+}
+
+BODY = {"status": 200, "likelihood": 9, "data": {"full_name": "sean"}}
+
+
+def enrich_route(call):  # pylint: disable=unused-argument
+    """
+    Mock person/enrich route sending rate-limit and credit headers.
+    """
+    return 200, HEADERS, BODY
+
+
+def record(client, *events):
+    """
+    Registers a callback collecting the given events of a client.
+    """
+    recorded = []
+    for event in events:
+        client.on(event, recorded.append)
+    return recorded
+
+
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_request_events(mock_api, mock_client: PDLPY):
+    """
+    Tests the start and end of each call are notified with its timings, sizes,
+    status, rate limit and credits.
+    """
+    mock_api.routes["/v5/person/enrich"] = enrich_route
+    events = record(mock_client, "request_start", "request_end")
+    for _ in range(2):
+        mock_client.person.enrichment(email="sean@peopledatalabs.com")
+    assert [event.name for event in events] == [
+        "request_start",
+        "request_end",
+    ] * 2
+    first, second = events[1], events[3]
+    assert first.route == "person/enrich"
+    assert first.method == "GET"
+    assert first.status == 200
+    assert first.rate_limit == (100, 99, 60)
+    assert first.credits == {
+        "call_credits_spent": 1,
+        "call_credits_type": "enrich",
+        "totallimit_remaining": 4999,
+    }
+    assert first.response_bytes == len(json.dumps(BODY))
+    assert first.request_bytes == 0
+    assert first.connect > 0
+    assert second.connect == 0.0
+    assert 0 < first.ttfb <= first.duration
+    assert not first.cached
+
+
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_request_bytes_of_posts(mock_api, mock_client: PDLPY):
+    """
+    Tests the size of the body of POST calls is reported.
+    """
+    events = record(mock_client, "request_end")
+    mock_client.person.search(sql="SELECT * FROM person;")
+    assert len(events) == 1
+    event = events[0]
+    assert event.method == "POST"
+    assert event.request_bytes == len(mock_api.calls[0].body)
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_retry_events(mock_api, fake_api_key):
+    """
+    Tests each retry is notified with the failed status and the delay.
+    """
+    statuses = iter([503, 429, 200])
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        next(statuses),
+        {"Retry-After": "0"},
+        {},
+    )
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, retry_backoff=0
+    ) as client:
+        events = record(client, "retry", "request_end")
+        client.person.enrichment(email="sean@peopledatalabs.com")
+    assert [(event.name, event.status, event.attempt) for event in events] == [
+        ("retry", 503, 0),
+        ("retry", 429, 1),
+        ("request_end", 200, None),
+    ]
+    assert events[0].delay == 0
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_cache_hit_events(mock_api, fake_api_key):
+    """
+    Tests calls served from the cache are notified.
+    """
+    mock_api.routes["/v5/person/enrich"] = enrich_route
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, cache=MemoryCache()
+    ) as client:
+        events = record(client, "cache_hit", "request_end")
+        for _ in range(2):
+            client.person.enrichment(email="sean@peopledatalabs.com")
+    assert [(event.name, event.cached) for event in events] == [
+        ("request_end", False),
+        ("cache_hit", True),
+        ("request_end", True),
+    ]
+    assert events[2].status == 200
+    assert events[2].connect is None
+
+
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_validation_events(mock_client: PDLPY):
+    """
+    Tests the validation of parameters is timed.
+    """
+    events = []
+
+    @mock_client.on("validation")
+    def on_validation(event):
+        events.append(event)
+
+    mock_client.person.enrichment(email="sean@peopledatalabs.com")
+    mock_client.hooks.off("validation", on_validation)
+    mock_client.person.enrichment(email="sean@peopledatalabs.com")
+    assert len(events) == 1
+    event = events[0]
+    assert event.route == "person/enrich"
+    assert event.duration > 0
+
+
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_failing_hooks_are_ignored(mock_client: PDLPY, caplog):
+    """
+    Tests an exception raised by a hook does not fail the call.
+    """
+
+    def fail(event):
+        raise RuntimeError(event.name)
+
+    mock_client.on("request_end", fail)
+    response = mock_client.person.enrichment(email="sean@peopledatalabs.com")
+    assert response.status_code == 200
+    assert "Hook" in caplog.text
+
+
+@pytest.mark.usefixtures("mock_client")
+def test_unknown_event_raises_value_error(mock_client: PDLPY):
+    """
+    Tests registering a callback for an unknown event fails.
+    """
+    with pytest.raises(ValueError):
+        mock_client.on("request_middle", print)
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_async_request_events(mock_api, fake_api_key):
+    """
+    Tests the asyncio client notifies the timings traced by httpx.
+    """
+    pytest.importorskip("httpx")
+    mock_api.routes["/v5/person/enrich"] = enrich_route
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=fake_api_key, base_path=mock_api.base_path
+        ) as client:
+            events = record(client, "request_end")
+            for _ in range(2):
+                await client.person.enrichment(email="sean@peopledatalabs.com")
+            return events
+
+    first, second = asyncio.run(run())
+    assert first.status == 200
+    assert first.credits["totallimit_remaining"] == 4999
+    assert first.connect > 0
+    assert second.connect == 0.0
+    assert 0 < first.ttfb <= first.duration
+    assert first.response_bytes == len(json.dumps(BODY))
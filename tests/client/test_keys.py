@@ -0,0 +1,224 @@
+"""
+All tests related to pooling several API keys in one client.
+"""
+
+import asyncio
+import collections
+import logging
+import time
+
+import pytest
+from pydantic.v1 import ValidationError
+
+from peopledatalabs import AsyncPDLPY, PDLPY
+from peopledatalabs.keys import mask
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.keys")
+
+KEYS = ["key-a", "key-b", "key-c"]
+
+
+def _key(call) -> str:
+    """
+    Returns the API key a mock API call was sent with.
+    """
+    return call.headers.get("x-api-key") or call.query.get("api_key")
+
+
+def _keys_used(mock_api) -> collections.Counter:
+    """
+    Counts the calls received by the mock API per key.
+    """
+    return collections.Counter(_key(call) for call in mock_api.calls)
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_keys_take_turns(mock_api):
+    """
+    Tests keys with the same headroom take turns, on GET and POST calls.
+    """
+    with PDLPY(api_key=KEYS, base_path=mock_api.base_path) as client:
+        assert client.api_key == "key-a"
+        assert len(client.keys) == 3
+        for i in range(6):
+            client.person.enrichment(email=f"p{i}@example.com")
+            client.person.search(sql=f"SELECT {i};", size=1)
+    assert _keys_used(mock_api) == {"key-a": 4, "key-b": 4, "key-c": 4}
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_keys_balanced_on_headroom(mock_api):
+    """
+    Tests calls go to the key with the most rate limit headroom left.
+    """
+    remaining = {"key-a": 5, "key-b": 80, "key-c": 40}
+
+    def route(call):
+        return (
+            200,
+            {
+                "x-ratelimit-limit": "{'minute': 100}",
+                "x-ratelimit-remaining": (
+                    f"{{'minute': {remaining[_key(call)]}}}"
+                ),
+            },
+            {"status": 200, "data": {}},
+        )
+
+    mock_api.routes["/v5/person/enrich"] = route
+    with PDLPY(api_key=KEYS, base_path=mock_api.base_path) as client:
+        for i in range(10):
+            client.person.enrichment(email=f"p{i}@example.com")
+        headroom = {
+            key["key"]: key["headroom"]["person/enrich"]
+            for key in client.keys.snapshot()
+        }
+    assert _keys_used(mock_api) == {"key-a": 1, "key-b": 8, "key-c": 1}
+    assert (
+        headroom[mask("key-a")]
+        < headroom[mask("key-c")]
+        < headroom[mask("key-b")]
+    )
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_exhausted_keys_sidelined(mock_api):
+    """
+    Tests calls failed because of their key are sent again at once with another
+    key, and keys out of credits or rate limited are skipped.
+    """
+
+    def route(call):
+        key = _key(call)
+        if key == "key-a":
+            return 402, {}, {"status": 402, "error": {}}
+        if key == "key-b":
+            return 429, {"Retry-After": "30"}, {"status": 429, "error": {}}
+        return (
+            200,
+            {"x-totallimit-remaining": "1000"},
+            {"status": 200, "data": {}},
+        )
+
+    mock_api.routes["/v5/person/enrich"] = route
+    start = time.perf_counter()
+    with PDLPY(api_key=KEYS, base_path=mock_api.base_path) as client:
+        responses = [
+            client.person.enrichment(email=f"p{i}@example.com")
+            for i in range(5)
+        ]
+        snapshot = {key["key"]: key for key in client.keys.snapshot()}
+    assert time.perf_counter() - start < 5
+    assert [response.status_code for response in responses] == [200] * 5
+    assert _keys_used(mock_api) == {"key-a": 1, "key-b": 1, "key-c": 5}
+    assert snapshot[mask("key-a")]["sidelined"] > 0
+    assert snapshot[mask("key-b")]["headroom"]["person/enrich"] is None
+    assert snapshot[mask("key-c")]["credits"] == 1000
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_failovers_not_counted_as_retries(mock_api):
+    """
+    Tests failovers to other keys leave the call its full number of retries,
+    with the backoff of its first retries.
+    """
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        (402, {}, {"status": 402, "error": {}})
+        if _key(call) != "key-c"
+        else (503, {}, {"status": 503, "error": {}})
+    )
+    retries = []
+    with PDLPY(
+        api_key=KEYS, base_path=mock_api.base_path, retry_backoff=0
+    ) as client:
+        client.on("retry", retries.append)
+        response = client.person.enrichment(email="a@example.com")
+    assert response.status_code == 503
+    assert [_key(call) for call in mock_api.calls] == [
+        "key-a",
+        "key-b",
+        "key-c",
+        "key-c",
+        "key-c",
+        "key-c",
+    ]
+    assert [event.attempt for event in retries] == [0, 0, 0, 1, 2]
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_all_keys_exhausted(mock_api):
+    """
+    Tests the API's answer is returned once every key is sidelined.
+    """
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        402,
+        {},
+        {"status": 402, "error": {}},
+    )
+    with PDLPY(api_key=KEYS[:2], base_path=mock_api.base_path) as client:
+        assert client.person.enrichment(email="a@b.co").status_code == 402
+        assert client.person.enrichment(email="b@b.co").status_code == 402
+    assert len(mock_api.calls) == 3
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_throughput_scales_with_keys(mock_api):
+    """
+    Tests calls are paced per key, so that more keys allow more calls per
+    second.
+    """
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        200,
+        {"x-ratelimit-limit": "{'second': 20}"},
+        {"status": 200, "data": {}},
+    )
+
+    def elapsed(keys):
+        with PDLPY(api_key=keys, base_path=mock_api.base_path) as client:
+            start = time.perf_counter()
+            for i in range(40):
+                client.person.enrichment(email=f"p{i}@example.com")
+            return time.perf_counter() - start
+
+    assert elapsed(KEYS[:1]) > 0.8
+    assert elapsed(KEYS[:2]) < 0.5
+
+
+def test_empty_key_pool():
+    """
+    Tests an empty list of keys is rejected.
+    """
+    with pytest.raises(ValidationError):
+        PDLPY(api_key=[])
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_async_key_pool(mock_api):
+    """
+    Tests the asyncio client balances its calls over its keys and fails them
+    over alike.
+    """
+    pytest.importorskip("httpx")
+    mock_api.routes["/v5/person/search"] = lambda call: (
+        (402, {}, {"status": 402, "error": {}})
+        if _key(call) == "key-a"
+        else (200, {}, {"status": 200, "data": []})
+    )
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=KEYS, base_path=mock_api.base_path
+        ) as client:
+            return [
+                await client.person.search(sql=f"SELECT {i};", size=1)
+                for i in range(4)
+            ]
+
+    responses = asyncio.run(run())
+    assert [response.status_code for response in responses] == [200] * 4
+    used = _keys_used(mock_api)
+    assert used["key-a"] == 1
+    assert used["key-b"] and used["key-c"]
+    assert sum(used.values()) == 5
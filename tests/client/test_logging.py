@@ -0,0 +1,107 @@
+"""
+All tests related to the logging of API calls.
+"""
+
+import logging
+
+import pytest
+
+from peopledatalabs.logger import LazyParams, RequestLogger
+from peopledatalabs.main import PDLPY
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.logging")
+
+BULK_PARAMS = {
+    "api_key": "secret",
+    "requests": [{"params": {"email": "test@example.com"}}] * 100,
+}
+
+
+@pytest.fixture(name="request_logger")
+def fixture_request_logger():
+    """
+    Logger of API calls, enabled at INFO level.
+    """
+    call_logger = logging.getLogger("PeopleDataLabs.tests.logging.calls")
+    call_logger.setLevel(logging.INFO)
+    return call_logger
+
+
+def test_params_not_serialized_when_disabled(monkeypatch, request_logger):
+    """
+    Tests parameters are not serialized when INFO records are disabled.
+    """
+
+    def fail(_self):
+        raise AssertionError("Serialized parameters")
+
+    monkeypatch.setattr(LazyParams, "__str__", fail)
+    request_logger.setLevel(logging.WARNING)
+    RequestLogger(logger=request_logger).log(
+        "POST", "http://localhost/v5/person/bulk", "person/bulk", BULK_PARAMS
+    )
+
+
+def test_compact_and_pretty_params():
+    """
+    Tests the API key is redacted and long lists are summarized unless pretty.
+    """
+    compact = str(LazyParams(BULK_PARAMS))
+    assert compact == '{"api_key":"***","requests":"<100 items>"}'
+    pretty = str(LazyParams(BULK_PARAMS, pretty=True))
+    assert pretty.count("test@example.com") == 100
+    assert "secret" not in pretty
+    assert BULK_PARAMS["api_key"] == "secret"
+
+
+def test_sampling_and_kv_records(caplog, request_logger):
+    """
+    Tests one call in sample_rate is logged, with structured fields.
+    """
+    call_logger = RequestLogger("kv", sample_rate=3, logger=request_logger)
+    with caplog.at_level(logging.INFO, logger=request_logger.name):
+        for _ in range(6):
+            call_logger.log(
+                "GET",
+                "http://localhost/v5/person/enrich",
+                "person/enrich",
+                {"email": "test@example.com"},
+            )
+    assert len(caplog.records) == 2
+    record = caplog.records[0]
+    assert record.pdl_route == "person/enrich"
+    assert record.getMessage() == (
+        "method=GET route=person/enrich"
+        " url=http://localhost/v5/person/enrich"
+        ' params={"email":"test@example.com"}'
+    )
+
+
+def test_invalid_request_logger():
+    """
+    Tests unknown styles and sample rates below 1 are rejected.
+    """
+    with pytest.raises(ValueError):
+        RequestLogger("verbose")
+    with pytest.raises(ValueError):
+        RequestLogger(sample_rate=0)
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_client_logs_calls(caplog, mock_api, fake_api_key):
+    """
+    Tests the client logs its calls with the configured style.
+    """
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, log_style="kv"
+    ) as client:
+        with caplog.at_level(logging.INFO, logger="PeopleDataLabs.requests"):
+            client.person.enrichment(email="test@example.com")
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(
+        message.startswith("method=GET route=person/enrich")
+        for message in messages
+    )
+    assert fake_api_key not in "".join(messages)
@@ -0,0 +1,183 @@
+"""
+All tests related to the in-process metrics.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import gc
+import logging
+import threading
+
+import pytest
+import requests
+
+from peopledatalabs import MemoryCache, Metrics, PDLPY
+from peopledatalabs.metrics import bucket_index, bucket_upper_bound
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.metrics")
+
+HEADERS = {
+    "x-ratelimit-limit": "{'minute': 100}",
+    "x-ratelimit-remaining": "{'minute': 25}",
+    "x-totallimit-remaining": "4999",
+}
+
+
+def test_buckets_are_within_precision():
+    """
+    Tests every latency falls in a bucket at most 6.25% wider than itself.
+    """
+    for microseconds in (0, 1, 15, 16, 31, 32, 1000, 123_456, 10**9):
+        index = bucket_index(microseconds)
+        upper = bucket_upper_bound(index)
+        assert microseconds / 1e6 < upper
+        assert upper <= max(microseconds * 1.0625, microseconds + 1) / 1e6
+        if index:
+            assert bucket_upper_bound(index - 1) <= microseconds / 1e6
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_snapshot(mock_api, fake_api_key):
+    """
+    Tests calls are counted by route and status, with their latency, cache hits
+    and rate-limit headroom.
+    """
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        200,
+        HEADERS,
+        {"status": 200, "data": {}},
+    )
+    mock_api.routes["/v5/company/enrich"] = lambda call: (
+        404,
+        {},
+        {"status": 404, "error": {"message": "None"}},
+    )
+    metrics = Metrics()
+    with PDLPY(
+        api_key=fake_api_key,
+        base_path=mock_api.base_path,
+        cache=MemoryCache(),
+        metrics=metrics,
+    ) as client:
+        for _ in range(4):
+            client.person.enrichment(email="sean@peopledatalabs.com")
+        client.company.enrichment(website="peopledatalabs.com")
+    snapshot = metrics.snapshot()
+    assert snapshot["calls"] == {
+        "person/enrich": {200: 4},
+        "company/enrich": {404: 1},
+    }
+    assert snapshot["in_flight"] == {"person/enrich": 0, "company/enrich": 0}
+    assert snapshot["cache"] == {"person/enrich": {"hits": 3, "ratio": 0.75}}
+    latency = snapshot["latency"]["person/enrich"]
+    assert latency["count"] == 4
+    assert 0 < latency["p50"] <= latency["p90"] <= latency["p99"]
+    assert snapshot["rate_limits"]["person/enrich"] == {
+        "limit": 100,
+        "remaining": 25,
+        "window": 60,
+        "headroom": 0.25,
+    }
+    assert snapshot["credits"] == {"totallimit_remaining": 4999}
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_threads(mock_api, fake_api_key):
+    """
+    Tests no call is lost when recorded from many threads.
+    """
+    metrics = Metrics()
+    with PDLPY(
+        api_key=fake_api_key,
+        base_path=mock_api.base_path,
+        pool_size=8,
+        metrics=metrics,
+    ) as client:
+        with ThreadPoolExecutor(8) as executor:
+            list(
+                executor.map(
+                    lambda i: client.person.enrichment(email=f"{i}@pdl.com"),
+                    range(200),
+                )
+            )
+    snapshot = metrics.snapshot()
+    assert snapshot["calls"] == {"person/enrich": {200: 200}}
+    assert snapshot["latency"]["person/enrich"]["count"] == 200
+    assert snapshot["in_flight"] == {"person/enrich": 0}
+
+
+def test_short_lived_threads(mock_api, fake_api_key):
+    """
+    Tests the shards of threads which are gone are folded together, without
+    losing their calls.
+    """
+    metrics = Metrics()
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, metrics=metrics
+    ) as client:
+        for i in range(20):
+            thread = threading.Thread(
+                target=client.person.enrichment, kwargs={"email": f"{i}@a.co"}
+            )
+            thread.start()
+            thread.join()
+        del thread
+        gc.collect()
+    assert len(metrics._shards) <= 1  # pylint: disable=protected-access
+    snapshot = metrics.snapshot()
+    assert snapshot["calls"] == {"person/enrich": {200: 20}}
+    assert snapshot["latency"]["person/enrich"]["count"] == 20
+    assert snapshot["in_flight"] == {"person/enrich": 0}
+
+
+@pytest.mark.usefixtures("fake_api_key")
+def test_failed_calls(fake_api_key):
+    """
+    Tests calls failing without a response leave the in-flight gauge.
+    """
+    metrics = Metrics()
+    with PDLPY(
+        api_key=fake_api_key,
+        base_path="http://127.0.0.1:9/v5",
+        max_retries=0,
+        metrics=metrics,
+    ) as client:
+        with pytest.raises(requests.ConnectionError):
+            client.person.enrichment(email="sean@peopledatalabs.com")
+    snapshot = metrics.snapshot()
+    assert snapshot["calls"] == {"person/enrich": {None: 1}}
+    assert snapshot["in_flight"] == {"person/enrich": 0}
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_prometheus(mock_api, fake_api_key):
+    """
+    Tests the metrics are exported in the Prometheus text format.
+    """
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        200,
+        HEADERS,
+        {"status": 200, "data": {}},
+    )
+    metrics = Metrics()
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, metrics=metrics
+    ) as client:
+        client.person.enrichment(email="sean@peopledatalabs.com")
+    text = metrics.prometheus()
+    lines = text.splitlines()
+    assert "# TYPE pdl_requests_total counter" in lines
+    assert 'pdl_requests_total{route="person/enrich",status="200"} 1' in lines
+    assert (
+        'pdl_request_duration_seconds_bucket{route="person/enrich",le="+Inf"}'
+        " 1" in lines
+    )
+    assert 'pdl_rate_limit_headroom{route="person/enrich"} 0.25' in lines
+    assert 'pdl_credits{name="totallimit_remaining"} 4999' in lines
+    buckets = [
+        int(line.rsplit(" ", 1)[1])
+        for line in lines
+        if line.startswith("pdl_request_duration_seconds_bucket")
+    ]
+    assert buckets == sorted(buckets)
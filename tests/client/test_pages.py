@@ -0,0 +1,167 @@
+"""
+All tests related to the parallel fetching of search pages by offset.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from peopledatalabs import AsyncPDLPY, PDLPY
+from peopledatalabs.errors import APIError
+from peopledatalabs.settings import settings
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.pages")
+
+RECORDS = [{"id": str(i)} for i in range(95)]
+
+
+def offset_pages(records, delay=0.0):
+    """
+    Builds a mock search route serving records by offset, which records the
+    highest number of calls it served concurrently.
+
+    Offsets must be sent as the API's from parameter.
+    """
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def route(call):
+        params = call.json()
+        if "from_" in params:
+            return 400, {}, {"status": 400, "error": {"message": "from_"}}
+        start = int(params.get("from") or 0)
+        end = start + int(params.get("size") or 100)
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        # Later pages answer faster, so that pages arrive out of order.
+        time.sleep(delay * (1 - start / len(records)))
+        with lock:
+            state["active"] -= 1
+        page = records[start:end]
+        if not page:
+            return 404, {}, {"status": 404, "error": {"message": "None"}}
+        return 200, {}, {"status": 200, "data": page, "total": len(records)}
+
+    route.state = state
+    return route
+
+
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_parallel_search(mock_api, mock_client: PDLPY):
+    """
+    Tests all the records are yielded in order, the pages after the first being
+    fetched concurrently.
+    """
+    route = offset_pages(RECORDS, delay=0.05)
+    mock_api.routes["/v5/person/search"] = route
+    records = list(
+        mock_client.person.parallel_search(
+            sql="SELECT * FROM person;", size=10, max_workers=4
+        )
+    )
+    assert records == RECORDS
+    offsets = sorted(call.json()["from"] for call in mock_api.calls)
+    assert offsets == list(range(0, 95, 10))
+    assert route.state["peak"] == 4
+
+
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_unordered_parallel_search(mock_api, mock_client: PDLPY):
+    """
+    Tests unordered searches yield pages as they arrive.
+    """
+    mock_api.routes["/v5/company/search"] = offset_pages(RECORDS, delay=0.05)
+    records = list(
+        mock_client.company.parallel_search(
+            sql="SELECT * FROM company;", size=10, ordered=False
+        )
+    )
+    assert records != RECORDS
+    assert sorted(records, key=lambda record: int(record["id"])) == RECORDS
+
+
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_parallel_search_from_offset(mock_api, mock_client: PDLPY):
+    """
+    Tests searches start at the from_ offset and never go past the last record
+    reachable by offset.
+    """
+    mock_api.routes["/v5/person/search"] = offset_pages(RECORDS)
+    max_records = settings.search_max_records
+    settings.search_max_records = 55
+    try:
+        records = list(
+            mock_client.person.parallel_search(
+                sql="SELECT * FROM person;", from_=20, size=10
+            )
+        )
+    finally:
+        settings.search_max_records = max_records
+    assert records == RECORDS[20:55]
+    pages = sorted(
+        (call.json()["from"], call.json()["size"]) for call in mock_api.calls
+    )
+    assert pages == [(20, 10), (30, 10), (40, 10), (50, 5)]
+
+
+@pytest.mark.parametrize("ordered", (True, False))
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_parallel_search_bounded(mock_api, mock_client: PDLPY, ordered):
+    """
+    Tests at most 2 * max_workers pages are requested ahead of the records
+    consumed.
+    """
+    mock_api.routes["/v5/person/search"] = offset_pages(RECORDS)
+    iterator = mock_client.person.parallel_search(
+        sql="SELECT * FROM person;", size=5, max_workers=2, ordered=ordered
+    )
+    consumed = [next(iterator) for _ in range(6)]
+    time.sleep(0.1)
+    assert len(mock_api.calls) <= 1 + 2 * 2
+    consumed.extend(iterator)
+    assert len(mock_api.calls) == 19
+    assert sorted(consumed, key=lambda record: int(record["id"])) == RECORDS
+
+
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_parallel_search_errors(mock_api, mock_client: PDLPY):
+    """
+    Tests failed pages raise APIError and invalid sizes raise ValueError.
+    """
+    mock_api.routes["/v5/person/search"] = lambda call: (
+        400,
+        {},
+        {"status": 400, "error": {"message": "bad query"}},
+    )
+    with pytest.raises(APIError):
+        list(mock_client.person.parallel_search(sql="SELECT * FROM person;"))
+    with pytest.raises(ValueError):
+        mock_client.person.parallel_search(sql="SELECT 1;", size=101)
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_async_parallel_search(mock_api, fake_api_key):
+    """
+    Tests parallel_search of the async client is an async iterator.
+    """
+    pytest.importorskip("httpx")
+    route = offset_pages(RECORDS, delay=0.05)
+    mock_api.routes["/v5/person/search"] = route
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=fake_api_key, base_path=mock_api.base_path
+        ) as client:
+            iterator = client.person.parallel_search(
+                sql="SELECT * FROM person;", size=10, max_workers=3
+            )
+            return [record async for record in iterator]
+
+    assert asyncio.run(run()) == RECORDS
+    assert route.state["peak"] == 3
@@ -0,0 +1,100 @@
+"""
+All tests related to the client-side rate limiter.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+import pytest
+
+from peopledatalabs.main import PDLPY
+from peopledatalabs.ratelimit import (
+    RateLimiter,
+    TokenBucket,
+    parse_limit_header,
+)
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.rate_limit")
+
+
+def test_parse_limit_header():
+    """
+    Tests parsing the formats of the rate-limit headers.
+    """
+    assert parse_limit_header("{'minute': 100}") == {"minute": 100}
+    assert parse_limit_header('{"second": 2, "minute": 90}') == {
+        "second": 2,
+        "minute": 90,
+    }
+    assert parse_limit_header("100") == {"minute": 100}
+    assert parse_limit_header("garbage") == {}
+    assert parse_limit_header(None) == {}
+
+
+def test_token_bucket_shared_across_threads():
+    """
+    Tests concurrent reservations queue up behind each other.
+    """
+    bucket = TokenBucket(rate=100, capacity=10)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        delays = list(executor.map(lambda _: bucket.reserve(), range(30)))
+    assert sum(1 for delay in delays if delay == 0) >= 10
+    assert max(delays) == pytest.approx(0.2, abs=0.02)
+
+
+def test_rate_limiter_seeded_from_config():
+    """
+    Tests configured limits are applied per route.
+    """
+    limiter = RateLimiter({"person/enrich": 60})
+    assert limiter.bucket("person/enrich").rate == 1
+    assert limiter.bucket("person/search").rate is None
+    assert limiter.reserve("person/search") == 0
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_rate_limiter_updated_from_headers(mock_client, mock_api):
+    """
+    Tests the limiter follows the rate-limit headers of each route.
+    """
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        200,
+        {
+            "x-ratelimit-limit": "{'minute': 600}",
+            "x-ratelimit-remaining": "{'minute': 0}",
+        },
+        {"status": 200},
+    )
+    mock_client.person.enrichment(email="test@example.com")
+    limiter = mock_client.rate_limiter
+    assert limiter.bucket("person/enrich").rate == 10
+    assert limiter.reserve("person/enrich") > 0
+    assert limiter.reserve("company/enrich") == 0
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_rate_limiter_paused_on_429(mock_api, fake_api_key):
+    """
+    Tests a 429 response holds back calls for Retry-After seconds.
+    """
+    mock_api.routes["/v5/person/search"] = lambda call: (
+        429,
+        {"retry-after": "5"},
+        {"status": 429},
+    )
+    client = PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, max_retries=0
+    )
+    client.person.search(sql="SELECT * FROM person;")
+    delay = client.rate_limiter.reserve("person/search")
+    assert delay == pytest.approx(5, abs=0.5)
+
+
+@pytest.mark.usefixtures("fake_api_key")
+def test_rate_limit_disabled(fake_api_key):
+    """
+    Tests the limiter can be turned off.
+    """
+    assert PDLPY(api_key=fake_api_key, rate_limit=False).rate_limiter is None
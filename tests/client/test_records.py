@@ -0,0 +1,166 @@
+"""
+All tests related to the compact person and company records.
+"""
+
+import json
+import logging
+
+import pytest
+
+from peopledatalabs import models
+from peopledatalabs.main import PDLPY
+from peopledatalabs.models.company import CompanyRecord
+from peopledatalabs.models.person import PersonRecord
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.records")
+
+PERSON = {
+    "id": "qEnOZ5Oh0poWnQ1luFBfVw_0000",
+    "full_name": "sean thorne",
+    "job_company_id": "peopledatalabs",
+    "experience": [{"company": {"name": "people data labs"}}],
+    "education": [],
+    "profiles": [{"network": "linkedin"}],
+}
+
+COMPANY = {
+    "status": 200,
+    "id": "peopledatalabs",
+    "name": "people data labs",
+    "website": "peopledatalabs.com",
+    "likelihood": 10,
+    "profiles": ["linkedin.com/company/peopledatalabs"],
+}
+
+
+def test_person_record_from_result():
+    """
+    Tests the hot fields of a person record are set from a result.
+    """
+    record = PersonRecord.from_result(
+        {"status": 200, "likelihood": 9, "data": PERSON}
+    )
+    assert record.id == PERSON["id"]
+    assert record.full_name == "sean thorne"
+    assert record.likelihood == 9
+    assert record.job_company_id == "peopledatalabs"
+    assert not hasattr(record, "__dict__")
+
+
+def test_record_decodes_sections_lazily():
+    """
+    Tests nested sections are decoded on first access, then memoized.
+    """
+    record = PersonRecord.from_dict(PERSON)
+    assert record._fields is None  # pylint: disable=protected-access
+    experience = record.experience
+    assert experience == PERSON["experience"]
+    assert record["experience"] is experience
+    assert record.get("education") == []
+    assert record.get("skills", "none") == "none"
+    with pytest.raises(AttributeError):
+        _ = record.skills
+    with pytest.raises(KeyError):
+        _ = record["skills"]
+
+
+def test_record_memoizes_accessed_fields_only(monkeypatch):
+    """
+    Tests only the fields accessed are kept decoded, each decoded from its own
+    span of the raw JSON, which is scanned once.
+    """
+    record = PersonRecord.from_dict(PERSON)
+    scanned = []
+    iter_members = models.iter_members
+
+    def counting_iter_members(raw):
+        scanned.append(raw)
+        return iter_members(raw)
+
+    monkeypatch.setattr(models, "iter_members", counting_iter_members)
+    experience = record.experience
+    assert experience == PERSON["experience"]
+    assert record["experience"] is experience
+    assert record.education == PERSON["education"]
+    assert record.get("skills") is None
+    assert scanned == [record.raw]
+    # pylint: disable-next=protected-access
+    assert record._fields == {
+        "experience": PERSON["experience"],
+        "education": PERSON["education"],
+    }
+
+
+def test_record_fields_of_non_ascii_json():
+    """
+    Tests the spans of fields are located in bytes when the raw JSON is not
+    ASCII.
+    """
+    person = {**PERSON, "full_name": 'séan "thörne"', "tags": ["é", {}]}
+    record = PersonRecord.from_json(
+        json.dumps(person, ensure_ascii=False, indent=2)
+    )
+    assert record.full_name == person["full_name"]
+    assert record.tags == person["tags"]
+    assert record.profiles == person["profiles"]
+
+
+def test_record_keeps_falsy_overrides():
+    """
+    Tests hot fields given as falsy values override the result's.
+    """
+    record = PersonRecord.from_dict({**PERSON, "likelihood": 9}, likelihood=0)
+    assert record.likelihood == 0
+    record = PersonRecord.from_dict(PERSON, full_name="")
+    assert record.full_name == ""
+
+
+def test_record_to_dict_round_trips():
+    """
+    Tests a record is converted back into the full result.
+    """
+    record = PersonRecord.from_dict(PERSON, likelihood=8)
+    assert record.to_dict() == {**PERSON, "likelihood": 8}
+    assert json.loads(record.raw) == PERSON
+    assert "likelihood=8" in repr(record)
+
+
+def test_record_keeps_raw_json():
+    """
+    Tests the JSON a record is built from is kept as is.
+    """
+    raw = json.dumps(COMPANY).encode()
+    record = CompanyRecord.from_json(raw)
+    assert record.raw is raw
+    assert record.name == "people data labs"
+    assert CompanyRecord.from_json(raw.decode()).raw == raw
+
+
+@pytest.mark.usefixtures("mock_api", "mock_client")
+def test_records_from_responses(mock_api, mock_client: PDLPY):
+    """
+    Tests records are built from the responses of enrichment calls.
+    """
+    mock_api.routes["/v5/person/enrich"] = lambda call: (
+        200,
+        {},
+        {"status": 200, "likelihood": 7, "data": PERSON},
+    )
+    mock_api.routes["/v5/company/enrich"] = lambda call: (
+        200,
+        {},
+        COMPANY,
+    )
+    person = PersonRecord.from_response(
+        mock_client.person.enrichment(email="sean@peopledatalabs.com")
+    )
+    assert person.likelihood == 7
+    assert person.profiles == PERSON["profiles"]
+    assert json.loads(person.raw) == PERSON
+    company = CompanyRecord.from_response(
+        mock_client.company.enrichment(website="peopledatalabs.com")
+    )
+    assert company.id == "peopledatalabs"
+    assert company.profiles == COMPANY["profiles"]
@@ -0,0 +1,253 @@
+"""
+All tests related to automatic retries.
+"""
+
+import logging
+import socket
+
+import pytest
+import requests
+import urllib3
+
+from peopledatalabs.main import PDLPY
+from peopledatalabs.retry import Retry, RetryBudget, is_resendable
+from peopledatalabs.session import Session
+from peopledatalabs.transport import Transport
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.retry")
+
+
+class _Response:  # pylint: disable=too-few-public-methods
+    """
+    Minimal response for policy tests.
+    """
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def _flaky(statuses):
+    """
+    Builds a mock API route answering with each status in turn.
+    """
+    statuses = iter(statuses)
+
+    def route(_call):
+        status = next(statuses)
+        return status, {}, {"status": status}
+
+    return route
+
+
+@pytest.fixture(name="retry_client")
+def fixture_retry_client(mock_api, fake_api_key):
+    """
+    Client instance calling the mock API, retrying without backoff.
+    """
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, retry_backoff=0
+    ) as client:
+        yield client
+
+
+def test_retry_policy():
+    """
+    Tests which attempts are retried, and after how long.
+    """
+    retry = Retry(max_retries=2, backoff=1, max_backoff=3)
+    assert retry.get_delay(0, _Response(404)) is None
+    assert 0 <= retry.get_delay(0, _Response(503)) <= 1
+    assert 0 <= retry.get_delay(1, None) <= 2
+    assert retry.get_delay(2, _Response(503)) is None
+    assert retry.get_delay(0, _Response(429, {"retry-after": "7"})) == 7
+    capped = Retry(max_retry_after=10)
+    assert capped.get_delay(0, _Response(429, {"retry-after": "3600"})) == 10
+
+
+def test_retry_budget_exhausted():
+    """
+    Tests retries stop once the budget is spent, and resume as calls are made.
+    """
+    retry = Retry(max_retries=1, budget=0.5)
+    delays = [retry.get_delay(0, _Response(503)) for _ in range(20)]
+    assert sum(delay is not None for delay in delays) == 10
+    retry.budget.deposit()
+    retry.budget.deposit()
+    assert retry.get_delay(0, _Response(503)) is not None
+
+
+def test_retry_budget_grows_with_traffic():
+    """
+    Tests calls earn retries beyond the minimum, up to the window's share.
+    """
+    budget = RetryBudget(0.2, 10, window=1000)
+    for _ in range(5000):
+        budget.deposit()
+    assert budget.balance == 200
+    assert sum(budget.withdraw() for _ in range(250)) == 200
+
+
+class FailingTransport(Transport):
+    """
+    Test double raising each error in turn, then answering 200.
+    """
+
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = list(errors)
+        self.sent = []
+
+    def prepare(self, method, url, **kwargs):
+        return requests.Request(method, url, **kwargs).prepare()
+
+    def send(self, prepared, *, timeout=None, stream=False):
+        self.sent.append(prepared.method)
+        if self.errors:
+            raise self.errors.pop(0)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"[]"  # pylint: disable=protected-access
+        return response
+
+
+def test_connect_errors_resendable():
+    """
+    Tests POSTs are only resendable after errors raised while connecting, even
+    when wrapped by requests.
+    """
+    refused = requests.ConnectionError(
+        urllib3.exceptions.MaxRetryError(
+            None,
+            "http://localhost/",
+            urllib3.exceptions.NewConnectionError(None, "refused"),
+        )
+    )
+    errors = Session.connect_errors
+    assert is_resendable("POST", refused, errors)
+    assert is_resendable("POST", requests.ConnectTimeout(), errors)
+    assert not is_resendable("POST", requests.ReadTimeout(), errors)
+    assert not is_resendable("POST", requests.ConnectionError(), errors)
+    assert is_resendable("GET", requests.ReadTimeout(), errors)
+
+
+@pytest.mark.usefixtures("fake_api_key")
+def test_posts_not_resent_once_sent(fake_api_key):
+    """
+    Tests a bulk POST which timed out reading its response is not sent again,
+    while one which failed to connect, or a GET, is.
+    """
+    transport = FailingTransport([requests.ReadTimeout()])
+    client = PDLPY(api_key=fake_api_key, transport=transport, retry_backoff=0)
+    with pytest.raises(requests.ReadTimeout):
+        client.person.bulk(requests=[{"params": {"name": "a"}}])
+    assert transport.sent == ["POST"]
+
+    transport = FailingTransport([requests.ConnectTimeout()] * 2)
+    client = PDLPY(api_key=fake_api_key, transport=transport, retry_backoff=0)
+    assert client.person.bulk(requests=[{"params": {"name": "a"}}]).ok
+    assert transport.sent == ["POST"] * 3
+
+    transport = FailingTransport([requests.ReadTimeout()])
+    client = PDLPY(api_key=fake_api_key, transport=transport, retry_backoff=0)
+    assert client.person.enrichment(email="a@example.com").ok
+    assert transport.sent == ["GET"] * 2
+
+
+@pytest.mark.usefixtures("retry_client", "mock_api")
+def test_transient_failures_retried(retry_client, mock_api):
+    """
+    Tests a call is retried until it succeeds, sending the same body.
+    """
+    mock_api.routes["/v5/person/search"] = _flaky([503, 502, 200])
+    response = retry_client.person.search(sql="SELECT * FROM person;")
+    assert response.status_code == 200
+    assert len(mock_api.calls) == 3
+    assert len({call.body for call in mock_api.calls}) == 1
+
+
+@pytest.mark.usefixtures("retry_client", "mock_api")
+def test_max_retries(retry_client, mock_api):
+    """
+    Tests the last response is returned once retries are exhausted.
+    """
+    mock_api.routes["/v5/person/enrich"] = _flaky([503] * 4)
+    response = retry_client.person.enrichment(email="test@example.com")
+    assert response.status_code == 503
+    assert len(mock_api.calls) == 4
+
+
+@pytest.mark.usefixtures("fake_api_key")
+def test_connection_error_raised_after_retries(fake_api_key):
+    """
+    Tests a connection error is raised once retries are exhausted.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    client = PDLPY(
+        api_key=fake_api_key,
+        base_path=f"http://127.0.0.1:{port}/v5",
+        retry_backoff=0,
+    )
+    with pytest.raises(requests.ConnectionError):
+        client.person.enrichment(email="test@example.com")
+
+
+@pytest.mark.usefixtures("retry_client", "mock_api")
+def test_bulk_retries_failed_items_only(retry_client, mock_api):
+    """
+    Tests iter_bulk resends only the requests which failed transiently.
+    """
+    statuses = {0: [200], 1: [429, 200], 2: [404], 3: [503, 503, 200]}
+
+    def route(call):
+        return (
+            200,
+            {},
+            [
+                {
+                    "status": statuses[r["metadata"]["row"]].pop(0),
+                    "metadata": r["metadata"],
+                }
+                for r in call.json()["requests"]
+            ],
+        )
+
+    mock_api.routes["/v5/person/bulk"] = route
+    requests_ = [
+        {"metadata": {"row": i}, "params": {"name": f"name {i}"}}
+        for i in range(4)
+    ]
+    results = list(retry_client.person.iter_bulk(requests_))
+    assert [r["status"] for r in results] == [200, 200, 404, 200]
+    assert [
+        [r["metadata"]["row"] for r in call.json()["requests"]]
+        for call in mock_api.calls
+    ] == [[0, 1, 2, 3], [1, 3], [3]]
+
+
+@pytest.mark.usefixtures("retry_client", "mock_api")
+def test_bulk_missing_results(retry_client, mock_api):
+    """
+    Tests requests the API returned no result for get an error result instead
+    of being dropped.
+    """
+    mock_api.routes["/v5/person/bulk"] = lambda call: (
+        200,
+        {},
+        [
+            {"status": 200, "metadata": r["metadata"]}
+            for r in call.json()["requests"][:-1]
+        ],
+    )
+    requests_ = [
+        {"metadata": {"row": i}, "params": {"name": f"name {i}"}}
+        for i in range(4)
+    ]
+    results = list(retry_client.person.iter_bulk(requests_, batch_size=2))
+    assert [r["status"] for r in results] == [200, 500, 200, 500]
+    assert [r["metadata"]["row"] for r in results] == [0, 1, 2, 3]
+    assert results[1]["error"]["type"] == "missing_result"
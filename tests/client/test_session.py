@@ -0,0 +1,100 @@
+"""
+All tests related to the connection pool shared by the client.
+"""
+
+import logging
+
+import pytest
+from pydantic.v1 import ValidationError
+
+from peopledatalabs.main import PDLPY
+from peopledatalabs.session import BaseSession
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.session")
+
+
+def _call_every_section(client):
+    client.autocomplete(field="title", text="data")
+    client.person.enrichment(email="test@example.com")
+    client.company.cleaner(website="peopledatalabs.com")
+    client.location.cleaner(location="portland")
+    client.school.cleaner(name="MIT")
+
+
+@pytest.mark.usefixtures("client_with_fake_api_key")
+def test_sections_share_client_session(client_with_fake_api_key):
+    """
+    Tests all sections of a client use the client's connection pool.
+    """
+    client = client_with_fake_api_key
+    session = client.person.session
+    assert session is not None
+    assert client.company.session is session
+    assert client.location.session is session
+    assert client.school.session is session
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_connection_reused_across_sections(mock_client, mock_api):
+    """
+    Tests consecutive calls to different APIs reuse one connection.
+    """
+    _call_every_section(mock_client)
+    assert len(mock_api.calls) == 5
+    assert mock_api.connections == 1
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_keep_alive_disabled(mock_api, fake_api_key):
+    """
+    Tests disabling keep-alive opens a new connection for every call.
+    """
+    with PDLPY(
+        api_key=fake_api_key,
+        base_path=mock_api.base_path,
+        keep_alive=False,
+    ) as client:
+        _call_every_section(client)
+    assert mock_api.connections == 5
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_context_manager_closes_pool(mock_api, fake_api_key):
+    """
+    Tests exiting the client's context closes its pooled connections.
+    """
+    with PDLPY(api_key=fake_api_key, base_path=mock_api.base_path) as client:
+        client.person.enrichment(email="test@example.com")
+    client.person.enrichment(email="test@example.com")
+    assert mock_api.connections == 2
+
+
+@pytest.mark.usefixtures("fake_api_key")
+def test_init_invalid_pool_size_raises_validation_error(fake_api_key):
+    """
+    Tests passing a pool size lower than 1.
+
+    Should raise ValidationError.
+    """
+    with pytest.raises(ValidationError):
+        PDLPY(api_key=fake_api_key, pool_size=0)
+
+
+def test_incomplete_session_rejected():
+    """
+    Tests sessions which cannot restore cached responses cannot be
+    instantiated.
+    """
+
+    # pylint: disable-next=abstract-method,too-few-public-methods
+    class NoRestoreSession(BaseSession):
+        """
+        Session without _restore.
+        """
+
+        connect_errors = ()
+
+    with pytest.raises(TypeError):
+        NoRestoreSession()  # pylint: disable=abstract-class-instantiated
@@ -0,0 +1,171 @@
+"""
+All tests related to the coalescing of identical concurrent calls.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+
+import pytest
+
+from peopledatalabs import AsyncPDLPY, PDLPY
+from peopledatalabs.singleflight import SingleFlight
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.singleflight")
+
+THREADS = 8
+
+
+def slow_enrichment(call):
+    """
+    Mock person/enrich route answering after a delay.
+    """
+    time.sleep(0.2)
+    return 200, {}, {"status": 200, "data": {"email": call.query["email"]}}
+
+
+def enrich_concurrently(client: PDLPY, emails):
+    """
+    Enriches each email from its own thread, all at the same time.
+    """
+    barrier = threading.Barrier(len(emails))
+
+    def enrich(email):
+        barrier.wait()
+        return client.person.enrichment(email=email)
+
+    with ThreadPoolExecutor(len(emails)) as executor:
+        return list(executor.map(enrich, emails))
+
+
+@pytest.fixture(name="coalescing_client")
+def fixture_coalescing_client(mock_api, fake_api_key):
+    """
+    Client instance calling the mock API, coalescing identical calls.
+    """
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, coalesce=True
+    ) as client:
+        yield client
+
+
+@pytest.mark.usefixtures("mock_api", "coalescing_client")
+def test_identical_calls_share_one_request(mock_api, coalescing_client: PDLPY):
+    """
+    Tests identical concurrent calls send a single request.
+    """
+    mock_api.routes["/v5/person/enrich"] = slow_enrichment
+    responses = enrich_concurrently(
+        coalescing_client, ["sean@peopledatalabs.com"] * THREADS
+    )
+    assert len(mock_api.calls) == 1
+    assert {response.status_code for response in responses} == {200}
+    # pylint: disable=protected-access
+    assert coalescing_client._session.single_flight.shared == THREADS - 1
+    assert not coalescing_client._session.single_flight
+
+
+@pytest.mark.usefixtures("mock_api", "coalescing_client")
+def test_distinct_calls_not_coalesced(mock_api, coalescing_client: PDLPY):
+    """
+    Tests concurrent calls with different parameters are all sent.
+    """
+    mock_api.routes["/v5/person/enrich"] = slow_enrichment
+    responses = enrich_concurrently(
+        coalescing_client,
+        [f"sean{i}@peopledatalabs.com" for i in range(THREADS)],
+    )
+    assert len(mock_api.calls) == THREADS
+    assert [response.json()["data"]["email"] for response in responses] == [
+        f"sean{i}@peopledatalabs.com" for i in range(THREADS)
+    ]
+
+
+@pytest.mark.usefixtures("mock_api", "coalescing_client")
+def test_posts_not_coalesced(mock_api, coalescing_client: PDLPY):
+    """
+    Tests identical concurrent POST calls, e.g. searches, are all sent.
+    """
+
+    def slow_search(_):
+        time.sleep(0.2)
+        return 200, {}, {"status": 200, "data": [], "total": 0}
+
+    mock_api.routes["/v5/person/search"] = slow_search
+    barrier = threading.Barrier(THREADS)
+
+    def search(_):
+        barrier.wait()
+        return coalescing_client.person.search(sql="SELECT * FROM person;")
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(executor.map(search, range(THREADS)))
+    assert len(mock_api.calls) == THREADS
+    # pylint: disable-next=protected-access
+    assert coalescing_client._session.single_flight.shared == 0
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_coalescing_off_by_default(mock_api, fake_api_key):
+    """
+    Tests identical calls are all sent unless coalescing is enabled.
+    """
+    mock_api.routes["/v5/person/enrich"] = slow_enrichment
+    # pylint: disable=protected-access
+    with PDLPY(api_key=fake_api_key, base_path=mock_api.base_path) as client:
+        assert client._session.single_flight is None
+        enrich_concurrently(client, ["sean@peopledatalabs.com"] * THREADS)
+    assert len(mock_api.calls) == THREADS
+
+
+def test_errors_shared_with_waiters():
+    """
+    Tests the exception of an in-flight call is raised in every waiter.
+    """
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ConnectionError("down")
+
+    def wait():
+        started.wait()
+        return flights.do("key", lambda: "not called")
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flights.do, "key", fail)
+        follower = executor.submit(wait)
+        for future in (leader, follower):
+            with pytest.raises(ConnectionError):
+                future.result()
+    assert flights.do("key", lambda: "sent again") == "sent again"
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_async_identical_calls_share_one_request(mock_api, fake_api_key):
+    """
+    Tests identical concurrent calls of asyncio tasks send one request.
+    """
+    pytest.importorskip("httpx")
+    mock_api.routes["/v5/person/enrich"] = slow_enrichment
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=fake_api_key, base_path=mock_api.base_path, coalesce=True
+        ) as client:
+            return await asyncio.gather(
+                *(
+                    client.person.enrichment(email="sean@peopledatalabs.com")
+                    for _ in range(THREADS)
+                )
+            )
+
+    responses = asyncio.run(run())
+    assert len(mock_api.calls) == 1
+    assert {response.status_code for response in responses} == {200}
@@ -0,0 +1,139 @@
+"""
+All tests related to the import and construction cost of the client.
+"""
+
+import logging
+import subprocess
+import sys
+
+import pytest
+
+from peopledatalabs.main import PDLPY
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.startup")
+
+
+def _loaded_modules(code: str, modules: tuple) -> list:
+    """
+    Runs code in a new interpreter and returns which of modules it loaded.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\n{code}\n"
+            f"print(','.join(m for m in {modules!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return [module for module in output.strip().split(",") if module]
+
+
+def test_import_is_lazy():
+    """
+    Tests importing the package does not import its dependencies.
+    """
+    assert not _loaded_modules(
+        "import peopledatalabs", ("pydantic", "requests")
+    )
+
+
+def test_sections_loaded_on_first_use():
+    """
+    Tests a client loads the modules of a section only when it is used.
+    """
+    sections = (
+        "asyncio",
+        "email_validator",
+        "peopledatalabs.models.company",
+        "peopledatalabs.models.person",
+    )
+    assert not _loaded_modules(
+        "from peopledatalabs import PDLPY\nPDLPY(api_key='key')", sections
+    )
+    assert _loaded_modules(
+        "from peopledatalabs import PDLPY\nPDLPY(api_key='key').person",
+        sections,
+    ) == ["asyncio", "email_validator", "peopledatalabs.models.person"]
+
+
+@pytest.mark.usefixtures("client_with_fake_api_key")
+def test_sections_built_once(client_with_fake_api_key):
+    """
+    Tests the sections of a client are built once and reused.
+    """
+    client = client_with_fake_api_key
+    person = client.person
+    assert client.person is person
+    assert client.company is not person
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_routes_compiled_once(mock_api, fake_api_key):
+    """
+    Tests each route is compiled on its first call, shared by the sections of a
+    client, and its headers are not altered by calls.
+    """
+    with PDLPY(api_key=fake_api_key, base_path=mock_api.base_path) as client:
+        routes = client._routes  # pylint: disable=protected-access
+        assert not routes
+        client.person.enrichment(email="sean@peopledatalabs.com")
+        client.person.search(sql="SELECT * FROM person;", size=5)
+        client.person.search(sql="SELECT * FROM person;", size=5)
+        client.autocomplete(field="title", text="engineer")
+        assert len(routes) == 3
+        assert client.company.routes is routes
+        search = routes.get("person/search", "POST", None)
+        assert search.url == f"{mock_api.base_path}/person/search"
+        assert search.headers["X-api-key"] == fake_api_key
+        enrich = routes.get("person/enrich", "GET", None)
+        assert "X-api-key" not in enrich.headers
+    assert [call.headers.get("x-api-key") for call in mock_api.calls] == [
+        None,
+        fake_api_key,
+        fake_api_key,
+        None,
+    ]
+
+
+def test_endpoint_classes_importable():
+    """
+    Tests the endpoint classes are still exposed by the main module.
+    """
+    # pylint: disable=import-outside-toplevel
+    from peopledatalabs.endpoints.person import Person
+    from peopledatalabs.main import Person as LazyPerson
+
+    assert LazyPerson is Person
+    assert PDLPY.__module__ == "peopledatalabs.main"
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_sections_follow_api_key(mock_api, fake_api_key):
+    """
+    Tests sections already used call with the API key and base URL set on the
+    client since.
+    """
+    with PDLPY(api_key=fake_api_key, base_path=mock_api.base_path) as client:
+        person = client.person
+        person.enrichment(email="sean@peopledatalabs.com")
+        client.api_key = "new"
+        client.person.enrichment(email="sean@peopledatalabs.com")
+        client.autocomplete(field="title", text="engineer")
+        client.person.search(sql="SELECT * FROM person;", size=5)
+        assert client.person is not person
+        client.base_path = mock_api.base_path + "/"
+        client.person.enrichment(email="sean@peopledatalabs.com")
+        client.sandbox = True
+        assert client.company.base_path.startswith(
+            "https://sandbox.api.peopledatalabs.com/"
+        )
+    assert [
+        call.query.get("api_key", call.headers.get("x-api-key"))
+        for call in mock_api.calls
+    ] == [fake_api_key, "new", "new", "new", "new"]
+    assert mock_api.calls[-1].path.startswith("/v5//person/enrich")
@@ -0,0 +1,216 @@
+"""
+All tests related to the streamed decoding of large responses.
+"""
+
+import asyncio
+import json
+import logging
+
+import pytest
+
+from peopledatalabs import AsyncPDLPY
+from peopledatalabs.errors import APIError
+from peopledatalabs.stream import _MORE, ArrayParser
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.stream")
+
+RECORDS = [
+    {"id": "1", "full_name": 'sean "the [boss]" thorne', "skills": []},
+    {"id": "2", "experience": [{"title": {"name": "ceo\\é}"}}]},
+    None,
+    12.5,
+    "plain",
+    [True, False, {}],
+]
+
+
+def _parse(body: bytes, key=None, chunk_size=1):
+    """
+    Feeds a body to an ArrayParser chunk by chunk.
+
+    Returns:
+        The records, the parser and the largest buffer it held.
+    """
+    parser = ArrayParser(key)
+    bounds = range(0, len(body) + chunk_size, chunk_size)
+    chunks = (body[start:end] for start, end in zip(bounds, bounds[1:]))
+    records, peak = [], 0
+    for record in parser.parse():
+        if record is _MORE:
+            chunk = next(chunks, None)
+            if chunk is None:
+                parser.close()
+            else:
+                parser.feed(chunk)
+            peak = max(peak, len(parser.buffer))
+        else:
+            records.append(record)
+    return records, parser, peak
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_parse_top_level_array(chunk_size):
+    """
+    Tests every item of a top-level array is decoded, whatever the chunks.
+    """
+    body = json.dumps(RECORDS, indent=1).encode()
+    records, _, _ = _parse(body, chunk_size=chunk_size)
+    assert records == RECORDS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_parse_data_member(chunk_size):
+    """
+    Tests the records of 'data' are decoded and other members are kept.
+    """
+    body = {"status": 200, "data": RECORDS, "scroll_token": "x", "total": 9}
+    records, parser, _ = _parse(
+        json.dumps(body, ensure_ascii=False).encode(), "data", chunk_size
+    )
+    assert records == RECORDS
+    assert parser.fields == {"status": 200, "scroll_token": "x", "total": 9}
+
+
+def test_parse_error_response():
+    """
+    Tests a failed call yields no records and keeps its error.
+    """
+    body = b'{"status": 404, "error": {"type": "not_found"}}'
+    records, parser, _ = _parse(body, chunk_size=5)
+    assert not records
+    assert parser.fields["error"] == {"type": "not_found"}
+
+
+def test_parse_truncated_body():
+    """
+    Tests a truncated body raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        _parse(b'[{"id": "1"}, {"id": ', chunk_size=3)
+
+
+def test_memory_bounded_by_one_record():
+    """
+    Tests the buffer holds about one record, not the whole body.
+    """
+    record = {"id": "x" * 1000}
+    body = json.dumps({"data": [record] * 1000}).encode()
+    records, _, peak = _parse(body, "data", chunk_size=256)
+    assert len(records) == 1000
+    assert peak < 2 * len(json.dumps(record)) + 256
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api", "scroll_pages")
+def test_stream_search(mock_client, mock_api, scroll_pages):
+    """
+    Tests stream_search yields the records of a page.
+    """
+    people = [{"id": str(index)} for index in range(30)]
+    mock_api.routes["/v5/person/search"] = scroll_pages(people)
+    stream = mock_client.person.stream_search(
+        sql="SELECT * FROM person;", size=10
+    )
+    assert list(stream) == people[:10]
+    assert stream.status_code == 200
+    assert stream.fields["scroll_token"] == "10"
+    assert stream.fields["total"] == 30
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_stream_bulk(mock_client, mock_api):
+    """
+    Tests stream_bulk yields one result per request.
+    """
+    mock_api.routes["/v5/person/bulk"] = lambda call: (
+        200,
+        {},
+        [{"status": 200, "data": {"id": str(i)}} for i in range(3)],
+    )
+    requests_ = [{"params": {"email": "test@example.com"}}] * 3
+    results = mock_client.person.stream_bulk(requests=requests_)
+    assert [result["data"]["id"] for result in results] == ["0", "1", "2"]
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_stream_errors(mock_client, mock_api):
+    """
+    Tests a stream raises APIError if its call failed, and yields no records if
+    none matched.
+    """
+    mock_api.routes["/v5/company/enrich/bulk"] = lambda call: (
+        400,
+        {},
+        {"status": 400, "error": {"type": "invalid_request_error"}},
+    )
+    stream = mock_client.company.stream_bulk(
+        requests=[{"params": {"website": "peopledatalabs.com"}}]
+    )
+    with pytest.raises(APIError, match="invalid_request_error"):
+        list(stream)
+    assert stream.status_code == 400
+
+    for status in (401, 402, 500):
+        mock_api.routes["/v5/person/search"] = lambda call, status=status: (
+            status,
+            {},
+            {"status": status, "error": {"type": "error"}},
+        )
+        stream = mock_client.person.stream_search(sql="SELECT * FROM person;")
+        with pytest.raises(APIError) as error:
+            next(stream)
+        assert error.value.response.status_code == status
+
+    mock_api.routes["/v5/person/search"] = lambda call: (
+        404,
+        {},
+        {"status": 404, "error": {"type": "not_found"}},
+    )
+    stream = mock_client.person.stream_search(sql="SELECT * FROM person;")
+    assert not list(stream)
+    assert stream.fields["error"]["type"] == "not_found"
+
+
+@pytest.mark.usefixtures("mock_api", "scroll_pages", "fake_api_key")
+def test_async_stream_search(mock_api, scroll_pages, fake_api_key):
+    """
+    Tests the async client streams the records of a page.
+    """
+    pytest.importorskip("httpx")
+    companies = [{"id": str(index)} for index in range(5)]
+    mock_api.routes["/v5/company/search"] = scroll_pages(companies)
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=fake_api_key, base_path=mock_api.base_path
+        ) as client:
+            stream = client.company.stream_search(sql="SELECT * FROM company;")
+            return [record async for record in stream], stream.fields
+
+    records, fields = asyncio.run(run())
+    assert records == companies
+    assert fields["total"] == 5
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_async_stream_error(mock_api, fake_api_key):
+    """
+    Tests the async client raises APIError if a streamed call failed.
+    """
+    pytest.importorskip("httpx")
+    mock_api.routes["/v5/company/search"] = lambda call: (
+        401,
+        {},
+        {"status": 401, "error": {"type": "authentication_error"}},
+    )
+
+    async def run():
+        async with AsyncPDLPY(
+            api_key=fake_api_key, base_path=mock_api.base_path
+        ) as client:
+            stream = client.company.stream_search(sql="SELECT * FROM company;")
+            return [record async for record in stream]
+
+    with pytest.raises(APIError, match="authentication_error"):
+        asyncio.run(run())
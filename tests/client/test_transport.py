@@ -0,0 +1,147 @@
+"""
+All tests related to the transports sending requests.
+"""
+
+import asyncio
+import json
+import logging
+
+import pytest
+from pydantic.v1 import ValidationError
+import requests
+
+from peopledatalabs import AsyncPDLPY, PDLPY
+from peopledatalabs.transport import Transport
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.transport")
+
+TRANSPORTS = ("requests", "urllib3")
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+@pytest.mark.usefixtures("mock_api", "fake_api_key")
+def test_transport_calls(mock_api, fake_api_key, transport):
+    """
+    Tests the shipped transports encode parameters, bodies and headers alike,
+    and reuse their connections.
+    """
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, transport=transport
+    ) as client:
+        enriched = client.person.enrichment(
+            email="sean@peopledatalabs.com", required="emails AND profiles"
+        )
+        searched = client.person.search(sql="SELECT * FROM person;", size=5)
+    assert enriched.status_code == 200
+    assert enriched.json() == {"status": 200, "data": {}}
+    assert searched.status_code == 200
+    get, post = mock_api.calls
+    assert get.query == {
+        "email": "sean@peopledatalabs.com",
+        "required": "emails AND profiles",
+        "api_key": fake_api_key,
+    }
+    assert post.json() == {"sql": "SELECT * FROM person;", "size": 5}
+    assert post.headers["x-api-key"] == fake_api_key
+    assert post.headers["content-type"] == "application/json"
+    assert mock_api.connections == 1
+
+
+@pytest.mark.usefixtures("mock_api", "fake_api_key", "scroll_pages")
+def test_urllib3_transport_streams(mock_api, fake_api_key, scroll_pages):
+    """
+    Tests responses of the urllib3 transport can be streamed.
+    """
+    records = [{"id": str(i)} for i in range(30)]
+    mock_api.routes["/v5/person/search"] = scroll_pages(records)
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, transport="urllib3"
+    ) as client:
+        stream = client.person.stream_search(sql="SELECT 1;", size=30)
+        assert list(stream) == records
+        assert list(client.person.iter_search(sql="SELECT 1;", size=7)) == (
+            records
+        )
+
+
+class CannedTransport(Transport):
+    """
+    Test double answering every call with the same body, without network.
+    """
+
+    def __init__(self, body: dict):
+        super().__init__()
+        self.body = json.dumps(body).encode()
+        self.sent = []
+        self.closed = False
+
+    def prepare(self, method, url, **kwargs):
+        return requests.Request(method, url, **kwargs).prepare()
+
+    def send(self, prepared, *, timeout=None, stream=False):
+        self.sent.append(prepared)
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["x-ratelimit-remaining"] = "{'minute': 9}"
+        response.request = prepared
+        response._content = self.body  # pylint: disable=protected-access
+        return response
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.usefixtures("fake_api_key")
+def test_custom_transport(fake_api_key):
+    """
+    Tests custom transports receive every call, with hooks and rate limiting
+    still applied above them.
+    """
+    transport = CannedTransport({"status": 200, "likelihood": 10})
+    with PDLPY(api_key=fake_api_key, transport=transport) as client:
+        events = []
+        client.on("request_end", events.append)
+        response = client.person.enrichment(email="sean@peopledatalabs.com")
+    assert response.json()["likelihood"] == 10
+    assert len(transport.sent) == 1
+    assert transport.sent[0].method == "GET"
+    assert transport.closed
+    assert events[0].status == 200
+    assert events[0].response_bytes == len(transport.body)
+
+
+def test_incomplete_transport_rejected():
+    """
+    Tests transports missing prepare() or send() cannot be instantiated.
+    """
+
+    class SendOnlyTransport(Transport):  # pylint: disable=abstract-method
+        """
+        Transport without prepare().
+        """
+
+        def send(self, prepared, *, timeout=None, stream=False):
+            return None
+
+    with pytest.raises(TypeError):
+        SendOnlyTransport()  # pylint: disable=abstract-class-instantiated
+
+
+@pytest.mark.usefixtures("fake_api_key")
+def test_invalid_transports(fake_api_key):
+    """
+    Tests unknown transports are rejected, and the asyncio client refuses any
+    transport.
+    """
+    with pytest.raises(ValidationError):
+        PDLPY(api_key=fake_api_key, transport="h2")
+
+    async def run():
+        async with AsyncPDLPY(api_key=fake_api_key, transport="urllib3"):
+            pass
+
+    pytest.importorskip("httpx")
+    with pytest.raises(ValueError):
+        asyncio.run(run())
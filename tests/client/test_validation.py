@@ -0,0 +1,116 @@
+"""
+All tests related to the validation of API parameters.
+"""
+
+import logging
+
+import pytest
+from pydantic.v1 import ValidationError
+
+from peopledatalabs.main import PDLPY
+from peopledatalabs.models import AutocompleteModel
+from peopledatalabs.models import person as person_models
+from peopledatalabs.validation import merge_params, validate_params
+
+
+logging.basicConfig()
+logger = logging.getLogger("PeopleDataLabs.tests.validation")
+
+BULK_PARAMS = {
+    "required": "emails",
+    "requests": [
+        {"metadata": {"row": 1}, "params": {"email": "a@b.com"}},
+        {"params": {"name": "Sean Thorne", "company": None}},
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "model, params",
+    [
+        (person_models.EnrichmentModel, {"email": ["a@b.com"], "foo": 1}),
+        (person_models.BulkModel, BULK_PARAMS),
+        (person_models.SearchModel, {"sql": "SELECT", "dataset": "email"}),
+        (person_models.SearchModel, {"sql": "SELECT", "from_": 20}),
+        (AutocompleteModel, {"field": "title", "text": "data"}),
+    ],
+)
+def test_validate_params_matches_pydantic(model, params):
+    """
+    Tests the fast path returns the same parameters as BaseModel.dict.
+    """
+    assert validate_params(model, params) == model(**params).dict(
+        exclude_none=True, by_alias=True
+    )
+
+
+def test_validate_params_model_instance():
+    """
+    Tests model instances are accepted, but only of the expected model.
+    """
+    params = person_models.BulkModel(**BULK_PARAMS)
+    assert validate_params(person_models.BulkModel, params) == params.dict(
+        exclude_none=True
+    )
+    with pytest.raises(TypeError):
+        validate_params(person_models.EnrichmentModel, params)
+
+
+def test_validate_params_trusted():
+    """
+    Tests trusted parameters are not validated, only filtered.
+    """
+    params = {"email": "not an email", "foo": 1, "name": None, "pretty": 1}
+    with pytest.raises(ValidationError):
+        validate_params(person_models.EnrichmentModel, params)
+    assert validate_params(
+        person_models.EnrichmentModel, params, trusted=True
+    ) == {"email": "not an email", "pretty": 1}
+
+
+def test_offset_sent_as_from():
+    """
+    Tests the from_ offset of searches is sent as the API's from parameter,
+    whether validated, trusted or merged into a model.
+    """
+    model = person_models.SearchModel
+    expected = {"sql": "SELECT", "from": 20}
+    assert validate_params(model, {"sql": "SELECT", "from_": 20}) == expected
+    assert validate_params(model, {"sql": "SELECT", "from": 20}) == expected
+    assert (
+        validate_params(model, {"sql": "SELECT", "from_": 20}, trusted=True)
+        == expected
+    )
+    merged = merge_params(model(sql="SELECT", from_=10), {"from_": 20})
+    assert validate_params(model, merged) == expected
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_call_with_validated_params(mock_client, mock_api):
+    """
+    Tests API methods accept validated parameters, overridden by keyword
+    arguments.
+    """
+    params = person_models.EnrichmentModel(email="test@example.com")
+    mock_client.person.enrichment(params)
+    mock_client.person.enrichment(params, pretty=True)
+    mock_client.autocomplete(AutocompleteModel(field="title", text="data"))
+    queries = [call.query for call in mock_api.calls]
+    assert queries[0]["email"] == "test@example.com"
+    assert "pretty" not in queries[0]
+    assert queries[1]["pretty"] == "True"
+    assert queries[2]["field"] == "title"
+
+
+@pytest.mark.usefixtures("mock_api")
+def test_trusted_client(mock_api, fake_api_key):
+    """
+    Tests a trusted client sends parameters without validating them.
+    """
+    with PDLPY(
+        api_key=fake_api_key, base_path=mock_api.base_path, trusted=True
+    ) as client:
+        client.person.bulk(requests=[{"params": {"email": "not an email"}}])
+    assert mock_api.calls[0].json() == {
+        "requests": [{"params": {"email": "not an email"}}]
+    }
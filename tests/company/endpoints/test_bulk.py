@@ -86,3 +86,25 @@ def test_api_endpoint_bulk_with_metadata(client):
     response = client.company.bulk(**data)
     assert isinstance(response, requests.Response)
     assert response.status_code == 200
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_iter_bulk_keeps_input_order(mock_client, mock_api):
+    """
+    Tests company iter_bulk yields one result per request in input order.
+    """
+    mock_api.routes["/v5/company/enrich/bulk"] = lambda call: (
+        200,
+        {},
+        [
+            {"status": 200, "metadata": request["metadata"]}
+            for request in call.json()["requests"]
+        ],
+    )
+    requests_ = [
+        {"metadata": {"row": i}, "params": {"website": f"{i}.com"}}
+        for i in range(120)
+    ]
+    results = list(mock_client.company.iter_bulk(requests_, batch_size=50))
+    assert [r["metadata"]["row"] for r in results] == list(range(120))
+    assert len(mock_api.calls) == 3
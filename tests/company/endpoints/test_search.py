@@ -104,3 +104,17 @@ def test_api_endpoint_search_both_queries_raises_validation_error(client):
     }
     with pytest.raises(ValidationError):
         client.company.search(**data)
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api", "scroll_pages")
+def test_iter_search_follows_scroll_token(mock_client, mock_api, scroll_pages):
+    """
+    Tests company iter_search yields every record across all pages.
+    """
+    records = [{"id": str(i)} for i in range(120)]
+    mock_api.routes["/v5/company/search"] = scroll_pages(records)
+    iterator = mock_client.company.iter_search(
+        sql="SELECT * FROM company;", size=50
+    )
+    assert list(iterator) == records
+    assert len(mock_api.calls) == 3
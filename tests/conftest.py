@@ -2,6 +2,11 @@
 Pytest testing configuration file.
 """
 
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from urllib.parse import parse_qs, urlsplit
 import uuid
 
 import os
@@ -15,6 +20,158 @@ from peopledatalabs.logger import get_logger
 logger = get_logger("tests")
 
 
+@dataclass
+class MockCall:
+    """
+    A request received by the mock API.
+
+    Header names are lowercased.
+    """
+
+    method: str
+    path: str
+    query: dict
+    body: bytes
+    headers: dict
+    connection: int
+
+    def json(self):
+        """
+        Decodes the JSON body of the request.
+        """
+        return json.loads(self.body)
+
+
+@dataclass
+class MockAPI:
+    """
+    Local stand-in for the PeopleDataLabs API.
+
+    Routes map a path (e.g. "/v5/person/enrich") to a callable receiving
+    a MockCall and returning a (status, headers, body) tuple; body can
+    be bytes or any JSON-serializable object. Unrouted paths answer 200.
+    """
+
+    base_path: str = None
+    calls: list = field(default_factory=list)
+    routes: dict = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def connections(self):
+        """
+        Number of distinct TCP connections the API was called over.
+        """
+        return len({call.connection for call in self.calls})
+
+    def respond(self, call):
+        """
+        Records the call and resolves its response.
+        """
+        with self.lock:
+            self.calls.append(call)
+        route = self.routes.get(call.path)
+        if route is None:
+            return 200, {}, {"status": 200, "data": {}}
+        return route(call)
+
+
+class _MockAPIHandler(BaseHTTPRequestHandler):
+    """
+    Request handler which delegates to the server's MockAPI.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately: without this, Nagle's
+    # algorithm holds the body back until the client's delayed ACK.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        call = MockCall(
+            method=self.command,
+            path=url.path,
+            query={k: v[0] for k, v in parse_qs(url.query).items()},
+            body=self.rfile.read(length),
+            headers={k.lower(): v for k, v in self.headers.items()},
+            connection=self.client_address[1],
+        )
+        status, headers, body = self.server.api.respond(call)
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+def _scroll_pages(records, key="data"):
+    """
+    Builds a mock API route serving records in pages linked by scroll tokens,
+    where each token is the offset of its page.
+    """
+
+    def route(call):
+        params = call.json() if call.method == "POST" else call.query
+        start = int(params.get("scroll_token") or 0)
+        end = start + int(params.get("size") or 100)
+        page = records[start:end]
+        if not page:
+            return 404, {}, {"status": 404, "error": {"message": "None"}}
+        body = {"status": 200, key: page, "total": len(records)}
+        if end < len(records):
+            body["scroll_token"] = str(end)
+        return 200, {}, body
+
+    return route
+
+
+@pytest.fixture(name="scroll_pages")
+def fixture_scroll_pages():
+    """
+    Factory of mock API routes serving records in scrolled pages.
+    """
+    return _scroll_pages
+
+
+@pytest.fixture(name="mock_api")
+def fixture_mock_api():
+    """
+    Runs a local stand-in for the API for the duration of a test.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockAPIHandler)
+    server.daemon_threads = True
+    server.api = MockAPI(base_path=f"http://127.0.0.1:{server.server_port}/v5")
+    thread = threading.Thread(
+        target=server.serve_forever,
+        kwargs={"poll_interval": 0.01},
+        daemon=True,
+    )
+    thread.start()
+    yield server.api
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mock_client(mock_api, fake_api_key):
+    """
+    Client instance calling the local stand-in API.
+    """
+    with PDLPY(api_key=fake_api_key, base_path=mock_api.base_path) as pdl:
+        yield pdl
+
+
 @pytest.fixture(name="fake_api_key")
 def fixture_fake_api_key():
     """
@@ -3,6 +3,9 @@ Tests calls to the person/bulk API.
 """
 
 import logging
+import random
+import time
+
 import pytest
 
 from pydantic.v1 import ValidationError
@@ -120,3 +123,74 @@ def test_api_endpoint_bulk_with_filtering(client):
     assert isinstance(response, requests.Response)
     assert len(response.json()) == 2
     assert response.status_code == 200
+
+
+def _echo_bulk(call):
+    """
+    Answers a bulk call with one result per request, echoing its metadata.
+    """
+    time.sleep(random.random() / 100)
+    return (
+        200,
+        {},
+        [
+            {"status": 200, "data": {}, "metadata": request["metadata"]}
+            for request in call.json()["requests"]
+        ],
+    )
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_iter_bulk_keeps_input_order(mock_client, mock_api):
+    """
+    Tests iter_bulk sends full batches concurrently and yields the results in
+    input order.
+    """
+    mock_api.routes["/v5/person/bulk"] = _echo_bulk
+    requests_ = (
+        {"metadata": {"row": i}, "params": {"profile": f"linkedin.com/{i}"}}
+        for i in range(250)
+    )
+    results = list(
+        mock_client.person.iter_bulk(
+            requests_, max_workers=3, required="emails"
+        )
+    )
+    assert [r["metadata"]["row"] for r in results] == list(range(250))
+    assert sorted(len(c.json()["requests"]) for c in mock_api.calls) == [
+        50,
+        100,
+        100,
+    ]
+    assert all(c.json()["required"] == "emails" for c in mock_api.calls)
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_iter_bulk_failed_batch(mock_client, mock_api):
+    """
+    Tests each request of a failed call gets the call's status and error.
+    """
+    error = {"type": "error", "message": "Internal error"}
+    mock_api.routes["/v5/person/bulk"] = lambda call: (
+        500,
+        {},
+        {"status": 500, "error": error},
+    )
+    requests_ = [
+        {"metadata": {"row": i}, "params": {"email": "test@example.com"}}
+        for i in range(3)
+    ]
+    results = list(mock_client.person.iter_bulk(requests_))
+    assert results == [
+        {"status": 500, "error": error, "metadata": {"row": i}}
+        for i in range(3)
+    ]
+
+
+@pytest.mark.usefixtures("client_with_fake_api_key")
+def test_iter_bulk_invalid_batch_size(client_with_fake_api_key):
+    """
+    Tests batches larger than the API limit are rejected.
+    """
+    with pytest.raises(ValueError):
+        client_with_fake_api_key.person.iter_bulk([], batch_size=101)
@@ -35,3 +35,30 @@ def test_api_endpoint_changelog(client):
     )
     assert isinstance(changelog, requests.Response)
     assert changelog.status_code == 200
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api", "scroll_pages")
+def test_iter_changelog_streams_all_entries(
+    mock_client, mock_api, scroll_pages
+):
+    """
+    Tests iter_changelog yields every entry across pages and can resume from a
+    saved position.
+    """
+    entries = [{"id": str(i), "updated": ["job_title"]} for i in range(230)]
+    mock_api.routes["/v5/person/changelog"] = scroll_pages(entries)
+    params = {
+        "origin_version": "31.2",
+        "current_version": "32.0",
+        "type": "updated",
+    }
+    iterator = mock_client.person.iter_changelog(**params)
+    consumed = [next(iterator) for _ in range(150)]
+    assert (iterator.scroll_token, iterator.page_offset) == ("100", 50)
+    resumed = mock_client.person.iter_changelog(
+        scroll_token=iterator.scroll_token,
+        page_offset=iterator.page_offset,
+        **params,
+    )
+    assert consumed + list(resumed) == entries
+    assert all(c.json()["type"] == "updated" for c in mock_api.calls)
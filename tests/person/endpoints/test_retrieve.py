@@ -8,6 +8,8 @@ import pytest
 from pydantic.v1 import ValidationError
 import requests
 
+from peopledatalabs.endpoints import person as person_endpoints
+
 
 logging.basicConfig()
 logger = logging.getLogger("PeopleDataLabs.tests.person.retrieve")
@@ -41,3 +43,22 @@ def test_api_endpoint_retrieve(client):
     retrieved = client.person.retrieve(person_id="qEnOZ5Oh0poWnQ1luFBfVw_0000")
     assert isinstance(retrieved, requests.Response)
     assert retrieved.status_code == 200
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_retrieve_skips_pydantic_for_valid_ids(
+    mock_client, mock_api, monkeypatch
+):
+    """
+    Tests a string person_id is sent without running pydantic.
+    """
+
+    def fail(person_id):
+        raise AssertionError(person_id)
+
+    monkeypatch.setattr(person_endpoints, "_check_person_id", fail)
+    response = mock_client.person.retrieve(person_id="qEnOZ5Oh0poWnQ1luFBfVw")
+    assert response.status_code == 200
+    assert (
+        mock_api.calls[0].path == "/v5/person/retrieve/qEnOZ5Oh0poWnQ1luFBfVw"
+    )
@@ -8,12 +8,14 @@ import pytest
 from pydantic.v1 import ValidationError
 import requests
 
-from peopledatalabs.errors import EmptyParametersException
+from peopledatalabs.errors import APIError, EmptyParametersException
 
 
 logging.basicConfig()
 logger = logging.getLogger("PeopleDataLabs.tests.person.search")
 
+SQL = "SELECT * FROM person WHERE location_country='mexico';"
+
 
 @pytest.mark.usefixtures("client_with_fake_api_key")
 def test_search_empty_params_throw_error(client_with_fake_api_key):
@@ -129,3 +131,64 @@ def test_api_endpoint_search_invalid_dataset_raises_validation_error(client):
     }
     with pytest.raises(ValidationError):
         client.person.search(**data)
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api", "scroll_pages")
+def test_iter_search_follows_scroll_token(mock_client, mock_api, scroll_pages):
+    """
+    Tests iter_search yields every record across all pages.
+    """
+    records = [{"id": str(i)} for i in range(250)]
+    mock_api.routes["/v5/person/search"] = scroll_pages(records)
+    iterator = mock_client.person.iter_search(sql=SQL)
+    assert list(iterator) == records
+    assert iterator.total == 250
+    assert [c.json().get("scroll_token") for c in mock_api.calls] == [
+        None,
+        "100",
+        "200",
+    ]
+    assert all(c.json()["size"] == 100 for c in mock_api.calls)
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api", "scroll_pages")
+def test_iter_search_resumes(mock_client, mock_api, scroll_pages):
+    """
+    Tests a new iterator created from the position of an interrupted one yields
+    the remaining records only.
+    """
+    records = [{"id": str(i)} for i in range(50)]
+    mock_api.routes["/v5/person/search"] = scroll_pages(records)
+    iterator = mock_client.person.iter_search(sql=SQL, size=10)
+    consumed = [next(iterator) for _ in range(23)]
+    resumed = mock_client.person.iter_search(
+        sql=SQL,
+        size=10,
+        scroll_token=iterator.scroll_token,
+        page_offset=iterator.page_offset,
+    )
+    assert consumed + list(resumed) == records
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api", "scroll_pages")
+def test_iter_search_no_records(mock_client, mock_api, scroll_pages):
+    """
+    Tests iter_search yields nothing when the search matches no records.
+    """
+    mock_api.routes["/v5/person/search"] = scroll_pages([])
+    assert not list(mock_client.person.iter_search(sql=SQL))
+
+
+@pytest.mark.usefixtures("mock_client", "mock_api")
+def test_iter_search_failed_call_raises_api_error(mock_client, mock_api):
+    """
+    Tests iter_search raises APIError when a call fails.
+    """
+    mock_api.routes["/v5/person/search"] = lambda call: (
+        401,
+        {},
+        {"status": 401, "error": {"message": "Invalid API key"}},
+    )
+    with pytest.raises(APIError) as ex:
+        next(mock_client.person.iter_search(sql=SQL))
+    assert ex.value.response.status_code == 401